@@ -11,6 +11,7 @@ PROJECT = Project()
 
 SERIALIZE_LIST: Dict[int, List[str]] = {}
 FILE_CLASSES: Dict[str, str] = {}
+COUNT_MODES: Dict[str, int] = {}  # Cursor model count mode by table name.
 
 PINEBOO_VER = "0.77.6.4"
 
@@ -21,7 +22,9 @@ VIRTUAL_DB: bool = True  # Enable :memory: database on pytest.
 LOG_SQL: bool = False  # Enable sqlalchemy logs.
 USE_WEBSOCKET_CHANNEL: bool = False  # Enable websockets features.
 USE_MISMATCHED_VIEWS: bool = False  # Enable mismatched views.
+FORCE_MISMATCHED_CHECK: bool = False  # Compare table structures, ignoring stored fingerprints.
 RECOVERING_CONNECTIONS: bool = False  # Recovering state.
 AUTO_RELOAD_BAD_CONNECTIONS: bool = False  # Auto reload bad conecctions.
 DEVELOPER_MODE: bool = True  # Skip some bugs, critical in production.
 USE_REPORT_VIEWER: bool = True  # Enable internal report viewer
+USE_KEYSET_PAGINATION: bool = False  # Enable keyset pagination on cursor models.
@@ -215,8 +215,12 @@ class BaseModel(object):
         while not self._new_object and self.pk is None:
             time.sleep(10)
 
+        state = inspect(self)
+        deferred = state.unloaded if not state.expired else set()
         for field in self.legacy_metadata["fields"]:
             field_name = field["name"]
+            if field_name in deferred:  # Campo diferido, se copia al cargarse (_refresh_copy).
+                continue
             setattr(self._buffer_copy, field_name, getattr(self, field_name, None))
 
     def changes(self) -> Dict[str, Any]:
@@ -825,6 +829,18 @@ class BaseModel(object):
         if hasattr(target, "_deny_buffer_changed"):
             target.emit_buffer_changed(event.key)
 
+    @classmethod
+    def _refresh_copy(cls, target, context: Any, attrs: Optional[Any]) -> None:
+        """Copy deferred fields to buffer copy when they are loaded."""
+
+        buffer_copy = getattr(target, "_buffer_copy", None)
+        if buffer_copy is None or not attrs:
+            return
+
+        for field_name in attrs:
+            if not hasattr(buffer_copy, field_name):
+                setattr(buffer_copy, field_name, getattr(target, field_name, None))
+
     @classmethod
     def _error_manager(cls, text: str, error: Union[Exception, str]) -> None:
         """Return custom error message."""
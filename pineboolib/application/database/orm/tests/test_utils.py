@@ -26,7 +26,7 @@ class TestUtils(unittest.TestCase):
     def test_basic_2(self) -> None:
         """Test basic 2."""
 
-        self.assertTrue(len(qsa.orm.models()) in [20, 17])
+        self.assertTrue(len(qsa.orm.models()) in [22, 19])
 
     def test_dynamic_filter(self) -> None:
         """Test dynamic filter."""
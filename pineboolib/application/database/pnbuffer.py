@@ -128,6 +128,9 @@ class PNBuffer(object):
             if self._orm_obj and sqlalchemy.inspect(self._orm_obj).expired:
                 self._orm_obj = self.model().get_obj_from_row(self._cursor.currentRegister())
 
+            if self._orm_obj is not None:
+                self._load_deferred(field_name)
+
             value = getattr(self._orm_obj, field_name, None)
 
             if value is not None:
@@ -148,6 +151,19 @@ class PNBuffer(object):
 
         return value
 
+    def _load_deferred(self, field_name: str) -> None:
+        """Load every deferred field of the object with one query, when one of them is asked."""
+
+        state = sqlalchemy.inspect(self._orm_obj)
+        if not state.persistent or field_name not in state.unloaded:
+            return
+
+        deferred = [name for name in state.mapper.column_attrs.keys() if name in state.unloaded]
+        try:
+            state.session.refresh(self._orm_obj, attribute_names=deferred)
+        except Exception as error:
+            LOGGER.warning("_load_deferred: %s", str(error))
+
     def set_value(self, field_name: str, value: TVALUES) -> bool:
         """Set values to cache_buffer."""
 
@@ -10,6 +10,7 @@ from pineboolib.interfaces import iconnection
 from . import pnsqldrivers
 from pineboolib import application
 
+import threading
 import time
 
 
@@ -52,6 +53,7 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     connections_dict: Dict[str, "iconnection.IConnection"] = {}
     _conn_manager: "pnconnectionmanager.PNConnectionManager"
     _last_activity_time: float
+    _thread: "threading.Thread"  # Hilo que creó la conexión.
     # _current_transaction: Optional["session.Session"]
     _last_error: str
 
@@ -68,6 +70,7 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
 
         super().__init__()
         self.update_activity_time()
+        self._thread = threading.current_thread()
         self.conn = None
         self._transaction_level = 0
         self._driver = None
@@ -519,6 +522,11 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
 
         return self.driver().nextSerialVal(table, field)
 
+    def preallocateSerialVal(self, table: str, field: str, count: int) -> bool:
+        """Reserve count values of a serial type field at once, for bulk inserts."""
+
+        return self.driver().preallocateSerialVal(table, field, count)
+
     def existsTable(self, name: str) -> bool:
         """Indicate the existence of a table in the database."""
 
@@ -567,10 +575,12 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
 
         return self.driver().queryUpdate(name, update, filter)
 
-    def execute_query(self, qry) -> Any:
+    def execute_query(
+        self, qry, stream_results: bool = False, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
         """Execute a query in a database cursor."""
 
-        return self.driver().execute_query(qry)
+        return self.driver().execute_query(qry, stream_results, params)
 
     def alterTable(self, new_metadata: "pntablemetadata.PNTableMetaData") -> bool:
         """Modify the fields of a table in the database based on the differences of two PNTableMetaData."""
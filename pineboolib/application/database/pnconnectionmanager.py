@@ -10,7 +10,7 @@ from . import pnsqlcursor
 from sqlalchemy import exc
 import threading
 
-from typing import Dict, Union, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Union, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.fllegacy import flmanager  # pragma: no cover
@@ -20,37 +20,142 @@ if TYPE_CHECKING:
 LOGGER = logging.get_logger(__name__)
 
 
+class ThreadIndexedDict(dict):
+    """
+    Dict with "thread id|name[|...]" keys, indexed by thread id and by name.
+
+    Bulk operations over a thread or a connection name read the indexes instead of scanning
+    every key. Keys without "|", like main_conn, are not indexed.
+    """
+
+    _by_thread: Dict[str, Dict[str, None]]
+    _by_name: Dict[str, Dict[str, None]]
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        super().__init__()
+        self._lock = threading.Lock()
+        self._by_thread = {}
+        self._by_name = {}
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set a value and index its key."""
+
+        with self._lock:
+            super().__setitem__(key, value)
+            parts = key.split("|")
+            if len(parts) > 1:
+                self._by_thread.setdefault(parts[0], {})[key] = None
+                self._by_name.setdefault(parts[1], {})[key] = None
+
+    def __delitem__(self, key: str) -> None:
+        """Delete a value and its key from the indexes."""
+
+        with self._lock:
+            super().__delitem__(key)
+            self._unindex(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        """Remove a key and return its value."""
+
+        with self._lock:
+            if key in self:
+                self._unindex(key)
+            return super().pop(key, *default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """Return the value of key, setting default first if missing."""
+
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Set several values."""
+
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        """Remove all values."""
+
+        with self._lock:
+            super().clear()
+            self._by_thread.clear()
+            self._by_name.clear()
+
+    def threads(self) -> List[str]:
+        """Return the thread ids with keys."""
+
+        with self._lock:
+            return list(self._by_thread.keys())
+
+    def keys_for(self, thread_id: Optional[str] = None, name: Optional[str] = None) -> List[str]:
+        """Return the keys of a thread, of a name, or of both, in insertion order."""
+
+        with self._lock:
+            if thread_id is None:
+                return list(self._by_name.get(name, {})) if name is not None else []
+
+            keys = self._by_thread.get(thread_id, {})
+            if name is None:
+                return list(keys)
+
+            return [key for key in self._by_name.get(name, {}) if key in keys]
+
+    def _unindex(self, key: str) -> None:
+        """Remove a key from the indexes."""
+
+        parts = key.split("|")
+        if len(parts) > 1:
+            for index, value in ((self._by_thread, parts[0]), (self._by_name, parts[1])):
+                keys = index.get(value)
+                if keys is not None:
+                    keys.pop(key, None)
+                    if not keys:
+                        del index[value]
+
+
 class PNConnectionManager(QtCore.QObject):
     """PNConnectionManager Class."""
 
     _manager: Optional["flmanager.FLManager"]
     _manager_modules: Optional["flmanagermodules.FLManagerModules"]
-    connections_dict: Dict[str, "pnconnection.PNConnection"] = {}
+    connections_dict: "ThreadIndexedDict"  # "thread id|name" -> PNConnection.
     limit_connections: int = 0  # Limit of connections to use.
     connections_time_out: int = 0  # Seconds to wait to eliminate the inactive connections.
+    pool_config: Dict[str, Dict[str, int]]  # Connection name -> create_engine pool params.
 
-    current_atomic_sessions: Dict[str, str]
-    current_thread_sessions: Dict[str, str]
+    current_atomic_sessions: "ThreadIndexedDict"  # "thread id|name" -> session key.
+    current_thread_sessions: "ThreadIndexedDict"  # "thread id|name" -> session key.
     # current_conn_sessions: Dict[str, str]
-    _thread_sessions: Dict[str, "orm_session.Session"]
+    _thread_sessions: "ThreadIndexedDict"  # "thread id|name|time" -> session.
     REMOVE_CONNECTIONS_AFTER_ATOMIC: bool = False
     SAFE_TIME_SLEEP: float
     safe_mode_level: int
+    REAPER_INTERVAL: float = 5.0  # Seconds between background checks of alive connections.
+    PRE_PING_IDLE_TIME: float = 30.0  # Idle seconds before a pooled connection is pinged.
+    _reaper: Optional["threading.Thread"]
+    _reaper_stop: "threading.Event"
 
     def __init__(self):
         """Initialize."""
 
         super().__init__()
-        self.connections_dict = {}
-        self.current_atomic_sessions = {}
-        self.current_thread_sessions = {}
+        self.connections_dict = ThreadIndexedDict()
+        self.current_atomic_sessions = ThreadIndexedDict()
+        self.current_thread_sessions = ThreadIndexedDict()
         # self.current_conn_sessions = {}
-        self._thread_sessions = {}
+        self._thread_sessions = ThreadIndexedDict()
         self._manager = None
         self._manager_modules = None
         self.REMOVE_CONNECTIONS_AFTER_ATOMIC = False
         self.SAFE_TIME_SLEEP = 0.01
         self.safe_mode_level = 0
+        self.pool_config = {}
+        self._reaper = None
+        self._reaper_stop = threading.Event()
 
         LOGGER.info("Initializing PNConnection Manager:")
         LOGGER.info(
@@ -114,6 +219,7 @@ class PNConnectionManager(QtCore.QObject):
     def finish(self) -> None:
         """Set the connection as terminated."""
 
+        self.stop_reaper()
         for key in list(self.connections_dict.keys()):
             if self.connections_dict[key] is None:
                 continue
@@ -124,7 +230,7 @@ class PNConnectionManager(QtCore.QObject):
             self.connections_dict[key].close()
             del self.connections_dict[key]
 
-        self.connections_dict = {}
+        self.connections_dict = ThreadIndexedDict()
         del self._manager
         del self._manager_modules
         del self
@@ -147,11 +253,20 @@ class PNConnectionManager(QtCore.QObject):
         name_conn_: str = utils_base.session_id(name)
         # if name in ("default", None):
         #    return self
-        self.check_alive_connections()
+        # Las conexiones de hilos terminados las elimina el hilo de start_reaper.
+        connection_ = self.connections_dict.get(name_conn_) if not db_name else None
+        if connection_ is not None and (
+            connection_._thread is not threading.current_thread() or self._expired(connection_)
+        ):
+            # El ident de un hilo terminado se ha reutilizado antes de pasar el limpiador, o la
+            # conexión está cerrada o inactiva. Sólo el hilo propietario la cierra y reconecta.
+            self.removeConn(name_conn_)
+            connection_ = None
+
+        if connection_ is None:
+            if self._reaper is None:
+                self.start_reaper()
 
-        if name_conn_ in self.connections_dict.keys() and not db_name:
-            connection_ = self.connections_dict[name_conn_]
-        else:
             if db_name:
                 if not self.removeConn(name):
                     raise Exception("a problem existes deleting older connection")
@@ -194,12 +309,11 @@ class PNConnectionManager(QtCore.QObject):
         """Return dict with own database connections."""
 
         dict_ = {}
-        id_thread = threading.current_thread().ident
-        for key in self.connections_dict.keys():
-            if key.find("|") > -1:
-                connection_data = key.split("|")
-                if connection_data[0] == str(id_thread):
-                    dict_[connection_data[1]] = self.connections_dict[key]
+        id_thread = str(threading.current_thread().ident)
+        for key in self.connections_dict.keys_for(id_thread):
+            connection_ = self.connections_dict.get(key)
+            if connection_ is not None:
+                dict_[key.split("|")[1]] = connection_
 
         return dict_
 
@@ -235,15 +349,27 @@ class PNConnectionManager(QtCore.QObject):
     def delete_from_sessions_dict(self, conn_name: str) -> None:
         """Search and delete sessions_identifiers from sessions dicts."""
 
-        if conn_name in self.current_atomic_sessions.keys():
-            del self.current_atomic_sessions[conn_name]
+        self.current_atomic_sessions.pop(conn_name, None)
+        self.current_thread_sessions.pop(conn_name, None)
+
+        thread_id, name = conn_name.split("|")[:2]
+        for thread_session_identifier in self._thread_sessions.keys_for(thread_id, name):
+            self.delete_session(thread_session_identifier)
+
+    def close_thread(self, thread_id: str) -> None:
+        """Remove the connections and sessions of a thread."""
+
+        for conn_ident in self.connections_dict.keys_for(thread_id):
+            self.removeConn(conn_ident)
 
-        if conn_name in self.current_thread_sessions.keys():
-            del self.current_thread_sessions[conn_name]
+        for conn_ident in self.current_atomic_sessions.keys_for(thread_id):
+            self.current_atomic_sessions.pop(conn_ident, None)
 
-        for thread_session_identifier in list(self._thread_sessions.keys()):
-            if thread_session_identifier.startswith(conn_name):
-                self.delete_session(thread_session_identifier)
+        for conn_ident in self.current_thread_sessions.keys_for(thread_id):
+            self.current_thread_sessions.pop(conn_ident, None)
+
+        for thread_session_identifier in self._thread_sessions.keys_for(thread_id):
+            self.delete_session(thread_session_identifier)
 
     def delete_session(self, session_id: str) -> None:
         """Delete a session."""
@@ -356,30 +482,65 @@ class PNConnectionManager(QtCore.QObject):
                 self.useConn(conn_name)
 
     def check_alive_connections(self):
-        """Check alive connections."""
-
-        alived_threads: List[str] = []
-
-        for thread in threading.enumerate():
-            alived_threads.append(str(thread.ident))
-
-        for conn_ident in list(self.connections_dict.keys()):
-            if conn_ident.find("|") > -1:
-                thread_id = conn_ident.split("|")[0]
-                if thread_id not in alived_threads:
-                    self.removeConn(conn_ident)
-
-        for conn_ident in list(self.enumerate().keys()):
-            if conn_ident.find("|") > -1:
-                if (
-                    not self.connections_dict[conn_ident]._is_open  # Closed connections
-                    and self.connections_dict[conn_ident].conn
-                    is not None  # Only initialized connections.
-                ) or (
-                    self.connections_time_out
-                    and self.connections_dict[conn_ident].idle_time() > self.connections_time_out
-                ):
-                    self.removeConn(conn_ident)
+        """
+        Check alive connections.
+
+        Remove the connections and sessions of finished threads. The closed and idle connections
+        of living threads are reconnected by their own thread, in useConn.
+        """
+
+        # Primero los hilos con conexiones: un hilo que empieza después ya está vivo al leerlos.
+        used_threads = set(self.connections_dict.threads() + self._thread_sessions.threads())
+        alived_threads = set([str(thread.ident) for thread in threading.enumerate()])
+
+        for thread_id in used_threads - alived_threads:
+            connections = [
+                self.connections_dict.get(conn_ident)
+                for conn_ident in self.connections_dict.keys_for(thread_id)
+            ]
+            if [conn_ for conn_ in connections if conn_ is not None and conn_._thread.is_alive()]:
+                continue  # El ident se ha reutilizado y el hilo nuevo ya tiene conexiones.
+
+            self.close_thread(thread_id)
+
+    def _expired(self, connection_: "pnconnection.PNConnection") -> bool:
+        """Return if a connection is closed, or idle too long without a transaction."""
+
+        return (not connection_._is_open and connection_.conn is not None) or bool(
+            self.connections_time_out
+            and not connection_.transactionLevel()
+            and connection_.idle_time() > self.connections_time_out
+        )
+
+    def start_reaper(self) -> None:
+        """Start the background thread that runs check_alive_connections every REAPER_INTERVAL."""
+
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(
+            target=self._reaper_loop, name="pnconnectionmanager_reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        """Stop the background thread of check_alive_connections."""
+
+        self._reaper_stop.set()
+        if self._reaper is not None and self._reaper is not threading.current_thread():
+            self._reaper.join(self.REAPER_INTERVAL)
+
+        self._reaper = None
+
+    def _reaper_loop(self) -> None:
+        """Run check_alive_connections until stop_reaper is called."""
+
+        while not self._reaper_stop.wait(self.REAPER_INTERVAL):
+            try:
+                self.check_alive_connections()
+            except Exception as error:
+                LOGGER.warning("check_alive_connections: %s", str(error))
 
     def set_max_connections_limit(self, limit: int) -> None:
         """Set maximum connections limit."""
@@ -391,6 +552,31 @@ class PNConnectionManager(QtCore.QObject):
         LOGGER.info("New max connections idle time %s.", limit)
         self.connections_time_out = limit  # noqa: F841
 
+    def set_pool_config(
+        self,
+        conn_name: str,
+        size: Optional[int] = None,
+        overflow: Optional[int] = None,
+        recycle: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ) -> None:
+        """
+        Set the pool of a connection name. None values keep the common params.
+
+        The connection gets its own engine when it is opened again.
+        """
+
+        params = {
+            "pool_size": size,
+            "max_overflow": overflow,
+            "pool_recycle": recycle,
+            "pool_timeout": timeout,
+        }
+        self.pool_config[conn_name] = dict(
+            [(key, value) for key, value in params.items() if value is not None]
+        )
+        LOGGER.info("New pool config for %s: %s.", conn_name, self.pool_config[conn_name])
+
     def active_pncursors(self, only_name: bool = False, all_sessions: bool = False) -> List[str]:
         """Return a user cursor opened list."""
 
@@ -431,15 +617,16 @@ class PNConnectionManager(QtCore.QObject):
     def get_current_thread_sessions(self) -> List["orm_session.session.Session"]:
         """Return thread sessions openend."""
 
-        id_thread = threading.current_thread().ident
+        id_thread = str(threading.current_thread().ident)
         result: List["orm_session.session.Session"] = []
         # conn_sessions = []
         # for id_session in self.current_conn_sessions.keys():
         #    conn_sessions.append(id_session)
 
-        for key in self._thread_sessions.keys():
-            if str(id_thread) in key and key:  # todas menos las _conn_sessions
-                result.append(self._thread_sessions[key])
+        for key in self._thread_sessions.keys_for(id_thread):
+            session = self._thread_sessions.get(key)
+            if session is not None:
+                result.append(session)
 
         return result
 
@@ -503,6 +690,18 @@ class PNConnectionManager(QtCore.QObject):
 
         return self.useConn(conn_name).driver()._engine.pool.status()
 
+    def pool_metrics(self, conn_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the pool metrics of every engine, or the engine used for the conn_name."""
+
+        from pineboolib.plugins.sql import pnsqlschema
+
+        metrics = list(pnsqlschema.POOL_METRICS.values())
+        if conn_name is not None:
+            engine = self.useConn(conn_name).driver()._engine
+            metrics = [item for item in metrics if item._engine is engine]
+
+        return [item.snapshot() for item in metrics]
+
     def set_safe_mode(self, level: int) -> None:
         """
         Set safe mode level.
@@ -8,19 +8,22 @@ from PyQt5 import QtCore, QtGui, Qt, QtWidgets
 
 from pineboolib.core.utils import logging, utils_base
 
-from sqlalchemy import exc, orm, inspect, engine
+from sqlalchemy import exc, orm, inspect, engine, text
 from pineboolib.application.utils import date_conversion, xpm
+from pineboolib import application
 from .orm import utils as orm_utils
 from . import pnsqlquery
 
 
 import itertools
+import collections
 import locale
 import os
 import datetime
+import decimal
 
 
-from typing import Any, Optional, List, Dict, Tuple, cast, Callable, TYPE_CHECKING
+from typing import Any, Optional, List, Dict, Tuple, Union, cast, Callable, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -35,6 +38,12 @@ if TYPE_CHECKING:
 DEBUG = False
 CURSOR_COUNT = itertools.count()
 LOGGER = logging.get_logger(__name__)
+OBJECT_PAGE_SIZE = 50
+OBJECT_CACHE_PAGES = 20
+PK_INDEX_MAX_SHIFTS = 64
+KEYSET_PAGE_SIZE = 500
+KEYSET_MAX_PAGES = 10
+PK_WINDOW_SIZE = 200  # Múltiplo de OBJECT_PAGE_SIZE.
 
 
 class PNCursorTableModel(QtCore.QAbstractTableModel):
@@ -83,10 +92,21 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
     grid_row_tmp: Dict[int, List[Any]]
 
     # _data_proxy: List[Callable]
-    _data_proxy: Optional["ProxyIndex"]
+    _data_proxy: Optional[Union["ProxyIndex", "KeysetProxyIndex"]]
 
     _last_grid_obj: Any
     _lost_grid_row: int
+    _obj_cache: "ObjectCache"
+    _count_mode: int
+    _column_plan: List["DisplayColumn"]
+    _row_cache: Dict[Tuple[int, int], Any]
+    _color_function_key: Optional[Tuple[Optional[str], int]]
+    _color_function: Optional[Callable]
+    _projection: Optional[List[str]]
+
+    COUNT_EXACT = 0
+    COUNT_ESTIMATED = 1
+    COUNT_LAZY = 2
 
     def __init__(self, conn: "iconnection.IConnection", parent: "isqlcursor.ISqlCursor") -> None:
         """
@@ -164,6 +184,12 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         self.grid_row_tmp = {}
         # self._data_proxy = []
         self._data_proxy = None
+        self._obj_cache = ObjectCache()
+        self._column_plan = []
+        self._row_cache = {}
+        self._color_function_key = None
+        self._color_function = None
+        self._projection = None
 
         # self.refresh()
 
@@ -177,6 +203,7 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
         self._last_grid_obj = None
         self._last_grid_row = -1
+        self._count_mode = application.COUNT_MODES.get(self.metadata().name(), self.COUNT_EXACT)
 
     def disable_refresh(self, disable: bool) -> None:
         """
@@ -188,6 +215,20 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
         self._disable_refresh = disable
 
+    def set_count_mode(self, mode: int) -> None:
+        """
+        Set how rows are counted on refresh.
+
+        @param mode. COUNT_EXACT, COUNT_ESTIMATED (planner statistics) or COUNT_LAZY.
+        """
+
+        self._count_mode = mode
+
+    def count_mode(self) -> int:
+        """Return count mode."""
+
+        return self._count_mode
+
     def sort(self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.AscendingOrder) -> None:
         """
         Change order by used ASC/DESC and column.
@@ -259,9 +300,14 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
         row = index.row()
         col = index.column()
-        field = self.metadata().indexFieldObject(col)
-        _type = field.type()
-        res_color_function: List[str] = []
+        if col >= len(self._column_plan):
+            self._build_column_plan()
+
+        column = self._column_plan[col]
+        _type = column.type_
+
+        if role == QtCore.Qt.TextAlignmentRole:
+            return column.alignment
 
         # print("***", self._last_grid_row, row)
         if self._last_grid_row != row or (
@@ -269,8 +315,9 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         ):
             self._last_grid_row = row
             self._last_grid_obj = self.get_obj_from_row(row)
+            self._row_cache = {}
 
-        result = getattr(self._last_grid_obj, field.name(), None)
+        result = getattr(self._last_grid_obj, column.name, None)
 
         if _type == "check":
             primary_key = getattr(self._last_grid_obj, self.metadata().primaryKey())
@@ -278,36 +325,6 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
                 result = QtWidgets.QCheckBox()
                 self._check_column[primary_key] = result
 
-        if self.parent_view and role in [QtCore.Qt.BackgroundRole, QtCore.Qt.ForegroundRole]:
-            fun_get_color, iface = self.parent_view.functionGetColor()
-            if fun_get_color is not None:
-                context_ = None
-                fun_name_ = None
-                if fun_get_color.find(".") > -1:
-                    list_ = fun_get_color.split(".")
-                    from pineboolib.application.safeqsa import SafeQSA
-
-                    qsa_widget = SafeQSA.get_any(list_[0])
-                    fun_name_ = list_[1]
-                    if qsa_widget:
-                        context_ = qsa_widget.iface
-                else:
-                    context_ = iface
-                    fun_name_ = fun_get_color
-
-                function_color = getattr(context_, fun_name_, None)
-                if function_color is not None:
-                    field_name = field.name()
-                    field_value = result
-                    cursor = self._parent
-                    selected = False
-                    res_color_function = function_color(
-                        field_name, field_value, cursor, selected, _type
-                    )
-                else:
-                    raise Exception(
-                        "No se ha resuelto functionGetColor %s desde %s" % (fun_get_color, context_)
-                    )
         # print("Data ", index, role)
         # print("Registros", self.rowCount())
         # roles
@@ -329,84 +346,17 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
             return QtCore.Qt.Unchecked
 
-        elif role == QtCore.Qt.TextAlignmentRole:
-            result = QtCore.Qt.AlignVCenter
-            if _type in ("int", "double", "uint"):
-                result = result | QtCore.Qt.AlignRight
-            elif _type in ("bool", "date", "time"):
-                result = result | QtCore.Qt.AlignCenter
-            elif _type in ("unlock", "pixmap"):
-                result = result | QtCore.Qt.AlignHCenter
-
-            return result
-
         elif role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
-            if not field.visible():
-                result = None
-            # r = self._vdata[row]
-            elif _type == "bool":
-                if result in (True, "1"):
-                    result = "Sí"
-                else:
-                    result = "No"
-
-            elif _type in ("unlock", "pixmap"):
-
-                result = None
-
-            elif _type in ("string", "stringlist", "timestamp"):
-                if not result:
-                    if _type == "stringlist":
-                        result = "..."
-                    else:
-                        result = ""
-                else:
-                    result = str(result)
-
-            elif _type == "time" and result:
-                result = str(result)
-
-            elif _type == "date":
-                # Si es str lo paso a datetime.date
-                if isinstance(result, str):
-                    if len(result.split("-")[0]) == 4:
-                        result = date_conversion.date_amd_to_dma(result)
-
-                    if result:
-                        list_ = result.split("-")
-                        result = datetime.date(int(list_[2]), int(list_[1]), int(list_[0]))
-
-                if isinstance(result, datetime.date):
-                    # Cogemos el locale para presentar lo mejor posible la fecha
-                    try:
-                        locale.setlocale(locale.LC_TIME, "")
-                        if os.name == "nt":
-                            date_format = "%%d/%%m/%%y"
-                        else:
-                            date_format = locale.nl_langinfo(locale.D_FMT)
-                        date_format = date_format.replace("y", "Y")  # Año con 4 dígitos
-                        date_format = date_format.replace("/", "-")  # Separadores
-                        result = result.strftime(date_format)
-                    except AttributeError:
-                        import platform
-
-                        LOGGER.warning(
-                            "locale specific date format is not yet implemented for %s",
-                            platform.system(),
-                        )
-
-            elif _type == "check":
+            if _type == "check":
                 return
 
-            elif _type == "double":
-                if result is not None:
-                    # d = QtCore.QLocale.system().toString(float(d), "f", field.partDecimal())
-                    result = utils_base.format_double(
-                        result, field.partInteger(), field.partDecimal()
-                    )
-            elif _type in ("int", "uint"):
-                if result is not None:
-                    result = QtCore.QLocale.system().toString(int(result))
+            key = (col, QtCore.Qt.DisplayRole)
+            if key in self._row_cache:
+                result = self._row_cache[key]
+            else:
+                result = column.display(result)
+                self._row_cache[key] = result
+
             if self.parent_view is not None:
                 self.parent_view.resize_column(col, result)
 
@@ -477,13 +427,7 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
                 )
 
             else:
-                if res_color_function and len(res_color_function) and res_color_function[0] != "":
-                    color_ = QtGui.QColor(res_color_function[0])
-                    style_ = getattr(QtCore.Qt, res_color_function[2], None)
-                    result = QtGui.QBrush(color_)
-                    result.setStyle(style_)
-                else:
-                    result = None
+                result = self._color_brush(col, column, result, 0)
 
             return result
 
@@ -494,18 +438,103 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
                 else:
                     result = QtGui.QBrush(QtCore.Qt.white)
             else:
-                if res_color_function and len(res_color_function) and res_color_function[1] != "":
-                    color_ = QtGui.QColor(res_color_function[1])
-                    style_ = getattr(QtCore.Qt, res_color_function[2], None)
-                    result = QtGui.QBrush(color_)
-                    result.setStyle(style_)
-                else:
-                    result = None
+                result = self._color_brush(col, column, result, 1)
 
             return result
 
         return None
 
+    def _color_brush(self, col: int, column: "DisplayColumn", value: Any, position: int) -> Any:
+        """Return the background (0) or foreground (1) brush from functionGetColor."""
+
+        if self.parent_view is None:
+            return None
+
+        key = (col, QtCore.Qt.BackgroundRole)
+        if key in self._row_cache:
+            res_color_function = self._row_cache[key]
+        else:
+            res_color_function = []
+            function_color = self._resolve_color_function()
+            if function_color is not None:
+                res_color_function = function_color(
+                    column.name, value, self._parent, False, column.type_
+                )
+            self._row_cache[key] = res_color_function
+
+        if res_color_function and len(res_color_function) and res_color_function[position] != "":
+            color_ = QtGui.QColor(res_color_function[position])
+            style_ = getattr(QtCore.Qt, res_color_function[2], None)
+            result = QtGui.QBrush(color_)
+            result.setStyle(style_)
+            return result
+
+        return None
+
+    def _resolve_color_function(self) -> Optional[Callable]:
+        """Return functionGetColor callable. It is only resolved again when it changes."""
+
+        if self.parent_view is None:
+            return None
+
+        fun_get_color, iface = self.parent_view.functionGetColor()
+        color_key = (fun_get_color, id(iface))
+        if color_key == self._color_function_key:
+            return self._color_function
+
+        function_color = None
+        if fun_get_color is not None:
+            context_ = None
+            fun_name_ = None
+            if fun_get_color.find(".") > -1:
+                list_ = fun_get_color.split(".")
+                from pineboolib.application.safeqsa import SafeQSA
+
+                qsa_widget = SafeQSA.get_any(list_[0])
+                fun_name_ = list_[1]
+                if qsa_widget:
+                    context_ = qsa_widget.iface
+            else:
+                context_ = iface
+                fun_name_ = fun_get_color
+
+            function_color = getattr(context_, fun_name_, None)
+            if function_color is None:
+                raise Exception(
+                    "No se ha resuelto functionGetColor %s desde %s" % (fun_get_color, context_)
+                )
+
+        self._color_function_key = color_key
+        self._color_function = function_color
+        return function_color
+
+    def _build_column_plan(self) -> None:
+        """Precompute field info and display formatters of every column."""
+
+        date_format = None
+        try:
+            locale.setlocale(locale.LC_TIME, "")
+            if os.name == "nt":
+                date_format = "%%d/%%m/%%y"
+            else:
+                date_format = locale.nl_langinfo(locale.D_FMT)
+            date_format = date_format.replace("y", "Y")  # Año con 4 dígitos
+            date_format = date_format.replace("/", "-")  # Separadores
+        except AttributeError:
+            import platform
+
+            LOGGER.warning(
+                "locale specific date format is not yet implemented for %s", platform.system()
+            )
+
+        self._column_plan = [
+            DisplayColumn(self.metadata().indexFieldObject(col), date_format)
+            for col in range(self.cols)
+        ]
+        self._row_cache = {}
+        self._color_function_key = None
+        self._color_function = None
+
     def update_rows(self) -> None:
         """Update virtual records managed by its model."""
 
@@ -590,6 +619,8 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
                 self.sql_fields.append(field.name())
 
+        self._build_column_plan()
+
     def insert_current_buffer(self) -> bool:
         """Insert data from current buffer."""
         try:
@@ -648,9 +679,12 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
         self._last_grid_row = -1
         self._last_grid_obj = None
+        self._row_cache = {}
+        self._obj_cache.clear()
         self._parent.clear_buffer()
 
         where_filter = self.buildWhere()
+        self.where_filter = where_filter
 
         # """ FIN """
 
@@ -706,13 +740,40 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         # print("COUNT", sql_count)
 
         # print("QUERY", sql_query)
-        result_count = self.session.execute(sql_count)
-
-        rows_loaded = result_count.fetchone()[0]
+        rows_loaded, exact = self._count_rows(sql_count, where_filter)
+
+        if rows_loaded or not exact:
+            if application.USE_KEYSET_PAGINATION and not self.metadata().isQuery():
+                self._data_proxy = KeysetProxyIndex(
+                    self.session,
+                    self.driver_sql,
+                    self.metadata().name(),
+                    self.metadata().primaryKey(),
+                    where_filter,
+                    rows_loaded,
+                    exact=exact,
+                )
+            else:
+                order_items: List[Tuple[str, str]] = []
+                if not self.metadata().isQuery():
+                    order_items = split_order_items(
+                        where_filter, self.metadata().name(), self.metadata().primaryKey()
+                    )[1]
+
+                if len(order_items) > 1:  # Se guardan las claves de orden de cada fila cargada.
+                    sql_query = "SELECT %s FROM %s %s" % (
+                        ", ".join(
+                            [self.metadata().primaryKey()]
+                            + [expr for expr, direction in order_items]
+                        ),
+                        self.metadata().name(),
+                        where_filter,
+                    )
 
-        if rows_loaded:
-            result_query = self.session.execute(sql_query)
-            self._data_proxy = ProxyIndex(result_query, rows_loaded)
+                result_query = self.session.execute(sql_query)
+                self._data_proxy = ProxyIndex(
+                    result_query, rows_loaded, exact, sort_keys=len(order_items) > 1
+                )
             # self._qry_rows_loaded = len(self._data_proxy)
             # self._data_proxy = [data[0] for data in data_fetched]
             self.need_update = False
@@ -721,6 +782,42 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         if self.parent_view:
             self.update_rows()
 
+    def _count_rows(self, sql_count: str, where_filter: str) -> Tuple[int, bool]:
+        """Return rows count according to count mode and if it is exact."""
+
+        if self._count_mode == self.COUNT_LAZY:
+            return 0, False
+
+        elif self._count_mode == self.COUNT_ESTIMATED and not self.metadata().isQuery():
+            estimated = self.driver_sql.estimated_row_count(
+                self.metadata().name(), split_where(where_filter)[0]
+            )
+            if estimated is not None:
+                return estimated, False
+
+        return self.session.execute(sql_count).fetchone()[0], True
+
+    def canFetchMore(  # type: ignore [override]
+        self, parent: Optional[QtCore.QModelIndex] = None
+    ) -> bool:
+        """Return if the rows count is not complete yet."""
+
+        return self._data_proxy is not None and not (
+            self._data_proxy._exact or self._data_proxy._exhausted
+        )
+
+    def fetchMore(  # type: ignore [override]
+        self, parent: Optional[QtCore.QModelIndex] = None
+    ) -> None:
+        """Fetch more rows when the rows count is not complete yet."""
+
+        rows = self.rowCount()
+        if self.canFetchMore() and self._data_proxy.fetch_more():  # type: ignore [union-attr]
+            new_rows = self.rowCount()
+            if new_rows > rows:
+                self.beginInsertRows(parent or QtCore.QModelIndex(), rows, new_rows - 1)
+                self.endInsertRows()
+
     def buildWhere(self) -> str:
         """Return valid where."""
 
@@ -756,35 +853,22 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         # print("* updateCacheData", mode)
         # mode 1- Insert, 2 - Edit, 3 - Del
 
+        self._row_cache = {}
         if self._disable_refresh:
             return True
 
         pk_name = self._parent.primaryKey()
         pk_value = self._parent.buffer().value(pk_name)
-        where_filter = self.buildWhere()
-
-        sql_query = "SELECT %s FROM %s %s" % (
-            self.metadata().primaryKey(),
-            self.metadata().name(),
-            where_filter,
+        table_name = self.metadata().name()
+        condition, order_items = split_order_items(self.buildWhere(), table_name, pk_name)
+
+        sql_query = "SELECT %s FROM %s WHERE (%s) AND %s = :pk_value" % (
+            ", ".join([pk_name] + [expr for expr, direction in order_items]),
+            table_name,
+            condition,
+            pk_name,
         )
-        order_by = ""
-        if sql_query.find("ORDER BY") > 1:
-            sql_query = sql_query[: sql_query.find("ORDER BY")]
-            order_by = sql_query[sql_query.find("ORDER BY") :]
-
-        extra_where = " %s" % (
-            self.conn_manager.manager().formatAssignValue(self.metadata().field(pk_name), pk_value)
-        )
-        if extra_where not in sql_query:
-            if sql_query.find("WHERE") > -1:
-                sql_query += " AND"
-            else:
-                sql_query += " WHERE"
-            sql_query += extra_where
-
-        result = self.session.execute(sql_query)
-        new_data = result.fetchone()
+        new_data = self.session.execute(text(sql_query), {"pk_value": pk_value}).fetchone()
 
         if new_data is None and mode in [1, 2]:  # mode 3 allways returns None
             LOGGER.debug("no valid data to update cache!")
@@ -792,132 +876,216 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
         if self._data_proxy is None:
             LOGGER.debug("data_proxy is empty!")
-            return True
-        elif (
-            mode == 1 and new_data[0] in self._data_proxy._cached_data
-        ):  # if exists dont need Insert.
+            return mode == 3
+        elif isinstance(self._data_proxy, KeysetProxyIndex):
+            self._obj_cache.clear()
+            return self._data_proxy.update_cache(mode, new_data is not None, pk_value)
+        elif mode == 1 and new_data[0] in self._data_proxy:  # if exists dont need Insert.
             return True
 
-        if mode == 1:  # Insert.
+        if mode in [1, 3]:  # Las filas se desplazan, las páginas cacheadas ya no son válidas.
+            self._obj_cache.clear()
 
-            if order_by:
-                LOGGER.warning("FIXME! update chache whit alternative order_by")
+        if mode == 1:  # Insert.
+            position = self._sorted_position(order_items, tuple(new_data))
+            if position == -1:
                 return False
-            else:
 
-                current_pos = None
-                min_val = 0
-                max_val = self._data_proxy._total_rows
-
-                while True:
-                    upper = None
-
-                    if self.rowCount():
-
-                        if current_pos is None:
-                            current_pos = max_val // 2
-
-                        while current_pos > self._data_proxy._last_current_size:
-                            if not self._data_proxy.fetch_more():
-                                break
-
-                        if current_pos < self._data_proxy._last_current_size:
-                            data = self._data_proxy[current_pos]
-                        else:
-                            LOGGER.warning(
-                                "Error seek possition %s over %s (len %s). Total: %s"
-                                % (
-                                    current_pos,
-                                    self._data_proxy._qry_rows_loaded,
-                                    self._data_proxy._last_current_size,
-                                    self._data_proxy._total_rows,
-                                )
-                            )
-
-                        if pk_value > data:
-                            if current_pos == max_val or current_pos == 0:
-                                upper = True
-                            else:
-
-                                min_val = current_pos
-                                current_pos += (max_val - min_val) // 2
-                        else:
-                            if current_pos == min_val or current_pos == 0:
-                                upper = False
-                            else:
-
-                                max_val = current_pos
-                                current_pos -= (max_val - min_val) // 2
-
-                        if (max_val - min_val) // 2 == 0:
-                            upper = True
-                    elif self._data_proxy is not None:
-                        upper = False
-                        current_pos = 0
-
-                    if upper is not None:
-
-                        if upper:
-                            current_pos += 1
-                        if current_pos < self._data_proxy._last_current_size:
-                            self._data_proxy._cached_data.insert(current_pos, new_data[0])
-                            self._data_proxy._last_current_size += 1
-                            self._data_proxy._total_rows += 1
-                        else:
-                            self._data_proxy._cached_data.append(new_data[0])
-
-                        break
+            self._data_proxy.insert(position, new_data[0], tuple(new_data[1:]))
             return True
 
         elif mode == 2:  # Edit.
             index = self._data_proxy.index(pk_value)
-            self._data_proxy._cached_data[index] = new_data[0]
+            if index > -1:
+                self._data_proxy.delete(index)
+                position = self._sorted_position(order_items, tuple(new_data))
+                if position == -1:
+                    return False
+
+                self._data_proxy.insert(position, new_data[0], tuple(new_data[1:]))
+                if position == index:
+                    self._obj_cache.invalidate_row(index)
+                else:
+                    self._obj_cache.clear()
 
             return True
 
         elif mode == 3:  # Delete.
             index = self._data_proxy.index(pk_value)
             if index > -1:
-                del self._data_proxy._cached_data[index]
-                self._data_proxy._total_rows -= 1
-                self._data_proxy._last_current_size -= 1
+                self._data_proxy.delete(index)
 
             return True
 
         return False
 
+    def _sorted_position(self, order_items: List[Tuple[str, str]], key_row: Tuple) -> int:
+        """
+        Return the position of a row in the loaded rows, by binary search on the sort keys.
+
+        Numeric and date sort keys are compared with the values cached for the loaded rows. The
+        database compares them when a row has no cached keys, or they are strings or can not be
+        compared in Python (see sorts_before).
+        @param order_items. ORDER BY items (expression, direction), ending with the pk.
+        @param key_row. (pk, sort keys ...) of the row.
+        @return position or -1 if the row is outside the loaded rows and a refresh is needed.
+        """
+
+        data_proxy = cast(ProxyIndex, self._data_proxy)
+        if None in key_row[1:]:  # Los NULL no se pueden comparar.
+            return -1
+
+        pk_name = self.metadata().primaryKey()
+        sql_before = "SELECT COUNT(%s) FROM %s WHERE %s = :pk_value AND (%s)" % (
+            pk_name,
+            self.metadata().name(),
+            pk_name,
+            keyset_predicate(order_items, True),
+        )
+        params = {"key_%s" % number: value for number, value in enumerate(key_row[1:])}
+
+        loaded = data_proxy._last_current_size
+        low, high = 0, loaded
+        while low < high:
+            middle = (low + high) // 2
+            pk_value = data_proxy[middle]
+            sort_key = (pk_value,) if len(order_items) == 1 else data_proxy.sort_key(pk_value)
+            before = sorts_before(order_items, sort_key, key_row[1:])
+            if before is None:
+                params["pk_value"] = pk_value
+                before = bool(self.session.execute(text(sql_before), params).fetchone()[0])
+
+            if before:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == loaded and (
+            loaded < data_proxy._total_rows or not (data_proxy._exact or data_proxy._exhausted)
+        ):  # Queda fuera de las filas cargadas.
+            return -1
+
+        return low
+
     def get_obj_from_row(self, row: int) -> Optional[Callable]:
         """Return row object from proxy."""
         ret_ = None
 
         if row > -1 and row < self.rowCount() and self._data_proxy:
-            # print("get_obj_from_row", row, self._data_proxy[row])
+            rows = self.rowCount()
             pk_value = self._data_proxy[row]
-            # print("get_obj_from_row", row, pk_value)
+            if rows != self.rowCount() and self.parent_view is not None:
+                QtCore.QTimer.singleShot(0, self.update_rows)
+            if pk_value is None:  # La fila estimada no existe.
+                return None
             session_ = self.session
+            page = self._obj_cache.page_of(row)
+            ret_ = self._obj_cache.get(page, pk_value, session_)
+            if ret_ is None:
+                ret_ = self._load_obj_page(page, session_).get(pk_value)
 
-            query = orm_utils.DynamicFilter(
-                query=session_.query(self._parent._cursor_model),
-                model_class=self._parent._cursor_model,
-            )
-            query.set_filter_condition_from_string(
-                "%s = %s"
-                % (self.metadata().primaryKey(), str(pk_value).replace(" ", "_|_space_|_"))
-            )
-            try:
-                ret_ = query.return_query().first()
-            except Exception as error:
-                raise Exception("get_object_from_row %s (%s) : %s" % (row, pk_value, error))
-            # for number, obj_ in enumerate(self._data_proxy):
-            #    if number == row:
-            #        return obj_
+            if ret_ is None:  # El pk no casa con el del objeto (tipos distintos, etc).
+                ret_ = self._get_single_obj(row, pk_value, session_)
 
         return ret_
 
+    def _load_obj_page(self, page: int, session_: "orm.Session") -> Dict[Any, Any]:
+        """Load every object of a page with a single query and store them in the cache."""
+
+        if self._data_proxy is None:
+            return {}
+
+        first_row = page * self._obj_cache.page_size
+        last_row = min(first_row + self._obj_cache.page_size, self.rowCount())
+        pk_values = [self._data_proxy[row] for row in range(first_row, last_row)]
+
+        model_class = self._parent._cursor_model
+        pk_name = self.metadata().primaryKey()
+        pk_column = getattr(model_class, pk_name)
+
+        query = session_.query(model_class).filter(pk_column.in_(pk_values))
+        loaded_fields = self.loaded_fields()
+        if loaded_fields:
+            query = query.options(
+                orm.load_only(*[getattr(model_class, name) for name in loaded_fields])
+            )
+
+        try:
+            objects = query.all()
+        except Exception as error:
+            raise Exception("get_object_from_row page %s (%s) : %s" % (page, pk_values, error))
+
+        page_objects = {getattr(obj_, pk_name): obj_ for obj_ in objects}
+        self._obj_cache.set_page(page, page_objects)
+        return page_objects
+
+    def set_projection(self, field_names: Optional[List[str]]) -> None:
+        """
+        Set the fields loaded with the row objects.
+
+        @param field_names. Fields needed, the pk is always loaded. None to use the default
+        projection: visible grid fields and relation keys if there is a parent view, all
+        fields otherwise.
+        """
+
+        self._projection = field_names
+        self._obj_cache.clear()
+
+    def loaded_fields(self) -> List[str]:
+        """
+        Return the fields loaded with the row objects, or an empty list to load all of them.
+
+        The rest are deferred and PNBuffer loads them together the first time one is asked.
+        """
+
+        if self.metadata().isQuery() or (self._projection is None and self.parent_view is None):
+            return []
+
+        columns = self._parent._cursor_model.__table__.columns.keys()
+        pk_name = self.metadata().primaryKey()
+        fields: List[str] = []
+        for field in self.metadata().fieldList():
+            name = field.name()
+            if name not in columns:
+                continue
+
+            if self._projection is not None:
+                needed = name == pk_name or name in self._projection
+            else:
+                needed = (
+                    name == pk_name
+                    or field.visibleGrid()
+                    or field.relationM1() is not None
+                    or bool(field.relationList())
+                )
+
+            if needed:
+                fields.append(name)
+
+        return [] if len(fields) == len(columns) else fields
+
+    def _get_single_obj(self, row: int, pk_value: Any, session_: "orm.Session") -> Any:
+        """Return a single object using a dynamic filter."""
+
+        query = orm_utils.DynamicFilter(
+            query=session_.query(self._parent._cursor_model),
+            model_class=self._parent._cursor_model,
+        )
+        query.set_filter_condition_from_string(
+            "%s = %s" % (self.metadata().primaryKey(), str(pk_value).replace(" ", "_|_space_|_"))
+        )
+        try:
+            return query.return_query().first()
+        except Exception as error:
+            raise Exception("get_object_from_row %s (%s) : %s" % (row, pk_value, error))
+
     def seek_row(self, row: int) -> bool:
         """Seek row selected."""
 
         if not hasattr(self, "_current_row_index") or row != self._current_row_index:
+            while row >= self.rowCount() and self.canFetchMore():
+                self.fetchMore()
+
             if row > -1 and row < self.rowCount():
                 object_ = self.get_obj_from_row(row)
                 if object_ is None:
@@ -947,12 +1115,85 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         ret_ = -1
         try:
             if self._data_proxy:
-                ret_ = self._data_proxy.index(pk_value)
+                if isinstance(self._data_proxy, ProxyIndex) and pk_value not in self._data_proxy:
+                    ret_ = self._query_pk_row(pk_value)
+                else:
+                    ret_ = self._data_proxy.index(pk_value)
         except ValueError:
             pass
 
         return ret_
 
+    def _query_pk_row(self, pk_value: Any) -> int:
+        """Return the row of a primary key not fetched yet, asking its position to the database."""
+
+        data_proxy = cast(ProxyIndex, self._data_proxy)
+        if not self.metadata().isQuery():
+            condition, order_items = split_order_items(
+                self.where_filter, self.metadata().name(), self.metadata().primaryKey()
+            )
+            position = query_row_position(
+                self.session,
+                self.metadata().name(),
+                self.metadata().primaryKey(),
+                condition,
+                order_items,
+                pk_value,
+            )
+            if position == -1:  # No cumple el filtro, no hace falta recorrer las filas.
+                return -1
+            elif position is not None:
+                if position >= data_proxy._last_current_size and data_proxy._exact:
+                    self._load_pk_window(position, condition, order_items)
+                if data_proxy[position] == pk_value:
+                    return position
+
+        return data_proxy.index(pk_value)
+
+    def _load_pk_window(
+        self, position: int, condition: str, order_items: List[Tuple[str, str]]
+    ) -> None:
+        """Read the pks of the rows around a position not fetched yet, with a single page query."""
+
+        first_position = (
+            max(position - PK_WINDOW_SIZE // 2, 0) // OBJECT_PAGE_SIZE * OBJECT_PAGE_SIZE
+        )
+        sql = "SELECT %s FROM %s WHERE %s ORDER BY %s" % (
+            self.metadata().primaryKey(),
+            self.metadata().name(),
+            condition,
+            ", ".join(["%s %s" % (expr, direction) for expr, direction in order_items]),
+        )
+        sql += self.driver_sql.paging_clause(PK_WINDOW_SIZE, first_position)
+        cast(ProxyIndex, self._data_proxy).set_window(
+            first_position, [row[0] for row in self.session.execute(text(sql)).fetchall()]
+        )
+
+    def position_from_value(self, field_name: str, value: Any, order_asc: bool = True) -> int:
+        """
+        Return the position of the first row whose field value is not sorted before a value.
+
+        Rows are supposed to be sorted by field_name. The position is calculated by the database
+        counting the rows before the value, so no row is fetched.
+        @param field_name. field name.
+        @param value. value to search.
+        @param order_asc. True if rows are sorted in ascending order.
+        @return position or -1 if it can not be calculated.
+        """
+
+        if self.metadata().isQuery():
+            return -1
+
+        condition = split_where(self.where_filter)[0]
+        sql = "SELECT COUNT(%s) FROM %s WHERE (%s) AND %s %s :value" % (
+            self.metadata().primaryKey(),
+            self.metadata().name(),
+            condition,
+            field_name,
+            "<" if order_asc else ">",
+        )
+        return int(self.session.execute(text(sql), {"value": value}).fetchone()[0])
+
     def fieldType(self, field_name: str) -> str:
         """
         Retrieve field type for a given field name.
@@ -1082,8 +1323,98 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         self.parent_view = parent_view
 
 
+class DisplayColumn:
+    """
+    DisplayColumn class.
+
+    Field info and display formatter of a PNCursorTableModel column, computed once per refresh.
+    """
+
+    name: str
+    type_: str
+    alignment: int
+    display: Callable[[Any], Any]
+
+    def __init__(self, field: "pnfieldmetadata.PNFieldMetaData", date_format: Optional[str]):
+        """Initialize."""
+
+        self.name = field.name()
+        self.type_ = field.type()
+        self._part_integer = field.partInteger()
+        self._part_decimal = field.partDecimal()
+        self._date_format = date_format
+
+        self.alignment = QtCore.Qt.AlignVCenter
+        if self.type_ in ("int", "double", "uint"):
+            self.alignment = self.alignment | QtCore.Qt.AlignRight
+        elif self.type_ in ("bool", "date", "time"):
+            self.alignment = self.alignment | QtCore.Qt.AlignCenter
+        elif self.type_ in ("unlock", "pixmap"):
+            self.alignment = self.alignment | QtCore.Qt.AlignHCenter
+
+        if not field.visible() or self.type_ in ("unlock", "pixmap"):
+            self.display = self._display_none
+        else:
+            self.display = getattr(self, "_display_%s" % self.type_, self._display_raw)
+
+    def _display_none(self, value: Any) -> Any:
+        return None
+
+    def _display_raw(self, value: Any) -> Any:
+        return value
+
+    def _display_bool(self, value: Any) -> str:
+        return "Sí" if value in (True, "1") else "No"
+
+    def _display_string(self, value: Any) -> str:
+        return str(value) if value else ""
+
+    _display_timestamp = _display_string
+
+    def _display_stringlist(self, value: Any) -> str:
+        return str(value) if value else "..."
+
+    def _display_time(self, value: Any) -> Any:
+        return str(value) if value else value
+
+    def _display_date(self, value: Any) -> Any:
+        # Si es str lo paso a datetime.date
+        if isinstance(value, str):
+            if len(value.split("-")[0]) == 4:
+                value = date_conversion.date_amd_to_dma(value)
+
+            if value:
+                list_ = value.split("-")
+                value = datetime.date(int(list_[2]), int(list_[1]), int(list_[0]))
+
+        if isinstance(value, datetime.date) and self._date_format is not None:
+            value = value.strftime(self._date_format)
+
+        return value
+
+    def _display_double(self, value: Any) -> Any:
+        if value is not None:
+            # d = QtCore.QLocale.system().toString(float(d), "f", field.partDecimal())
+            value = utils_base.format_double(value, self._part_integer, self._part_decimal)
+        return value
+
+    def _display_int(self, value: Any) -> Any:
+        if value is not None:
+            value = QtCore.QLocale.system().toString(int(value))
+        return value
+
+    _display_uint = _display_int
+
+
 class ProxyIndex:
-    """ProxyIndex class."""
+    """
+    ProxyIndex class.
+
+    Keeps the primary keys fetched from the model query and a hash index pk -> row.
+    Inserts and deletes don't rewrite the index, they are stored as pending shifts
+    and applied lazily when a pk is looked up. A window of pks beyond the fetched ones can
+    be set, so a row found by position is read without fetching every row before it.
+    """
 
     _query = None
     _cached_data: List[Any] = []
@@ -1092,15 +1423,44 @@ class ProxyIndex:
     _qry_rows_total: int
     _qry_rows_loaded: int
     _last_current_size: int
+    _pk_index: Dict[Any, Tuple[int, int]]
+    _shifts: List[Tuple[int, int]]
+    _exact: bool
+    _exhausted: bool
+    _sort_keys: Optional[Dict[Any, Tuple]]
+    _window_first: int
+    _window: List[Any]
+    _window_index: Dict[Any, int]
+
+    def __init__(
+        self, result_query: Any, rows: int, exact: bool = True, sort_keys: bool = False
+    ) -> None:
+        """
+        Initialize.
 
-    def __init__(self, result_query: Any, rows: int) -> None:
-        """Initialize."""
+        @param result_query. pk query result.
+        @param rows. rows count. If not exact, it is corrected while rows are fetched.
+        @param exact. True if rows is the exact count.
+        @param sort_keys. True if the query rows are (pk, sort keys ...). Sort keys are kept by pk.
+        """
 
         self._query = result_query
-        self._qry_rows_loaded = 2000 if rows > 2000 else rows
-        self._cached_data = [data[0] for data in result_query.fetchmany(self._qry_rows_loaded)]
+        self._exact = exact
+        self._exhausted = False
+        self._sort_keys = {} if sort_keys else None
+        self._clear_window()
+        if exact:
+            self._qry_rows_loaded = 2000 if rows > 2000 else rows
+            self._cached_data = self._read_rows(self._qry_rows_loaded)
+        else:
+            self._qry_rows_loaded = 0
+            self._cached_data = []
+
         self._last_current_size = self._qry_rows_loaded
         self._qry_rows_total = self._total_rows = int(rows)
+        self._rebuild_index()
+        if not exact:
+            self.fetch_more()
 
     def __getitem__(self, index: int) -> Any:
         """Return item value."""
@@ -1108,6 +1468,10 @@ class ProxyIndex:
         data = None
 
         if self._last_current_size <= index:
+            window_position = index - self._window_first
+            if 0 <= window_position < len(self._window):
+                return self._window[window_position]
+
             self.fetch_more(index - self._last_current_size + 1)
 
         if self._last_current_size > index:
@@ -1123,40 +1487,150 @@ class ProxyIndex:
 
         return data
 
+    def __contains__(self, value: Any) -> bool:
+        """Return if a value is already fetched."""
+
+        return value in self._pk_index
+
     def index(self, value: Any) -> int:
         """Return data position."""
 
-        while value not in self._cached_data:
+        while True:
+            position = self._resolve(value)
+            if position > -1:
+                return position
+            elif value in self._window_index:
+                return self._window_first + self._window_index[value]
+
             if not self.fetch_more():
                 return -1
 
-        return self._cached_data.index(value)
+    def sort_key(self, value: Any) -> Optional[Tuple]:
+        """Return the cached sort keys of a value, or None if they are not cached."""
+
+        return self._sort_keys.get(value) if self._sort_keys is not None else None
+
+    def set_window(self, first_position: int, values: List[Any]) -> None:
+        """Set the pks of the rows from first_position on, read apart from the query."""
+
+        self._window_first = first_position
+        self._window = values
+        self._window_index = {}
+        for position, value in enumerate(values):
+            self._window_index.setdefault(value, position)
+
+    def _clear_window(self) -> None:
+        """Discard the window. Its positions are not valid after an insert or a delete."""
+
+        self._window_first = 0
+        self._window = []
+        self._window_index = {}
+
+    def insert(self, position: int, value: Any, sort_key: Optional[Tuple] = None) -> None:
+        """Insert a new value in a position."""
+
+        self._clear_window()
+        if self._sort_keys is not None and sort_key is not None:
+            self._sort_keys[value] = sort_key
+
+        self._cached_data.insert(position, value)
+        self._last_current_size += 1
+        self._total_rows += 1
+        self._add_shift(position, 1)
+        current = self._resolve(value)
+        if current == -1 or current > position:
+            self._pk_index[value] = (position, len(self._shifts))
+
+    def append(self, value: Any) -> None:
+        """Append a value at the end of cached data."""
+
+        self._cached_data.append(value)
+        self._add_to_index(len(self._cached_data) - 1, [value])
+
+    def replace(self, position: int, value: Any) -> None:
+        """Replace the value of a position."""
+
+        self._clear_window()
+        old_value = self._cached_data[position]
+        if old_value == value:
+            return
+
+        if self._resolve(old_value) == position:
+            del self._pk_index[old_value]
+
+        self._cached_data[position] = value
+        current = self._resolve(value)
+        if current == -1 or current > position:
+            self._pk_index[value] = (position, len(self._shifts))
+
+    def delete(self, position: int) -> None:
+        """Delete a position."""
+
+        self._clear_window()
+        value = self._cached_data.pop(position)
+        if self._sort_keys is not None:
+            self._sort_keys.pop(value, None)
+        self._total_rows -= 1
+        self._last_current_size -= 1
+        if self._resolve(value) == position:
+            del self._pk_index[value]
 
-        # while True:
-        #    try:
-        #        return self._cached_data.index(value)
-        #    except ValueError:
-        #        if not self.fetch_more():
-        #            return -1
+        self._add_shift(position + 1, -1)
+
+    def _resolve(self, value: Any) -> int:
+        """Return the current position of a fetched value, applying pending shifts."""
+
+        entry = self._pk_index.get(value)
+        if entry is None:
+            return -1
+
+        position, version = entry
+        if version < len(self._shifts):
+            for from_position, delta in self._shifts[version:]:
+                if position >= from_position:
+                    position += delta
+
+            self._pk_index[value] = (position, len(self._shifts))
+
+        return position
+
+    def _add_shift(self, from_position: int, delta: int) -> None:
+        """Register a displacement of every position equal or greater than from_position."""
+
+        self._shifts.append((from_position, delta))
+        if len(self._shifts) > PK_INDEX_MAX_SHIFTS:
+            self._rebuild_index()
+
+    def _add_to_index(self, first_position: int, values: List[Any]) -> None:
+        """Add values to index. Only the first position of a repeated value is kept."""
+
+        version = len(self._shifts)
+        for position, value in enumerate(values, first_position):
+            if value not in self._pk_index:
+                self._pk_index[value] = (position, version)
+
+    def _rebuild_index(self) -> None:
+        """Rebuild index from cached data."""
+
+        self._pk_index = {}
+        self._shifts = []
+        self._add_to_index(0, self._cached_data)
 
     def fetch_more(self, fetch_size: int = 2000) -> bool:
         """Fetch more data to cached data."""
 
+        if not self._exact:
+            return self._fetch_more_inexact(fetch_size)
+
         if self._qry_rows_loaded < self._qry_rows_total and self._query:
             to_fetch = self._qry_rows_loaded + fetch_size
             if to_fetch > 0 and to_fetch >= self._qry_rows_total:
                 fetch_size = self._qry_rows_total - self._qry_rows_loaded
 
             try:
-                self._cached_data += [
-                    data[0][0]
-                    if isinstance(
-                        data[0],
-                        engine.cursor.CursorResult,  # type: ignore [attr-defined] # noqa: F821
-                    )
-                    else data[0]
-                    for data in self._query.fetchmany(fetch_size)
-                ]
+                first_position = len(self._cached_data)
+                self._cached_data += self._read_rows(fetch_size)
+                self._add_to_index(first_position, self._cached_data[first_position:])
                 self._qry_rows_loaded += fetch_size
                 self._last_current_size += fetch_size
                 return True
@@ -1169,3 +1643,466 @@ class ProxyIndex:
                 )
 
         return False
+
+    def _fetch_more_inexact(self, fetch_size: int) -> bool:
+        """Fetch more data when the rows count is estimated or unknown."""
+
+        if self._exhausted or not self._query:
+            return False
+
+        first_position = len(self._cached_data)
+        try:
+            self._cached_data += self._read_rows(fetch_size)
+        except exc.InterfaceError:
+            LOGGER.warning(
+                "Se ha producido un problema al recoger %s primary keys del caché. cacheadas: %s",
+                fetch_size,
+                self._qry_rows_loaded,
+            )
+            return False
+
+        fetched = len(self._cached_data) - first_position
+        self._add_to_index(first_position, self._cached_data[first_position:])
+        self._qry_rows_loaded += fetched
+        self._last_current_size += fetched
+
+        if fetched < fetch_size:  # Se ha llegado al final, el total ya es exacto.
+            self._exhausted = True
+            self._qry_rows_total = self._qry_rows_loaded
+            self._total_rows = self._last_current_size
+        elif self._last_current_size > self._total_rows:
+            self._qry_rows_total = self._qry_rows_loaded
+            self._total_rows = self._last_current_size
+
+        return fetched > 0
+
+    def _read_rows(self, fetch_size: int) -> List[Any]:
+        """Fetch rows from the query and return their pks, saving sort keys if needed."""
+
+        values = []
+        for data in self._query.fetchmany(fetch_size):  # type: ignore [union-attr]
+            value = data[0]
+            if isinstance(
+                value, engine.cursor.CursorResult  # type: ignore [attr-defined] # noqa: F821
+            ):
+                value = value[0]
+            elif self._sort_keys is not None:
+                self._sort_keys[value] = tuple(data[1:])
+            values.append(value)
+
+        return values
+
+
+class ObjectCache:
+    """
+    ObjectCache class.
+
+    Keeps the ORM objects of the last pages of rows read, so a grid or a next() loop
+    costs one query per page instead of one query per row.
+    """
+
+    _pages: "collections.OrderedDict[int, Dict[Any, Any]]"
+    page_size: int
+    max_pages: int
+
+    def __init__(
+        self, page_size: int = OBJECT_PAGE_SIZE, max_pages: int = OBJECT_CACHE_PAGES
+    ) -> None:
+        """Initialize."""
+
+        self._pages = collections.OrderedDict()
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+    def page_of(self, row: int) -> int:
+        """Return page number of a row."""
+
+        return row // self.page_size
+
+    def get(self, page: int, pk_value: Any, session_: "orm.Session") -> Any:
+        """Return a cached object or None if it is not valid anymore."""
+
+        page_objects = self._pages.get(page)
+        if page_objects is None:
+            return None
+
+        self._pages.move_to_end(page)
+        obj_ = page_objects.get(pk_value)
+        if obj_ is not None:
+            state = inspect(obj_)
+            if state.session is not session_ or state.expired or state.deleted or state.detached:
+                return None
+
+        return obj_
+
+    def set_page(self, page: int, page_objects: Dict[Any, Any]) -> None:
+        """Store a page, discarding the least recently used one if needed."""
+
+        self._pages[page] = page_objects
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def invalidate_row(self, row: int) -> None:
+        """Discard the page containing a row."""
+
+        self._pages.pop(self.page_of(row), None)
+
+    def clear(self) -> None:
+        """Discard all pages."""
+
+        self._pages.clear()
+
+
+class KeysetProxyIndex:
+    """
+    KeysetProxyIndex class.
+
+    Alternative to ProxyIndex for large tables. Primary keys are read by pages using
+    keyset predicates over the ORDER BY columns plus the primary key, only a few pages are
+    kept in memory and no result set stays open between calls.
+    """
+
+    _session: "orm.Session"
+    _driver: "pnsqlschema.PNSqlSchema"
+    _table_name: str
+    _pk_name: str
+    _condition: str
+    _order_items: List[Tuple[str, str]]
+    _pages: "collections.OrderedDict[int, List[Tuple]]"
+    _total_rows: int
+    _last_current_size: int
+    _qry_rows_loaded: int
+    _exact: bool
+    _exhausted: bool
+    page_size: int
+    max_pages: int
+
+    def __init__(
+        self,
+        session: "orm.Session",
+        driver: "pnsqlschema.PNSqlSchema",
+        table_name: str,
+        pk_name: str,
+        where_filter: str,
+        rows: int,
+        page_size: int = KEYSET_PAGE_SIZE,
+        max_pages: int = KEYSET_MAX_PAGES,
+        exact: bool = True,
+    ) -> None:
+        """Initialize."""
+
+        self._session = session
+        self._driver = driver
+        self._table_name = table_name
+        self._pk_name = pk_name
+        self._condition, self._order_items = split_order_items(where_filter, table_name, pk_name)
+        self._pages = collections.OrderedDict()
+        self._total_rows = self._last_current_size = self._qry_rows_loaded = int(rows)
+        self._exact = exact
+        self._exhausted = False
+        self.page_size = page_size
+        self.max_pages = max_pages
+        if not exact:
+            self._page(0)
+
+    def __getitem__(self, index: int) -> Any:
+        """Return item value."""
+
+        if index < 0 or index >= self._total_rows:
+            return None
+
+        page = self._page(index // self.page_size)
+        position = index % self.page_size
+        return page[position][0] if position < len(page) else None
+
+    def __contains__(self, value: Any) -> bool:
+        """Return if a value is in a resident page."""
+
+        return self._resident_position(value) > -1
+
+    def index(self, value: Any) -> int:
+        """Return data position."""
+
+        position = self._resident_position(value)
+        if position == -1:
+            position = self._query_position(value)
+
+        return position
+
+    def fetch_more(self, fetch_size: int = 2000) -> bool:
+        """Load the page after the known rows when the rows count is not exact."""
+
+        if self._exact or self._exhausted:
+            return False
+
+        rows = self._total_rows
+        self._page(self._total_rows // self.page_size)
+        return self._total_rows > rows
+
+    def update_cache(self, mode: int, found: bool, pk_value: Any = None) -> bool:
+        """Update after insert (1), edit (2) or delete (3). Return False if refresh is needed."""
+
+        if mode == 3:
+            if self._resident_position(pk_value) > -1:
+                self._total_rows -= 1
+            elif self._exact:  # No se sabe si la fila borrada cumplía el filtro, se cuenta.
+                self._total_rows = self._count()
+            self._last_current_size = self._qry_rows_loaded = self._total_rows
+
+        elif mode == 1 and found and (self._exact or self._exhausted):
+            self._total_rows += 1
+            self._last_current_size = self._qry_rows_loaded = self._total_rows
+
+        self._pages.clear()
+        return True
+
+    def _page(self, page_number: int) -> List[Tuple]:
+        """Return a page, loading it if is not resident."""
+
+        page = self._pages.get(page_number)
+        if page is None:
+            previous = self._pages.get(page_number - 1)
+            if previous and len(previous) == self.page_size and None not in previous[-1][1:]:
+                page = self._fetch(self._after_predicate(), self._key_params(previous[-1]))
+            else:
+                page = self._fetch("1 = 1", {}, page_number * self.page_size)
+
+            self._adjust_total(page_number, page)
+            self._pages[page_number] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+        self._pages.move_to_end(page_number)
+        return page
+
+    def _adjust_total(self, page_number: int, page: List[Tuple]) -> None:
+        """Correct an estimated or unknown rows count with a loaded page."""
+
+        if self._exact or self._exhausted:
+            return
+
+        loaded_rows = page_number * self.page_size + len(page)
+        if not page and page_number:  # La estimación se ha pasado, se cuenta una vez.
+            loaded_rows = self._count()
+            self._exhausted = True
+        elif len(page) < self.page_size:
+            self._exhausted = True
+        elif loaded_rows < self._total_rows:
+            return
+
+        self._total_rows = self._last_current_size = self._qry_rows_loaded = loaded_rows
+
+    def _count(self) -> int:
+        """Return the rows count."""
+
+        sql = "SELECT COUNT(%s) FROM %s WHERE %s" % (
+            self._pk_name,
+            self._table_name,
+            self._condition,
+        )
+        return int(self._session.execute(text(sql)).fetchone()[0])
+
+    def _fetch(self, predicate: str, params: Dict[str, Any], offset: int = 0) -> List[Tuple]:
+        """Run a page query."""
+
+        sql = "SELECT %s FROM %s WHERE (%s) AND (%s) ORDER BY %s" % (
+            ", ".join([self._pk_name] + [expr for expr, direction in self._order_items]),
+            self._table_name,
+            self._condition,
+            predicate,
+            ", ".join(["%s %s" % (expr, direction) for expr, direction in self._order_items]),
+        )
+        sql += self._driver.paging_clause(self.page_size, offset)
+
+        return [tuple(row) for row in self._session.execute(text(sql), params).fetchall()]
+
+    def _resident_position(self, value: Any) -> int:
+        """Return the position of a value if it is in a resident page."""
+
+        for page_number, page in self._pages.items():
+            for position, row in enumerate(page):
+                if row[0] == value:
+                    return page_number * self.page_size + position
+
+        return -1
+
+    def _query_position(self, value: Any) -> int:
+        """Return the position of a value counting the rows sorted before it."""
+
+        position = query_row_position(
+            self._session,
+            self._table_name,
+            self._pk_name,
+            self._condition,
+            self._order_items,
+            value,
+        )
+        if position is None:  # Los NULL no se pueden comparar, se recorren las páginas.
+            for number in range(self._total_rows):
+                if self[number] == value:
+                    return number
+            return -1
+
+        return position
+
+    def _after_predicate(self, before: bool = False) -> str:
+        """Return the keyset predicate for rows after (or before) the key parameters."""
+
+        return keyset_predicate(self._order_items, before)
+
+    def _key_params(self, row: Tuple) -> Dict[str, Any]:
+        """Return key parameters from a page row."""
+
+        return {"key_%s" % number: value for number, value in enumerate(row[1:])}
+
+
+def split_where(where_filter: str) -> Tuple[str, str]:
+    """Split a where filter built by PNCursorTableModel.buildWhere into condition and order by."""
+
+    where_filter = where_filter.strip().replace(";", "")
+    order_by = ""
+    pos_order = where_filter.upper().find("ORDER BY")
+    if pos_order > -1:
+        order_by = where_filter[pos_order + 8 :]
+        where_filter = where_filter[:pos_order]
+
+    condition = where_filter.strip()
+    if condition.upper().startswith("WHERE "):
+        condition = condition[6:].strip()
+
+    return condition or "1 = 1", order_by.strip()
+
+
+def split_order_items(
+    where_filter: str, table_name: str, pk_name: str
+) -> Tuple[str, List[Tuple[str, str]]]:
+    """Split a where filter into condition and order items (expr, direction) ending with the pk."""
+
+    condition, order_by = split_where(where_filter)
+
+    items: List[str] = []
+    depth = 0
+    current = ""
+    for char in order_by:
+        if char == "," and not depth:
+            items.append(current)
+            current = ""
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        current += char
+    items.append(current)
+
+    order_items: List[Tuple[str, str]] = []
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        direction = "ASC"
+        if item.upper().endswith(" DESC"):
+            direction = "DESC"
+            item = item[:-5].strip()
+        elif item.upper().endswith(" ASC"):
+            item = item[:-4].strip()
+        order_items.append((item, direction))
+
+    pk_names = (pk_name.lower(), "%s.%s" % (table_name.lower(), pk_name.lower()))
+    if not [expr for expr, direction in order_items if expr.lower() in pk_names]:
+        order_items.append((pk_name, "ASC"))
+
+    return condition, order_items
+
+
+def query_row_position(
+    session: "orm.Session",
+    table_name: str,
+    pk_name: str,
+    condition: str,
+    order_items: List[Tuple[str, str]],
+    pk_value: Any,
+) -> Optional[int]:
+    """
+    Return the position of a row counting the rows sorted before it.
+
+    @param order_items. ORDER BY items (expression, direction), ending with the pk.
+    @return position, -1 if the row does not match the condition or None if any sort key is NULL.
+    """
+
+    sql = "SELECT %s FROM %s WHERE (%s) AND %s = :pk_value" % (
+        ", ".join([pk_name] + [expr for expr, direction in order_items]),
+        table_name,
+        condition,
+        pk_name,
+    )
+    row = session.execute(text(sql), {"pk_value": pk_value}).fetchone()
+    if row is None:
+        return -1
+
+    row = tuple(row)
+    if None in row[1:]:  # Los NULL no se pueden comparar.
+        return None
+
+    sql = "SELECT COUNT(%s) FROM %s WHERE (%s) AND (%s)" % (
+        pk_name,
+        table_name,
+        condition,
+        keyset_predicate(order_items, True),
+    )
+    params = {"key_%s" % number: value for number, value in enumerate(row[1:])}
+    return int(session.execute(text(sql), params).fetchone()[0])
+
+
+def sorts_before(
+    order_items: List[Tuple[str, str]], sort_key: Optional[Tuple], key: Tuple
+) -> Optional[bool]:
+    """
+    Return if sort_key goes before key in order_items, or None if they can not be compared.
+
+    Only numbers of the same kind and dates are compared in Python. Strings depend on the
+    database collation (case, accents ...), so they are left to the database.
+    """
+
+    if sort_key is None:
+        return None
+
+    for (expr, direction), value, other in zip(order_items, sort_key, key):
+        if value is None or other is None:
+            return None
+        if value == other:
+            continue
+        if not _same_order_kind(value, other):
+            return None
+
+        return (value < other) == (direction == "ASC")
+
+    return False
+
+
+def _same_order_kind(value: Any, other: Any) -> bool:
+    """Return if Python orders both values as the database does."""
+
+    for kinds in ((int, decimal.Decimal), (float,), (datetime.datetime,), (datetime.date,)):
+        if isinstance(value, kinds) and isinstance(other, kinds):
+            # datetime es subclase de date: sólo se comparan si son del mismo tipo.
+            return isinstance(value, datetime.datetime) == isinstance(other, datetime.datetime)
+
+    return False
+
+
+def keyset_predicate(order_items: List[Tuple[str, str]], before: bool = False) -> str:
+    """Return the predicate for rows sorted after (or before) the :key_N parameters."""
+
+    options = []
+    for number, (expr, direction) in enumerate(order_items):
+        upper = (direction == "ASC") != before
+        conditions = [
+            "%s = :key_%s" % (prev_expr, prev_number)
+            for prev_number, (prev_expr, prev_direction) in enumerate(order_items[:number])
+        ]
+        conditions.append("%s %s :key_%s" % (expr, ">" if upper else "<", number))
+        options.append("(%s)" % " AND ".join(conditions))
+
+    return " OR ".join(options)
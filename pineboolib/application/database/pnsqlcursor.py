@@ -24,7 +24,7 @@ from . import pncursortablemodel
 import weakref
 import datetime
 
-from typing import Any, Optional, List, Dict, Union, TYPE_CHECKING
+from typing import Any, Optional, List, Dict, Tuple, Union, TYPE_CHECKING
 
 
 from pineboolib.application.acls import pnboolflagstate
@@ -34,6 +34,7 @@ if TYPE_CHECKING:
     from pineboolib.application.metadata import pntablemetadata  # noqa: F401 # pragma: no cover
     from pineboolib.application.metadata import pnrelationmetadata  # noqa: F401 # pragma: no cover
     from pineboolib.application.metadata import pnaction  # noqa: F401 # pragma: no cover
+    from pineboolib.application.metadata import pnfieldmetadata  # noqa: F401 # pragma: no cover
     from pineboolib.interfaces import iconnection  # noqa: F401 # pragma: no cover
 
 CONNECTION_CURSORS: Dict[str, List[str]] = {}
@@ -41,6 +42,9 @@ CONNECTION_CURSORS: Dict[str, List[str]] = {}
 
 LOGGER = logging.get_logger(__name__)
 
+INTEGRITY_BULK_SIZE = 500  # Valores por consulta en msgCheckIntegrityBulk.
+BULK_INSERT_SIZE = 500  # Registros por INSERT en el modo de inserción masiva.
+
 
 class PNSqlCursor(isqlcursor.ISqlCursor):
     """
@@ -986,38 +990,38 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         The referential integrity is checked when trying to delete, the non-duplication of
         primary keys and if there are nulls in fields that do not allow it when inserted or edited.
         If any verification fails, it returns a message describing the fault.
+        All the checks that need the database are resolved with a single query.
 
         @return Error message
         """
-        message = ""
+        messages: List[str] = []
+        checks: List[List[Any]] = []  # [posición del mensaje, tipo, expresión, mensaje, campo]
 
         if self.private_cursor.buffer_ is None or self.private_cursor.metadata_ is None:
-            message = "\nBuffer vacío o no hay metadatos"
-            return message
+            return "\nBuffer vacío o no hay metadatos"
 
         if not self.buffer().is_valid():
             return "\nEl registro ha sido borrado de la BD"
 
         field_list = self.metadata().fieldList()
+        manager = self.db().connManager().manager()
 
         if self.private_cursor.mode_access_ in [self.Insert, self.Edit]:
             if self.private_cursor.mode_access_ == self.Edit:
                 if not self.isModifiedBuffer():
-                    return message
+                    return ""
 
             checked_compound_key = False
 
             if not field_list:
-                return message
+                return ""
 
             for field in field_list:
                 field_name = field.name()
                 relation_m1 = field.relationM1()
                 value = None
                 table_metadata = (
-                    self.db().connManager().manager().metadata(relation_m1.foreignTable())
-                    if relation_m1
-                    else None
+                    manager.metadata(relation_m1.foreignTable()) if relation_m1 else None
                 )
 
                 if not self.isNull(field_name):
@@ -1027,9 +1031,8 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                             if not relation_m1.checkIn() or table_metadata is None:
                                 continue
                         else:
-                            message = (
-                                message
-                                + "\n"
+                            messages.append(
+                                "\n"
                                 + "FLSqlCursor : Error en metadatos, el campo %s tiene un campo asociado pero no existe "
                                 "relación muchos a uno:%s" % (self.table(), field_name)
                             )
@@ -1048,45 +1051,32 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                         elif not self.isNull(field_metadata_name):
 
                             filter_ = "%s AND %s" % (
-                                self.db()
-                                .connManager()
-                                .manager()
-                                .formatAssignValue(
+                                manager.formatAssignValue(
                                     field.associatedFieldFilterTo(),
                                     assoc_field_metadata,
                                     assoc_value,
                                     True,
                                 ),
-                                self.db()
-                                .connManager()
-                                .manager()
-                                .formatAssignValue(relation_m1.foreignField(), field, value, True),
+                                manager.formatAssignValue(
+                                    relation_m1.foreignField(), field, value, True
+                                ),
+                            )
+                            self._add_integrity_check(
+                                checks,
+                                messages,
+                                "value",
+                                table_metadata.name(),
+                                filter_,
+                                "\n%s:%s : %s no pertenece a %s"
+                                % (self.table(), field.alias(), value, assoc_value),
+                                field.associatedFieldFilterTo(),
+                                field_metadata_name,
                             )
-
-                            qry = pnsqlquery.PNSqlQuery(None, self.db())
-                            qry.setTablesList(table_metadata.name())
-                            qry.setSelect(field.associatedFieldFilterTo())
-                            qry.setFrom(table_metadata.name())
-                            qry.setWhere(filter_)
-                            qry.setForwardOnly(True)
-                            qry.exec_()
-                            if not qry.first():
-                                message += "\n%s:%s : %s no pertenece a %s" % (
-                                    self.table(),
-                                    field.alias(),
-                                    value,
-                                    assoc_value,
-                                )
-                            else:
-                                self.private_cursor.buffer_.set_value(
-                                    field_metadata_name, qry.value(0)
-                                )
 
                         else:
-                            message += "\n%s:%s : %s no se puede asociar aun valor NULO" % (
-                                self.table(),
-                                field.alias(),
-                                value,
+                            messages.append(
+                                "\n%s:%s : %s no se puede asociar aun valor NULO"
+                                % (self.table(), field.alias(), value)
                             )
 
                 if self.private_cursor.mode_access_ == self.Edit:
@@ -1098,7 +1088,7 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                     and not field.allowNull()
                     and not field.type() in ("serial")
                 ):
-                    message += "\n%s:%s : No puede ser nulo" % (self.table(), field.alias())
+                    messages.append("\n%s:%s : No puede ser nulo" % (self.table(), field.alias()))
 
                 if field.isUnique():
                     primary_key = self.metadata().primaryKey()
@@ -1107,88 +1097,54 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                         field_mtd = self.private_cursor.metadata_.field(primary_key)
                         if field_mtd is None:
                             raise Exception("pk field is not found!")
-                        qry = pnsqlquery.PNSqlQuery(None, self.db().connectionName())
-                        qry.setTablesList(self.table())
-                        qry.setSelect(field_name)
-                        qry.setFrom(self.table())
-                        qry.setWhere(
+
+                        self._add_integrity_check(
+                            checks,
+                            messages,
+                            "exists",
+                            self.table(),
                             "%s AND %s <> %s"
                             % (
-                                self.db()
-                                .connManager()
-                                .manager()
-                                .formatAssignValue(field, value, True),
+                                manager.formatAssignValue(field, value, True),
                                 self.private_cursor.metadata_.primaryKey(
                                     self.private_cursor._is_query
                                 ),
-                                self.db()
-                                .connManager()
-                                .manager()
-                                .formatValue(field_mtd.type(), value_primary_key),
-                            )
+                                manager.formatValue(field_mtd.type(), value_primary_key),
+                            ),
+                            "\n%s:%s : Requiere valores únicos, y ya hay otro registro con el valor %s en este campo"
+                            % (self.table(), field.alias(), value),
                         )
-                        qry.setForwardOnly(True)
-                        qry.exec_()
-                        if qry.first():
-                            message += (
-                                "\n%s:%s : Requiere valores únicos, y ya hay otro registro con el valor %s en este campo"
-                                % (self.table(), field.alias(), value)
-                            )
 
                 if (
                     field.isPrimaryKey()
                     and self.private_cursor.mode_access_ == self.Insert
                     and value is not None
                 ):
-                    qry = pnsqlquery.PNSqlQuery(None, self.db())
-                    qry.setTablesList(self.table())
-                    qry.setSelect(field_name)
-                    qry.setFrom(self.table())
-                    qry.setWhere(
-                        self.db().connManager().manager().formatAssignValue(field, value, True)
+                    self._add_integrity_check(
+                        checks,
+                        messages,
+                        "exists",
+                        self.table(),
+                        manager.formatAssignValue(field, value, True),
+                        "\n%s:%s : Es clave primaria y requiere valores únicos, y ya hay otro registro con el valor %s en este campo"
+                        % (self.table(), field.alias(), value),
                     )
-                    qry.setForwardOnly(True)
-                    qry.exec_()
-                    if qry.next():
-                        message += (
-                            "\n%s:%s : Es clave primaria y requiere valores únicos, y ya hay otro registro con el valor %s en este campo"
-                            % (self.table(), field.alias(), value)
-                        )
 
                 if relation_m1 and value and str(value) != "NULL" and table_metadata is not None:
                     if relation_m1.checkIn() and not relation_m1.foreignTable() == self.table():
-                        # r = field.relationM1()
-                        qry = pnsqlquery.PNSqlQuery(None, self.db())
-                        qry.setTablesList(table_metadata.name())
-                        qry.setSelect(relation_m1.foreignField())
-                        qry.setFrom(table_metadata.name())
-                        qry.setWhere(
-                            self.db()
-                            .connManager()
-                            .manager()
-                            .formatAssignValue(relation_m1.foreignField(), field, value, True)
+                        self._add_integrity_check(
+                            checks,
+                            messages,
+                            "value",
+                            table_metadata.name(),
+                            manager.formatAssignValue(
+                                relation_m1.foreignField(), field, value, True
+                            ),
+                            "\n%s:%s : El valor %s no existe en la tabla %s"
+                            % (self.table(), field.alias(), value, relation_m1.foreignTable()),
+                            relation_m1.foreignField(),
+                            field_name,
                         )
-                        qry.setForwardOnly(True)
-                        # LOGGER.debug(
-                        #    "SQL linea = %s conn name = %s", qry.sql(), self.connectionName()
-                        # )
-                        qry.exec_()
-                        if not qry.next():
-                            LOGGER.warning(
-                                " msgCheckIntegrity. No se encuentra el valor en session: %s, transacción: %s, sql: %s, size: %s",
-                                qry.db().session(),
-                                qry.db().session().transaction,
-                                qry.sql(),
-                                qry.size(),
-                            )
-                            message += "\n%s:%s : El valor %s no existe en la tabla %s" % (
-                                self.table(),
-                                field.alias(),
-                                value,
-                                relation_m1.foreignTable(),
-                            )
-                        else:
-                            self.private_cursor.buffer_.set_value(field_name, qry.value(0))
 
                         if not table_metadata.inCache():
                             del table_metadata
@@ -1211,7 +1167,7 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                         if filter_compound_key:
                             filter_compound_key += " AND "
 
-                        filter_compound_key += "%s" % self.db().connManager().manager().formatAssignValue(
+                        filter_compound_key += "%s" % manager.formatAssignValue(
                             field_compound_key, value_compound_key, True
                         )
 
@@ -1225,20 +1181,15 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
 
                         values_fields = "%s" % str(value_compound_key)
 
-                    qry = pnsqlquery.PNSqlQuery(None, self.db().connectionName())
-                    qry.setTablesList(self.table())
-                    qry.setSelect(field_name)
-                    qry.setFrom(self.table())
-                    if filter_compound_key:
-                        qry.setWhere(filter_compound_key)
-                    qry.setForwardOnly(True)
-                    qry.exec_()
-
-                    if qry.next():
-                        message += (
-                            "\n%s : Requiere valor único, y ya hay otro registro con el valor %s en la tabla %s"
-                            % (field_1, values_fields, self.table())
-                        )
+                    self._add_integrity_check(
+                        checks,
+                        messages,
+                        "exists",
+                        self.table(),
+                        filter_compound_key or "1 = 1",
+                        "\n%s : Requiere valor único, y ya hay otro registro con el valor %s en la tabla %s"
+                        % (field_1, values_fields, self.table()),
+                    )
                     checked_compound_key = True
 
         elif self.private_cursor.mode_access_ == self.Del:
@@ -1252,7 +1203,7 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                 for relation in field.relationList():
                     if not relation.checkIn():
                         continue
-                    metadata = self.db().connManager().manager().metadata(relation.foreignTable())
+                    metadata = manager.metadata(relation.foreignTable())
                     if not metadata:
                         continue
                     field_metadata = metadata.field(relation.foreignField())
@@ -1267,33 +1218,284 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                             continue
 
                     else:
-                        message += (
+                        messages.append(
                             "\nFLSqlCursor : Error en metadatos, %s.%s no es válido.\nCampo relacionado con %s.%s."
                             % (metadata.name(), relation.foreignField(), self.table(), field.name())
                         )
                         continue
 
-                    qry = pnsqlquery.PNSqlQuery(None, self.db().connectionName())
-                    qry.setTablesList(metadata.name())
-                    qry.setSelect(relation.foreignField())
-                    qry.setFrom(metadata.name())
-                    qry.setWhere(
-                        self.db()
-                        .connManager()
-                        .manager()
-                        .formatAssignValue(relation.foreignField(), field, value, True)
+                    self._add_integrity_check(
+                        checks,
+                        messages,
+                        "exists",
+                        metadata.name(),
+                        manager.formatAssignValue(relation.foreignField(), field, value, True),
+                        "\n%s:%s : Con el valor %s hay registros en la tabla %s"
+                        % (self.table(), field.alias(), value, metadata.name()),
                     )
-                    qry.setForwardOnly(True)
-                    qry.exec_()
-                    if qry.next():
-                        message += "\n%s:%s : Con el valor %s hay registros en la tabla %s" % (
-                            self.table(),
-                            field.alias(),
-                            value,
-                            metadata.name(),
+
+        if checks:
+            self._run_integrity_checks(checks, messages)
+
+        return "".join(messages)
+
+    def _add_integrity_check(
+        self,
+        checks: List[List[Any]],
+        messages: List[str],
+        kind: str,
+        table_name: str,
+        where: str,
+        message: str,
+        select: str = "",
+        field_name: str = "",
+    ) -> None:
+        """
+        Add a pending integrity check.
+
+        @param kind "exists" fails if any record matches, "value" fails if none does.
+        @param select Field returned by a "value" check, stored in the buffer field field_name.
+        """
+
+        if kind == "exists":
+            expression = "CASE WHEN EXISTS (SELECT 1 FROM %s WHERE %s) THEN 1 ELSE 0 END" % (
+                table_name,
+                where,
+            )
+        else:
+            expression = "(SELECT MIN(%s) FROM %s WHERE %s)" % (select, table_name, where)
+
+        checks.append([len(messages), kind, expression, message, field_name])
+        messages.append("")
+
+    def _run_integrity_checks(self, checks: List[List[Any]], messages: List[str]) -> None:
+        """Resolve all pending integrity checks with a single query."""
+
+        sql = "SELECT %s" % ", ".join([check[2] for check in checks])
+        result = self.db().execute_query(sql)
+        row = result.fetchone() if result is not None else None
+        if row is None:
+            messages.append(
+                "\n%s : No se pudo comprobar la integridad: %s"
+                % (self.table(), self.db().lastError())
+            )
+            return
+
+        for check, value in zip(checks, row):
+            position, kind, expression, message, field_name = check
+            if kind == "exists":
+                if value:
+                    messages[position] = message
+            elif value is None:
+                LOGGER.warning(
+                    " msgCheckIntegrity. No se encuentra el valor en session: %s, sql: %s",
+                    self.db().session(),
+                    expression,
+                )
+                messages[position] = message
+            elif field_name:
+                self.buffer().set_value(field_name, value)
+
+    def msgCheckIntegrityBulk(self, records: List[Dict[str, Any]]) -> str:
+        """
+        Get message for integrity checks of a set of records to be inserted.
+
+        Null values, duplicated primary keys, unique fields and compound keys and values not found
+        in the related tables are checked with a query per field, compound key or relation for the
+        whole set, not per record.
+
+        @param records List of dicts with the values of each record by field name.
+        @return Error message
+        """
+
+        if self.private_cursor.metadata_ is None:
+            return "\nBuffer vacío o no hay metadatos"
+
+        return "".join([message for position, message in self._bulk_integrity_errors(records)])
+
+    def _bulk_integrity_errors(self, records: List[Dict[str, Any]]) -> List[Tuple[int, str]]:
+        """Return the integrity errors of a set of records, as (position in records, message)."""
+
+        errors: List[Tuple[int, str]] = []
+        checked_compound_key = False
+        for field in self.metadata().fieldList():
+            field_name = field.name()
+            values = [(position, record.get(field_name)) for position, record in enumerate(records)]
+            not_null_values = [
+                (position, value) for position, value in values if value not in (None, "")
+            ]
+
+            if len(not_null_values) < len(values) and not field.allowNull():
+                if field.type() != "serial":
+                    errors += [
+                        (position, "\n%s:%s : No puede ser nulo" % (self.table(), field.alias()))
+                        for position, value in values
+                        if value in (None, "")
+                    ]
+
+            field_list_compound_key = self.metadata().fieldListOfCompoundKey(field_name)
+            if field_list_compound_key and not checked_compound_key:
+                errors += self._bulk_check_compound_key(field_list_compound_key, records)
+                checked_compound_key = True
+
+            if not not_null_values:
+                continue
+
+            if field.isPrimaryKey() or field.isUnique():
+                found = self._bulk_existing_values(
+                    self.table(), field_name, field, [value for position, value in not_null_values]
+                )
+                keys = set()
+                for position, value in not_null_values:
+                    key = self._bulk_value_key(field, value)
+                    if key in found or key in keys:
+                        if field.isPrimaryKey():
+                            errors.append(
+                                (
+                                    position,
+                                    "\n%s:%s : Es clave primaria y requiere valores únicos, "
+                                    "y ya hay otro registro con el valor %s en este campo"
+                                    % (self.table(), field.alias(), value),
+                                )
+                            )
+                        else:
+                            errors.append(
+                                (
+                                    position,
+                                    "\n%s:%s : Requiere valores únicos, "
+                                    "y ya hay otro registro con el valor %s en este campo"
+                                    % (self.table(), field.alias(), value),
+                                )
+                            )
+                    keys.add(key)
+
+            relation_m1 = field.relationM1()
+            if (
+                relation_m1
+                and relation_m1.checkIn()
+                and not relation_m1.foreignTable() == self.table()
+                and self.db().connManager().manager().metadata(relation_m1.foreignTable())
+            ):
+                found = self._bulk_existing_values(
+                    relation_m1.foreignTable(),
+                    relation_m1.foreignField(),
+                    field,
+                    [value for position, value in not_null_values],
+                )
+                for position, value in not_null_values:
+                    if self._bulk_value_key(field, value) not in found and str(value) != "NULL":
+                        errors.append(
+                            (
+                                position,
+                                "\n%s:%s : El valor %s no existe en la tabla %s"
+                                % (self.table(), field.alias(), value, relation_m1.foreignTable()),
+                            )
                         )
 
-        return message
+        return errors
+
+    def _bulk_existing_values(
+        self,
+        table_name: str,
+        field_name: str,
+        field: "pnfieldmetadata.PNFieldMetaData",
+        values: List[Any],
+    ) -> set:
+        """Return the keys of the values found in table_name.field_name."""
+
+        manager = self.db().connManager().manager()
+        upper = field.type() == "string"
+        column = "UPPER(%s)" % field_name if upper else field_name
+        distinct_values = list(dict.fromkeys(values))
+        found = set()
+        for pos in range(0, len(distinct_values), INTEGRITY_BULK_SIZE):
+            sql = "SELECT %s FROM %s WHERE %s IN (%s)" % (
+                field_name,
+                table_name,
+                column,
+                ", ".join(
+                    [
+                        manager.formatValue(field.type(), value, upper)
+                        for value in distinct_values[pos : pos + INTEGRITY_BULK_SIZE]
+                    ]
+                ),
+            )
+            result = self.db().execute_query(sql)
+            if result is not None:
+                found.update([self._bulk_value_key(field, row[0]) for row in result.fetchall()])
+
+        return found
+
+    def _bulk_check_compound_key(
+        self, fields: List["pnfieldmetadata.PNFieldMetaData"], records: List[Dict[str, Any]]
+    ) -> List[Tuple[int, str]]:
+        """Return the errors of the records repeating a compound key, in the table or in the set."""
+
+        manager = self.db().connManager().manager()
+        positions = []
+        rows = []
+        for position, record in enumerate(records):
+            row = tuple([record.get(field.name()) for field in fields])
+            if None not in row:
+                positions.append(position)
+                rows.append(row)
+
+        found = set()
+        for pos in range(0, len(rows), INTEGRITY_BULK_SIZE):
+            chunk = rows[pos : pos + INTEGRITY_BULK_SIZE]
+            where = []
+            for number, field in enumerate(fields):
+                upper = field.type() == "string"
+                where.append(
+                    "%s IN (%s)"
+                    % (
+                        "UPPER(%s)" % field.name() if upper else field.name(),
+                        ", ".join(
+                            [
+                                manager.formatValue(field.type(), value, upper)
+                                for value in dict.fromkeys([row[number] for row in chunk])
+                            ]
+                        ),
+                    )
+                )
+            result = self.db().execute_query(
+                "SELECT %s FROM %s WHERE %s"
+                % (", ".join([field.name() for field in fields]), self.table(), " AND ".join(where))
+            )
+            if result is not None:
+                found.update([self._bulk_row_key(fields, row) for row in result.fetchall()])
+
+        errors = []
+        keys = set()
+        for position, row in zip(positions, rows):
+            key = self._bulk_row_key(fields, row)
+            if key in found or key in keys:
+                errors.append(
+                    (
+                        position,
+                        "\n%s : Requiere valor único, y ya hay otro registro con el valor %s en la tabla %s"
+                        % (
+                            "+".join([field.alias() for field in fields]),
+                            "+".join([str(value) for value in row]),
+                            self.table(),
+                        ),
+                    )
+                )
+            keys.add(key)
+
+        return errors
+
+    def _bulk_row_key(
+        self, fields: List["pnfieldmetadata.PNFieldMetaData"], row: Tuple
+    ) -> Tuple[str, ...]:
+        """Return a comparable key of the values of a compound key."""
+
+        return tuple([self._bulk_value_key(field, value) for field, value in zip(fields, row)])
+
+    def _bulk_value_key(self, field: "pnfieldmetadata.PNFieldMetaData", value: Any) -> str:
+        """Return a comparable key of a field value."""
+
+        return str(value).upper() if field.type() == "string" else str(value)
 
     def checkIntegrity(self, showError: bool = True) -> bool:
         """
@@ -1491,6 +1693,14 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
 
         if not self.private_cursor.buffer_ or not self.private_cursor.metadata_:
             return 0
+
+        if not self.metadata().isQuery():
+            pk_value = self.private_cursor.buffer_.value(self.primaryKey())
+            if pk_value is not None:
+                pos = self.model().find_pk_row(pk_value)
+                if pos > -1:
+                    return pos
+
         # Faster version for this function::
         return self.at() if self.isValid() else 0
 
@@ -1519,6 +1729,19 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
             raise Exception("Metadata is not set")
 
         if field_name in self.metadata().fieldNames():
+            if fin < 0:
+                return ret
+
+            if field_name == self.primaryKey() and not self.metadata().isQuery():
+                ret = self.model().find_pk_row(value)
+                if ret > -1:
+                    return ret
+
+            # La posición la calcula la base de datos, sin recorrer las filas.
+            ret = self.model().position_from_value(field_name, value, order_asc)
+            if ret > -1:
+                return ret
+
             while ini <= fin:
                 mid = int((ini + fin) / 2)
                 mid_value = str(self.model().value(mid, field_name))
@@ -2269,6 +2492,17 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         """
         self.private_cursor._model.setSortOrder(sort_order)
 
+    def setProjection(self, field_names: Optional[List[str]] = None) -> None:
+        """
+        Specify the fields loaded with each record.
+
+        The rest of fields are loaded together the first time one of them is asked.
+
+        @param field_names. Fields needed, the primary key is always loaded. None to use the
+        visible grid fields and relation keys when the cursor is shown in a grid.
+        """
+        self.private_cursor._model.set_projection(field_names)
+
     @decorators.pyqt_slot()
     def baseFilter(self) -> str:
         """
@@ -2545,6 +2779,9 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
             )
             return False
 
+        if self.private_cursor._bulk_records is not None and self.modeAccess() == self.Insert:
+            return self._bulk_commit_buffer()
+
         # if (
         #    self.db().interactiveGUI()
         #    and self.db().canDetectLocks()
@@ -2585,14 +2822,7 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         function_record_del_after = "recordDelAfter%s" % self.table()
         function_record_del_before = "recordDelBefore%s" % self.table()
 
-        script_record_iface = None
-        pn_action = self.action()
-        if pn_action is not None:
-            if pn_action.name() in application.PROJECT.actions.keys():
-                action_ = application.PROJECT.actions[pn_action.name()]
-                if action_ is not None:
-                    script_record = action_.load_record_widget()
-                    script_record_iface = getattr(script_record, "iface", None)
+        script_record_iface, module_iface = self._commit_ifaces()
         if self.modeAccess() in [self.Edit, self.Insert]:
             field_list = self.metadata().fieldList()
 
@@ -2616,15 +2846,6 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                         if value not in (True, False, None):
                             self.setValueBuffer(field.name(), value)
 
-        id_module = self.db().connManager().managerModules().idModuleOfFile("%s.mtd" % self.table())
-        # FIXME: module_script is FLFormDB
-        action = application.PROJECT.actions[
-            id_module if id_module in application.PROJECT.actions.keys() else "sys"
-        ]
-
-        module_script = action.load_master_widget()
-
-        module_iface: Any = getattr(module_script, "iface", None)
         if self.modeAccess() != PNSqlCursor.Browse and function_before_commit:
             # BEFORE_COMMIT
             func_ = getattr(module_iface, function_before_commit, None)
@@ -2887,6 +3108,234 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         self.bufferCommited.emit()
         return True
 
+    def _commit_ifaces(self) -> Tuple[Any, Any]:
+        """Return the record script iface and the module script iface used by commit hooks."""
+
+        script_record_iface = None
+        pn_action = self.action()
+        if pn_action is not None:
+            if pn_action.name() in application.PROJECT.actions.keys():
+                action_ = application.PROJECT.actions[pn_action.name()]
+                if action_ is not None:
+                    script_record = action_.load_record_widget()
+                    script_record_iface = getattr(script_record, "iface", None)
+
+        id_module = self.db().connManager().managerModules().idModuleOfFile("%s.mtd" % self.table())
+        # FIXME: module_script is FLFormDB
+        action = application.PROJECT.actions[
+            id_module if id_module in application.PROJECT.actions.keys() else "sys"
+        ]
+
+        module_script = action.load_master_widget()
+
+        return script_record_iface, getattr(module_script, "iface", None)
+
+    def beginBulkInsert(self, batch_size: int = BULK_INSERT_SIZE) -> None:
+        """
+        Start the bulk insert mode.
+
+        While it is active, commitBuffer in Insert mode runs calculateField and beforeCommit for
+        the record and queues it. Every batch_size records the queue is checked with
+        msgCheckIntegrityBulk and written with a single multi-row INSERT. The model is refreshed
+        once, by endBulkInsert.
+
+        The records are written with a Core INSERT, not flushed through the ORM, so afterCommit,
+        the before_/after_ hooks of the model, validateCursor and the session events of the
+        model objects are not run. Tables with an afterCommit script or with model hooks are
+        refused.
+
+        @param batch_size. Records per INSERT.
+        """
+
+        from .orm import basemodel
+
+        if not self.private_cursor.metadata_ or self.metadata().isQuery():
+            raise Exception("Bulk insert mode needs a table cursor")
+
+        ifaces = self._commit_ifaces()
+        function_after_commit = "afterCommit_%s" % self.table()
+        if self.activatedCommitActions() and getattr(ifaces[1], function_after_commit, None):
+            raise Exception(
+                "Bulk insert mode can not run %s. Deactivate the commit actions"
+                % function_after_commit
+            )
+
+        for hook in ["before_flush", "before_new", "after_flush", "after_new"]:
+            if getattr(self._cursor_model, hook) is not getattr(basemodel.BaseModel, hook):
+                raise Exception("Bulk insert mode can not run %s.%s" % (self.table(), hook))
+
+        private_cursor = self.private_cursor
+        private_cursor._bulk_records = []
+        private_cursor._bulk_size = max(batch_size, 1)
+        private_cursor._bulk_count = 0
+        private_cursor._bulk_rejected = []
+        private_cursor._bulk_ifaces = ifaces
+        table_columns = self._cursor_model.__table__.columns.keys()
+        private_cursor._bulk_fields = [
+            field.name()
+            for field in self.metadata().fieldList()
+            if not field.isCheck() and field.name() in table_columns
+        ]
+        self._preallocate_bulk_serials()
+
+    def endBulkInsert(self) -> bool:
+        """
+        Write the queued records, end the bulk insert mode and refresh the model.
+
+        @return False if the last batch could not be written. See bulkRejected.
+        """
+
+        if self.private_cursor._bulk_records is None:
+            return True
+
+        result = self._flush_bulk_records()
+        self.private_cursor._bulk_records = None
+        self.private_cursor._bulk_ifaces = (None, None)
+        self.model().refresh()
+        self.cursorUpdated.emit()
+        return result
+
+    def bulkRejected(self) -> List[Tuple[int, str]]:
+        """
+        Return the records rejected since beginBulkInsert.
+
+        @return List of (record number starting at 1, reason).
+        """
+
+        return list(self.private_cursor._bulk_rejected)
+
+    def _bulk_commit_buffer(self) -> bool:
+        """Run the commit hooks of the buffer and queue it, in bulk insert mode."""
+
+        private_cursor = self.private_cursor
+        private_cursor._bulk_count += 1
+        number = private_cursor._bulk_count
+        script_record_iface, module_iface = private_cursor._bulk_ifaces
+
+        func_ = getattr(script_record_iface, "calculateField", None)
+        if func_ is not None:
+            for field in self.metadata().fieldList():
+                if field.calculated() and not field.isCheck():
+                    value = func_(field.name())
+                    if value not in (True, False, None):
+                        self.setValueBuffer(field.name(), value)
+
+        function_before_commit = "beforeCommit_%s" % self.table()
+        func_ = getattr(module_iface, function_before_commit, None)
+        if func_ is not None and self.activatedCommitActions():
+            value = func_(self)
+            if value and not isinstance(value, bool) or value is False:
+                LOGGER.warning("CommitBuffer cancelado. %s devolvió False.", function_before_commit)
+                private_cursor._bulk_rejected.append(
+                    (number, "%s devolvió False" % function_before_commit)
+                )
+                return False
+
+        cursor_relation = private_cursor.cursor_relation_
+        relation = private_cursor.relation_
+        if cursor_relation and relation and cursor_relation.metadata():
+            foreign_value = cursor_relation.valueBuffer(relation.foreignField())
+            if foreign_value:
+                self.setValueBuffer(relation.field(), foreign_value)
+
+        if not self.buffer().apply_buffer():
+            LOGGER.warning("CommitBuffer en Insert cancelado. Fallo al aplicar el buffer al objeto")
+            private_cursor._bulk_rejected.append((number, "Fallo al aplicar el buffer al objeto"))
+            return False
+
+        obj_ = self.buffer().current_object()
+        row = {name: getattr(obj_, name, None) for name in private_cursor._bulk_fields}
+        bulk_records = private_cursor._bulk_records
+        if bulk_records is None:
+            return False
+
+        bulk_records.append((number, row))
+        if len(bulk_records) >= private_cursor._bulk_size:
+            return self._flush_bulk_records()
+
+        return True
+
+    def _flush_bulk_records(self) -> bool:
+        """
+        Check and write the queued records with a single multi-row INSERT.
+
+        The records with integrity errors are rejected and the rest are written together. If the
+        INSERT fails, they are written record by record, so only the offending records are
+        rejected.
+
+        @return False if any record of the batch was rejected. See bulkRejected.
+        """
+
+        private_cursor = self.private_cursor
+        records = private_cursor._bulk_records or []
+        private_cursor._bulk_records = []
+        if not records:
+            return True
+
+        rejected: List[Tuple[int, str]] = []
+        if private_cursor._activated_check_integrity:
+            errors: Dict[int, str] = {}
+            for position, message in self._bulk_integrity_errors([row for number, row in records]):
+                errors[position] = errors.get(position, "") + message
+
+            for position, message in errors.items():
+                number = records[position][0]
+                LOGGER.warning("CommitBuffer cancelado. Registro %s:%s", number, message)
+                rejected.append((number, message))
+
+            records = [record for position, record in enumerate(records) if position not in errors]
+
+        use_nested = not self.transactionLevel()
+        if use_nested:
+            self.db().transaction()
+
+        written = records
+        error = self._insert_bulk_rows([row for number, row in records]) if records else ""
+        if error:
+            LOGGER.warning(
+                "Fallo en la inserción masiva. Se inserta registro a registro: %s", error
+            )
+            written = []
+            for number, row in records:
+                error = self._insert_bulk_rows([row])
+                if error:
+                    LOGGER.warning("CommitBuffer cancelado. Registro %s: %s", number, error)
+                    rejected.append((number, error))
+                else:
+                    written.append((number, row))
+
+        if use_nested and not self.db().commit():
+            LOGGER.warning(
+                "CommitBuffer cancelado. db().commitTransaction devolvió False.", stack_info=True
+            )
+            rejected += [(number, self.db().lastError()) for number, row in written]
+            self.db().rollback()
+
+        private_cursor._bulk_rejected += sorted(rejected)
+        self._preallocate_bulk_serials()
+        return not rejected
+
+    def _insert_bulk_rows(self, rows: List[Dict[str, Any]]) -> str:
+        """Insert rows with a single INSERT inside a savepoint. Return the error, if any."""
+
+        session_ = self.db().session()
+        try:
+            with session_.begin_nested():
+                session_.execute(self._cursor_model.__table__.insert(), rows)
+        except Exception as error:
+            return str(error)
+
+        return ""
+
+    def _preallocate_bulk_serials(self) -> None:
+        """Reserve the serial values of the next batch at once."""
+
+        for field in self.metadata().fieldList():
+            if field.type() == "serial":
+                self.db().preallocateSerialVal(
+                    self.table(), field.name(), self.private_cursor._bulk_size
+                )
+
     @decorators.pyqt_slot()
     def commitBufferCursorRelation(self) -> bool:
         """
@@ -3434,6 +3883,12 @@ class PNCursorPrivate(isqlcursor.ICursorPrivate):
         self._in_risks_locks = False
         self.populated_ = False
         self._transactions_opened = []
+        self._bulk_records = None
+        self._bulk_size = BULK_INSERT_SIZE
+        self._bulk_count = 0
+        self._bulk_rejected = []
+        self._bulk_ifaces = (None, None)
+        self._bulk_fields = []
         self._id_ac = 0
         self._id_acos = 0
         self._id_cond = 0
@@ -78,6 +78,7 @@ class PNSqlQueryPrivate(object):
     _tables_list: List[str]
 
     _forward_only: bool
+    _fetch_size: int
     _limit: Optional[int]
     _offset: Optional[int]
 
@@ -95,6 +96,7 @@ class PNSqlQueryPrivate(object):
         self._from = None
 
         self._forward_only = False
+        self._fetch_size = 0
         self._limit = None
         self._offset = None
 
@@ -116,6 +118,10 @@ class PNSqlQuery(object):
     _datos: List[Any]
     _posicion: int
     _last_query: str
+    _result: Any
+    _batch_start: int
+    _size: Optional[int]
+    _last_params: Optional[Dict[str, Any]]
     private_query: PNSqlQueryPrivate
 
     def __init__(self, cx=None, connection_name: Union[str, "IConnection"] = "default") -> None:
@@ -135,9 +141,13 @@ class PNSqlQuery(object):
         self.db().session()  # precarga.
 
         self._last_query = ""
+        self._last_params = None
         self._count_ref_query = self._count_ref_query + 1
         self._row = []
         self._datos = []
+        self._result = None
+        self._batch_start = 0
+        self._size = None
         self._invalid_tables_list = False
         self.private_query._field_list = []
         self._is_active = False
@@ -157,6 +167,7 @@ class PNSqlQuery(object):
         try:
             # if self._connection is not None:
             #    self._connection.close()
+            self._close_result()
             del self._sql_inspector
         except Exception:
             pass
@@ -175,17 +186,21 @@ class PNSqlQuery(object):
 
         return self._sql_inspector
 
-    def exec_(self, sql: Optional[str] = "") -> bool:
+    def exec_(self, sql: Optional[str] = "", params: Optional[Dict[str, Any]] = None) -> bool:
         """
         Run a query.
 
         This can be specified or calculated from the values ​​previously provided.
         @param sql. query text.
+        @param params. bound parameters values, written as :name in the query text.
         @return True or False return if the execution is successful.
         """
         self._is_active = False
+        self._close_result()
+        self._size = None
 
-        sql = sql if sql else self.sql()
+        params = dict(params) if params else {}
+        sql = sql if sql else self._build_sql(params)
 
         if not sql:
             LOGGER.warning("exec_: no sql provided and PNSqlQuery.sql() also returned empty")
@@ -198,6 +213,7 @@ class PNSqlQuery(object):
             return False
 
         self._last_query = sql
+        self._last_params = params or None
 
         if self.private_query._db.driver()._parse_porc:
             sql = sql.replace("%", "%%")
@@ -205,9 +221,17 @@ class PNSqlQuery(object):
         LOGGER.trace(
             "exec_: Ejecutando consulta: <%s> en <%s>", sql, self.db()._name
         )  # type: ignore [misc] # noqa: F821, F401
-        result = self.db().execute_query(sql)
+        stream = self.fetchSize() > 0
+        result = self.db().execute_query(sql, stream, self._last_params)
+        self._batch_start = 0
         try:
-            self._datos = result.fetchall() if result and result.returns_rows else []
+            if not result or not result.returns_rows:
+                self._datos = []
+            elif stream:  # Las filas se van recogiendo por lotes en next().
+                self._result = result
+                self._datos = []
+            else:
+                self._datos = result.fetchall()
         except Exception as error:
             LOGGER.exception("ERROR SQLQUERY!: %s", str(error))
             self._datos = []
@@ -230,6 +254,41 @@ class PNSqlQuery(object):
 
         return True
 
+    def _fetch_batch(self) -> bool:
+        """Fetch the next batch of a streamed query. Return False at the end."""
+
+        if self._result is None:
+            return False
+
+        self._batch_start += len(self._datos)
+        try:
+            self._datos = self._result.fetchmany(self.private_query._fetch_size)
+        except Exception as error:
+            LOGGER.exception("ERROR SQLQUERY!: %s", str(error))
+            self._datos = []
+
+        if not self._datos:
+            self._size = self._batch_start
+            self._close_result()
+            return False
+
+        return True
+
+    def _close_result(self) -> None:
+        """Close the streaming result if it is open."""
+
+        if self._result is not None:
+            try:
+                self._result.close()
+            except Exception as error:
+                LOGGER.warning("Error closing result: %s", str(error))
+            self._result = None
+
+    def _is_streaming(self) -> bool:
+        """Return if rows are fetched by batches (setFetchSize)."""
+
+        return self._result is not None or self._size is not None
+
     def addParameter(self, parameter: Optional["PNParameterQuery"]) -> None:
         """
         Add the parameter description to the parameter dictionary.
@@ -424,6 +483,16 @@ class PNSqlQuery(object):
         replace the parameters with the value they have in the dictionary and return all in a text string.
         @return Text string with the full SQL statement that generates the query.
         """
+
+        return self._build_sql()
+
+    def _build_sql(self, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Return the full SQL statement of the query.
+
+        @param params. If provided, parameters are bound (:name) and their values added to it.
+        @return Text string with the full SQL statement.
+        """
         # for tableName in self.private_query.tablesList_:
         #    if not self.private_query._db.manager().existsTable(tableName) and not self.private_query._db.manager().createTable(tableName):
         #        return
@@ -485,9 +554,14 @@ class PNSqlQuery(object):
                         if parameter:
                             parameter = parameter[0]
 
-                res = res.replace(
-                    "[%s]" % key, "'%s'" % parameter
-                )  # FIXME: ajustar al tipo de dato pnparameterquery.setValue!!
+                if params is not None and key.isidentifier():
+                    if "[%s]" % key in res:
+                        res = res.replace("[%s]" % key, ":%s" % key)
+                        params[key] = parameter
+                else:
+                    res = res.replace(
+                        "[%s]" % key, "'%s'" % parameter
+                    )  # FIXME: ajustar al tipo de dato pnparameterquery.setValue!!
 
         return res
 
@@ -625,15 +699,43 @@ class PNSqlQuery(object):
         if self._row:
             ret = self._row[pos]
 
-        if ret in (None, "None"):
-            ret = self.sql_inspector.resolve_empty_value(pos)
-        else:
-            try:
-                ret = self.sql_inspector.resolve_value(pos, ret, raw)
-            except Exception:
-                LOGGER.exception("value::error retrieving row position %s", pos)
+        return self.sql_inspector.converter(pos)(ret, raw)
+
+    def rows(self, raw: bool = False) -> List[List[Any]]:
+        """
+        Return the converted values of the fetched rows.
+
+        On queries fetched by batches, only the rows of the current batch.
+        @param raw. Same as in value().
+        @return rows list.
+        """
 
-        return ret
+        if not self._datos:
+            return []
+
+        converters = [self.sql_inspector.converter(pos) for pos in range(len(self._datos[0]))]
+        return [
+            [converter(value, raw) for converter, value in zip(converters, row)]
+            for row in self._datos
+        ]
+
+    def column(self, field_name: Union[str, int], raw: bool = False) -> List[Any]:
+        """
+        Return the converted values of a field in the fetched rows.
+
+        On queries fetched by batches, only the rows of the current batch.
+        @param field_name. Field name or position.
+        @param raw. Same as in value().
+        @return values list.
+        """
+
+        pos = (
+            self.sql_inspector.fieldNameToPos(field_name.lower())
+            if isinstance(field_name, str)
+            else field_name
+        )
+        converter = self.sql_inspector.converter(pos)
+        return [converter(row[pos], raw) for row in self._datos]
 
     def isNull(self, field_name: str) -> bool:
         """
@@ -763,9 +865,15 @@ class PNSqlQuery(object):
         """
         Report the number of results returned by the query.
 
+        On queries fetched by batches (setFetchSize), the size is only known once all the rows
+        have been read. Until then it returns -1.
         @return number of results.
         """
-        return len(self._datos)
+
+        if not self._is_streaming():
+            return len(self._datos)
+
+        return -1 if self._size is None else self._size
 
     def fieldMetaDataList(self) -> List["IFieldMetaData"]:
         """
@@ -839,7 +947,7 @@ class PNSqlQuery(object):
 
         @return number of lines.
         """
-        return len(self._datos)
+        return self.size()
 
     def lastError(self) -> str:
         """Return last error if exists , empty elsewhere."""
@@ -859,6 +967,21 @@ class PNSqlQuery(object):
         """Set forward only option value."""
         self.private_query._forward_only = forward
 
+    def fetchSize(self) -> int:
+        """Return rows fetched by batch. 0 fetches all the rows on exec_."""
+        return self.private_query._fetch_size
+
+    def setFetchSize(self, fetch_size: int) -> None:
+        """
+        Set rows fetched by batch.
+
+        With a value > 0 the rows are streamed from the database as next() moves, and the query
+        can only move forward. The result stays open until it is exhausted, so do not run other
+        queries on the same connection inside the loop on drivers without multiple active
+        results (MySQLdb). 0 (default) fetches all the rows on exec_.
+        """
+        self.private_query._fetch_size = fetch_size
+
     def seek(self, position: int, relative=False) -> bool:
         """
         Position the cursor on a given result.
@@ -871,6 +994,17 @@ class PNSqlQuery(object):
         if relative:
             position += self._posicion
 
+        if self._is_streaming():
+            if position < self._posicion:
+                LOGGER.warning("seek: streamed query can not go back to %s", position)
+                return False
+
+            while self._posicion < position:
+                if not self.next():
+                    return False
+
+            return self._posicion == position and position > -1
+
         if self._datos:
             if position >= 0 and position < len(self._datos):
                 self._posicion = position
@@ -886,6 +1020,16 @@ class PNSqlQuery(object):
         @return True or False.
         """
 
+        if self._is_streaming():
+            if self._posicion + 1 - self._batch_start >= len(self._datos):
+                if not self._fetch_batch():
+                    self._posicion = self._batch_start
+                    return False
+
+            self._posicion += 1
+            self._row = self._datos[self._posicion - self._batch_start]
+            return True
+
         if self._datos:
             self._posicion += 1
             if self._posicion < len(self._datos):
@@ -901,6 +1045,10 @@ class PNSqlQuery(object):
         @return True or False.
         """
 
+        if self._is_streaming():
+            LOGGER.warning("prev: streamed query can not go back")
+            return False
+
         if self._datos:
             self._posicion -= 1
             if self._posicion >= 0:
@@ -916,6 +1064,9 @@ class PNSqlQuery(object):
         @return True or False.
         """
 
+        if self._is_streaming():
+            return self.seek(0)
+
         if self._datos:
             self._posicion = 0
             self._row = self._datos[self._posicion]
@@ -930,6 +1081,18 @@ class PNSqlQuery(object):
         @return True or False.
         """
 
+        if self._is_streaming():
+            row = self._row
+            while self.next():
+                row = self._row
+
+            if not self._size:
+                return False
+
+            self._posicion = self._size - 1
+            self._row = row
+            return True
+
         if self._datos:
             self._posicion = len(self._datos) - 1
             self._row = self._datos[self._posicion]
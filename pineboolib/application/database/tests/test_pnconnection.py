@@ -129,7 +129,7 @@ class TestPNConnection(unittest.TestCase):
         conn_.doCommit(cursor, False)
         conn_.canRegenTables()
 
-        self.assertEqual(conn_.tables(1)[0:3], ["flareas", "flfiles", "flgroups"])
+        self.assertEqual(conn_.tables(1)[0:3], ["flareas", "flcounters", "flfiles"])
 
         self.assertEqual(conn_.tables(2), ["sqlite_master"])
         self.assertEqual(conn_.tables(3), [])
@@ -5,7 +5,7 @@ from pineboolib.loader.main import init_testing, finish_testing
 from pineboolib import application
 from pineboolib.application.database import pnsqlcursor
 
-from pineboolib.core.utils import logging
+from pineboolib.core.utils import logging, utils_base
 
 import time
 
@@ -110,6 +110,102 @@ class TestPNConnectionManager(unittest.TestCase):
 
         self.assertTrue(len(conn_manager._thread_sessions))
 
+    def test_reaper(self) -> None:
+        """Test the connections of finished threads are removed in background."""
+        import threading
+
+        conn_manager = application.PROJECT.conn_manager
+        conn_manager.useConn("default")
+        self.assertTrue(conn_manager._reaper is not None and conn_manager._reaper.is_alive())
+
+        keys = []
+
+        def use_conn() -> None:
+            conn_manager.useConn("reaper_test")
+            keys.append(utils_base.session_id("reaper_test"))
+
+        thread = threading.Thread(target=use_conn)
+        thread.start()
+        thread.join()
+        self.assertTrue(keys[0] in conn_manager.connections_dict)
+
+        conn_manager.check_alive_connections()
+        self.assertFalse(keys[0] in conn_manager.connections_dict)
+        self.assertTrue(utils_base.session_id("default") in conn_manager.connections_dict)
+
+        # Las conexiones inactivas de hilos vivos las reconecta su propio hilo.
+        conn_aux = conn_manager.useConn("dbAux")
+        conn_aux._last_activity_time -= 120
+        time_out = conn_manager.connections_time_out
+        conn_manager.set_max_idle_connections(60)
+        try:
+            conn_manager.check_alive_connections()
+            self.assertTrue(conn_manager.connections_dict.get(utils_base.session_id("dbAux")))
+            self.assertFalse(conn_manager.useConn("dbAux") is conn_aux)
+        finally:
+            conn_manager.set_max_idle_connections(time_out)
+
+        conn_manager.stop_reaper()
+        self.assertTrue(conn_manager._reaper is None)
+        conn_manager.start_reaper()
+        self.assertTrue(conn_manager._reaper.is_alive())
+
+    def test_thread_indexed_dict(self) -> None:
+        """Test the thread and name indexes of the registry."""
+        from pineboolib.application.database import pnconnectionmanager
+
+        registry = pnconnectionmanager.ThreadIndexedDict()
+        registry["main_conn"] = 0
+        registry["1|default"] = 1
+        registry["1|dbAux"] = 2
+        registry["2|default|12.5"] = 3
+        self.assertEqual(registry.keys_for("1"), ["1|default", "1|dbAux"])
+        self.assertEqual(registry.keys_for(name="default"), ["1|default", "2|default|12.5"])
+        self.assertEqual(registry.keys_for("2", "default"), ["2|default|12.5"])
+        self.assertEqual(sorted(registry.threads()), ["1", "2"])
+
+        del registry["1|default"]
+        self.assertEqual(registry.pop("2|default|12.5"), 3)
+        self.assertEqual(registry.pop("2|default|12.5", None), None)
+        self.assertEqual(registry.keys_for(name="default"), [])
+        self.assertEqual(registry.threads(), ["1"])
+        registry.clear()
+        self.assertEqual(registry.keys_for("1"), [])
+
+    def test_close_thread(self) -> None:
+        """Test close_thread removes the connections and sessions of a thread."""
+        import threading
+
+        conn_manager = application.PROJECT.conn_manager
+        thread_ids = []
+
+        def use_session() -> None:
+            conn_manager.useConn("default").session()
+            thread_ids.append(str(threading.current_thread().ident))
+
+        thread = threading.Thread(target=use_session)
+        thread.start()
+        thread.join()
+        self.assertTrue(conn_manager._thread_sessions.keys_for(thread_ids[0]))
+        self.assertTrue(conn_manager.current_thread_sessions.keys_for(thread_ids[0]))
+
+        conn_manager.close_thread(thread_ids[0])
+        self.assertFalse(conn_manager.connections_dict.keys_for(thread_ids[0]))
+        self.assertFalse(conn_manager._thread_sessions.keys_for(thread_ids[0]))
+        self.assertFalse(conn_manager.current_thread_sessions.keys_for(thread_ids[0]))
+        self.assertTrue(conn_manager.get_current_thread_sessions())
+
+    def test_pool_config(self) -> None:
+        """Test pool config by connection name."""
+
+        conn_manager = application.PROJECT.conn_manager
+        conn_manager.set_pool_config("pool_test", size=2, recycle=60)
+        self.assertEqual(
+            conn_manager.pool_config["pool_test"], {"pool_size": 2, "pool_recycle": 60}
+        )
+        del conn_manager.pool_config["pool_test"]
+        self.assertTrue(isinstance(conn_manager.pool_metrics(), list))
+
     def user_id(self) -> str:
         """Return user id."""
         global USER_ID
@@ -2,7 +2,7 @@
 
 import unittest
 from pineboolib.loader.main import init_testing, finish_testing
-from pineboolib.application.database import pnsqlcursor
+from pineboolib.application.database import pnsqlcursor, pncursortablemodel
 
 
 class TestPNCursorTableModel(unittest.TestCase):
@@ -148,6 +148,92 @@ class TestPNCursorTableModel(unittest.TestCase):
         model.updateColumnsCount()
         self.assertEqual(model.rowCount(), 3)
 
+    def test_column_plan(self) -> None:
+        """Test precompiled column display plan."""
+        from PyQt5 import QtCore
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.setSort("string_field DESC")
+        cursor.select()
+        model = cursor.model()
+
+        self.assertEqual(len(model._column_plan), model.columnCount())
+        self.assertEqual(model._column_plan[1].name, "string_field")
+        self.assertEqual(model._column_plan[5].display(True), "Sí")
+        self.assertEqual(model._column_plan[1].display(None), "")
+        self.assertEqual(
+            model._column_plan[4].alignment, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignRight
+        )
+
+        self.assertEqual(model.data(model.index(0, 1)), "zzz")
+        self.assertEqual(model._row_cache[(1, QtCore.Qt.DisplayRole)], "zzz")
+        self.assertEqual(model.data(model.index(1, 1)), "yyy")
+        self.assertTrue((1, QtCore.Qt.DisplayRole) in model._row_cache)
+        model.refresh()
+        self.assertFalse(model._row_cache)
+
+    def test_sorted_update_cache(self) -> None:
+        """Test cache update without refresh on sorted cursors."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.setSort("string_field DESC")
+        cursor.select()
+        model = cursor.model()
+        refresh = model.refresh
+        refreshes = []
+        model.refresh = lambda: refreshes.append(1) or refresh()  # type: ignore [assignment]
+        session = model.session
+        execute = session.execute
+        counts = []
+        session.execute = lambda sql, *args, **kwargs: (  # type: ignore [assignment]
+            counts.append(1) if "COUNT" in str(sql) else None
+        ) or execute(sql, *args, **kwargs)
+
+        cursor.setModeAccess(cursor.Insert)
+        cursor.refreshBuffer()
+        cursor.setValueBuffer("string_field", "yyz")
+        try:
+            self.assertTrue(cursor.commitBuffer())
+        finally:
+            del session.execute
+        self.assertTrue(counts)  # Las claves de texto las compara la base de datos.
+        values = [model.value(row, "string_field") for row in range(model.rowCount())]
+        self.assertEqual(values[:3], ["zzz", "yyz", "yyy"])
+        self.assertEqual(values, sorted(values, reverse=True))
+
+        self.assertEqual(cursor.valueBuffer("string_field"), "yyz")
+        cursor.setModeAccess(cursor.Edit)
+        cursor.refreshBuffer()
+        cursor.setValueBuffer("string_field", "aaa")
+        self.assertTrue(cursor.commitBuffer())
+        self.assertFalse(refreshes)
+
+        cursor.select()
+        values = [model.value(row, "string_field") for row in range(model.rowCount())]
+        self.assertEqual(values[-1], "aaa")
+        self.assertEqual(values, sorted(values, reverse=True))
+
+    def test_sorts_before(self) -> None:
+        """Test sort keys compared in Python."""
+        import datetime
+        import decimal
+
+        order = [("field", "ASC"), ("id", "DESC")]
+        self.assertTrue(pncursortablemodel.sorts_before(order, (1, 5), (2, 1)))
+        self.assertTrue(pncursortablemodel.sorts_before(order, (1, 5), (1, 1)))
+        self.assertFalse(pncursortablemodel.sorts_before(order, (1, 5), (1, 5)))
+        self.assertTrue(pncursortablemodel.sorts_before(order, (decimal.Decimal("1.5"), 1), (2, 1)))
+        date = datetime.date(2020, 1, 1)
+        self.assertFalse(pncursortablemodel.sorts_before(order, (date, 1), (date.min, 1)))
+        # Dependen de la base de datos: cotejamiento, NULL o tipos mezclados.
+        self.assertIsNone(pncursortablemodel.sorts_before(order, ("a", 1), ("B", 1)))
+        self.assertIsNone(pncursortablemodel.sorts_before(order, (None, 1), (1, 1)))
+        self.assertIsNone(pncursortablemodel.sorts_before(order, (1.5, 1), (decimal.Decimal(2), 1)))
+        self.assertIsNone(
+            pncursortablemodel.sorts_before(order, (datetime.datetime(2020, 1, 1), 1), (date, 1))
+        )
+        self.assertIsNone(pncursortablemodel.sorts_before(order, None, (1, 1)))
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -212,7 +298,207 @@ class TestFetchMore(unittest.TestCase):
         self.assertTrue(qry_test.last())
         self.assertEqual(qry_test.value(0), "Registro 2101")
 
+    def test_object_cache(self) -> None:
+        """Test object cache pages."""
+
+        from pineboolib.application.database import pnsqlcursor
+
+        cur_test = pnsqlcursor.PNSqlCursor("fltest")
+        cur_test.select()
+        model = cur_test.model()
+        page_size = model._obj_cache.page_size
+        self.assertTrue(cur_test.first())
+        obj_ = model.get_obj_from_row(0)
+        self.assertEqual(len(model._obj_cache._pages), 1)
+        self.assertEqual(model._obj_cache.get(0, obj_.id, model.session), obj_)
+        while cur_test.at() < page_size - 1:
+            self.assertTrue(cur_test.next())
+        self.assertEqual(len(model._obj_cache._pages), 1)
+        self.assertTrue(cur_test.next())
+        self.assertEqual(cur_test.valueBuffer("string_field"), "Registro %s" % page_size)
+        self.assertEqual(len(model._obj_cache._pages), 2)
+        cur_test.refresh()
+        self.assertFalse(0 in model._obj_cache._pages)
+
+    def test_keyset_pagination(self) -> None:
+        """Test keyset pagination."""
+
+        from pineboolib import application
+        from pineboolib.application.database import pnsqlcursor, pncursortablemodel
+
+        application.USE_KEYSET_PAGINATION = True
+        try:
+            cur_test = pnsqlcursor.PNSqlCursor("fltest")
+            cur_test.setSort("string_field DESC")
+            cur_test.select("string_field LIKE 'Registro%'")
+            model = cur_test.model()
+            self.assertTrue(isinstance(model._data_proxy, pncursortablemodel.KeysetProxyIndex))
+            model._data_proxy.page_size = 100
+            model._data_proxy.max_pages = 3
+            self.assertEqual(cur_test.size(), 2102)
+            self.assertTrue(cur_test.first())
+            self.assertEqual(cur_test.valueBuffer("string_field"), "Registro 999")
+            previous = cur_test.valueBuffer("string_field")
+            while cur_test.at() < 350:
+                self.assertTrue(cur_test.next())
+                self.assertLess(cur_test.valueBuffer("string_field"), previous)
+                previous = cur_test.valueBuffer("string_field")
+            self.assertEqual(len(model._data_proxy._pages), 3)
+            self.assertTrue(cur_test.last())
+            self.assertEqual(cur_test.valueBuffer("string_field"), "Registro 0")
+            self.assertTrue(cur_test.seek(1500))
+            pk_value = cur_test.valueBuffer("id")
+            model._data_proxy._pages.clear()
+            self.assertFalse(pk_value in model._data_proxy)
+            self.assertEqual(model.find_pk_row(pk_value), 1500)
+            data_proxy = model._data_proxy
+            cur_test.setModeAccess(cur_test.Insert)
+            cur_test.refreshBuffer()
+            cur_test.setValueBuffer("string_field", "Registro keyset")
+            self.assertTrue(cur_test.commitBuffer())
+            self.assertEqual(cur_test.size(), 2103)
+            self.assertEqual(cur_test.valueBuffer("string_field"), "Registro keyset")
+            cur_test.setModeAccess(cur_test.Del)
+            cur_test.refreshBuffer()
+            self.assertTrue(cur_test.commitBuffer())
+            self.assertTrue(model._data_proxy is data_proxy)
+            self.assertEqual(cur_test.size(), 2102)
+        finally:
+            application.USE_KEYSET_PAGINATION = False
+
+    def test_projection(self) -> None:
+        """Test deferred fields."""
+
+        from pineboolib.application.database import pnsqlcursor
+        from sqlalchemy import inspect
+
+        cur_test = pnsqlcursor.PNSqlCursor("fltest")
+        model = cur_test.model()
+        self.assertEqual(model.loaded_fields(), [])
+        cur_test.setProjection(["string_field"])
+        self.assertEqual(sorted(model.loaded_fields()), ["id", "string_field"])
+        cur_test.select()
+        model.session.expire_all()
+        state = inspect(model.get_obj_from_row(5))
+        self.assertTrue("date_field" in state.unloaded)
+        self.assertFalse("string_field" in state.unloaded)
+        self.assertTrue(cur_test.seek(5))
+        self.assertEqual(cur_test.valueBuffer("string_field"), "Registro 5")
+        self.assertEqual(cur_test.valueBuffer("double_field"), 0)
+        self.assertFalse(set(state.mapper.column_attrs.keys()) & state.unloaded)
+        self.assertEqual(model.get_obj_from_row(5).copy().double_field, 0)
+        cur_test.setProjection()
+        self.assertEqual(model.loaded_fields(), [])
+
+    def test_row_position(self) -> None:
+        """Test row position lookups made by the database."""
+
+        from pineboolib.application.database import pnsqlcursor, pnsqlquery
+
+        cur_test = pnsqlcursor.PNSqlCursor("fltest")
+        cur_test.setSort("string_field DESC")
+        cur_test.select("string_field LIKE 'Registro%'")
+        model = cur_test.model()
+        loaded = model._data_proxy._qry_rows_loaded
+        self.assertLess(loaded, cur_test.size())
+        self.assertEqual(model.find_pk_row(-5), -1)
+        self.assertEqual(model._data_proxy._qry_rows_loaded, loaded)
+
+        qry = pnsqlquery.PNSqlQuery()
+        qry.setSelect("id")
+        qry.setFrom("fltest")
+        qry.setWhere("string_field = 'Registro 0'")
+        self.assertTrue(qry.exec_())
+        self.assertTrue(qry.first())
+        pk_value = qry.value(0)
+        self.assertFalse(pk_value in model._data_proxy)
+        self.assertEqual(model.find_pk_row(pk_value), cur_test.size() - 1)
+        # Sólo se leen los pks de la ventana de la fila, no los anteriores.
+        self.assertEqual(model._data_proxy._qry_rows_loaded, loaded)
+        self.assertEqual(model.value(cur_test.size() - 1, "string_field"), "Registro 0")
+        self.assertEqual(model._data_proxy._qry_rows_loaded, loaded)
+
+        values = sorted(["Registro %s" % number for number in range(2102)], reverse=True)
+        self.assertEqual(
+            cur_test.atFromBinarySearch("string_field", "Registro 1", False),
+            values.index("Registro 1"),
+        )
+        self.assertTrue(cur_test.seek(25))
+        self.assertEqual(cur_test.atFrom(), 25)
+
+    def test_count_modes(self) -> None:
+        """Test lazy and estimated count modes."""
+
+        from pineboolib.application.database import pnsqlcursor
+
+        cur_test = pnsqlcursor.PNSqlCursor("fltest")
+        model = cur_test.model()
+        model.set_count_mode(model.COUNT_LAZY)
+        cur_test.select("string_field LIKE 'Registro%'")
+        self.assertEqual(cur_test.size(), 2000)
+        self.assertTrue(model.canFetchMore())
+        self.assertTrue(cur_test.seek(2101))
+        self.assertEqual(cur_test.valueBuffer("string_field"), "Registro 2101")
+        self.assertEqual(cur_test.size(), 2102)
+        self.assertFalse(model.canFetchMore())
+
+        session_ = model.session
+        session_.execute("ANALYZE")
+        session_.execute("UPDATE sqlite_stat1 SET stat = '3000 1' WHERE tbl = 'fltest'")
+        model.set_count_mode(model.COUNT_ESTIMATED)
+        cur_test.select()
+        self.assertEqual(cur_test.size(), 3000)
+        self.assertFalse(cur_test.seek(2500))
+        self.assertEqual(cur_test.size(), 2102)
+        self.assertTrue(cur_test.last())
+        self.assertEqual(cur_test.valueBuffer("string_field"), "Registro 2101")
+        model.set_count_mode(model.COUNT_EXACT)
+        cur_test.select()
+        self.assertEqual(cur_test.size(), 2102)
+        session_.execute("DELETE FROM sqlite_stat1")
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
         finish_testing()
+
+
+class TestProxyIndex(unittest.TestCase):
+    """TestProxyIndex Class."""
+
+    def test_pk_index(self) -> None:
+        """Test pk index with inserts and deletes."""
+
+        from pineboolib.application.database import pncursortablemodel
+
+        class FakeResult:
+            def __init__(self, values):
+                self._values = list(values)
+
+            def fetchmany(self, size):
+                result = [(value,) for value in self._values[:size]]
+                del self._values[:size]
+                return result
+
+        proxy = pncursortablemodel.ProxyIndex(FakeResult(range(0, 10000, 2)), 5000)
+        self.assertEqual(proxy.index(10), 5)
+        self.assertEqual(proxy.index(9000), 4500)
+        self.assertEqual(proxy.index(3), -1)
+        self.assertTrue(6000 in proxy)
+
+        proxy.insert(2, 3)
+        self.assertEqual(proxy.index(3), 2)
+        self.assertEqual(proxy.index(10), 6)
+        self.assertEqual(proxy.index(2), 1)
+        proxy.delete(0)
+        self.assertEqual(proxy.index(10), 5)
+        self.assertEqual(proxy._total_rows, 5000)
+        proxy.replace(proxy.index(10), 11)
+        self.assertEqual(proxy.index(11), 5)
+        self.assertFalse(10 in proxy)
+
+        for number in range(pncursortablemodel.PK_INDEX_MAX_SHIFTS * 2):
+            proxy.insert(0, -1 - number)
+        self.assertEqual(proxy.index(11), 5 + pncursortablemodel.PK_INDEX_MAX_SHIFTS * 2)
+        self.assertEqual(proxy[proxy.index(9998)], 9998)
+        self.assertLessEqual(len(proxy._shifts), pncursortablemodel.PK_INDEX_MAX_SHIFTS)
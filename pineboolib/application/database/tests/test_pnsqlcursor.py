@@ -92,6 +92,93 @@ class TestInsertData(unittest.TestCase):
         self.assertTrue(cursor.metadata() is not None)
         self.assertEqual(cursor.metadata().name(), "fltest")
 
+    def test_bulk_insert(self) -> None:
+        """Test bulk insert mode."""
+        from pineboolib.qsa import qsa
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.select()
+        size = cursor.size()
+        with self.assertRaises(Exception):  # afterCommit_fltest no se ejecuta en modo masivo.
+            cursor.beginBulkInsert(3)
+
+        cursor.setActivatedCommitActions(False)
+        cursor.beginBulkInsert(3)
+        for number in range(7):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", "Bulk %s" % number)
+            cursor.setValueBuffer("date_field", "2020-01-0%s" % (number + 1))
+            self.assertTrue(cursor.commitBuffer())
+
+        self.assertEqual(qsa.FLUtil.sqlSelect("fltest", "COUNT(id)", "1 = 1"), size + 6)
+        self.assertEqual(cursor.size(), size)
+        self.assertTrue(cursor.endBulkInsert())
+        self.assertEqual(cursor.size(), size + 7)
+        self.assertEqual(
+            str(qsa.FLUtil.sqlSelect("fltest", "date_field", "string_field = 'Bulk 6'"))[:10],
+            "2020-01-07",
+        )
+        cursor.setActivatedCommitActions(True)
+
+        cursor_areas = pnsqlcursor.PNSqlCursor("flareas")
+        cursor_areas.beginBulkInsert()
+        for area in ["B", "U", "B", ""]:
+            cursor_areas.setModeAccess(cursor_areas.Insert)
+            cursor_areas.refreshBuffer()
+            cursor_areas.setValueBuffer("bloqueo", True)
+            cursor_areas.setValueBuffer("idarea", area)
+            cursor_areas.setValueBuffer("descripcion", "Área %s" % area)
+            self.assertTrue(cursor_areas.commitBuffer())
+        self.assertFalse(cursor_areas.endBulkInsert())
+        self.assertEqual([number for number, msg in cursor_areas.bulkRejected()], [3, 4])
+        self.assertEqual(qsa.FLUtil.sqlSelect("flareas", "COUNT(idarea)", "idarea = 'B'"), 1)
+        self.assertEqual(qsa.FLUtil.sqlSelect("flareas", "descripcion", "idarea = 'U'"), "Área U")
+
+        cursor_areas.setActivatedCheckIntegrity(False)
+        cursor_areas.beginBulkInsert()
+        for area in ["C", "C", "D"]:
+            cursor_areas.setModeAccess(cursor_areas.Insert)
+            cursor_areas.refreshBuffer()
+            cursor_areas.setValueBuffer("bloqueo", True)
+            cursor_areas.setValueBuffer("idarea", area)
+            cursor_areas.setValueBuffer("descripcion", "Área %s" % area)
+            self.assertTrue(cursor_areas.commitBuffer())
+        self.assertFalse(cursor_areas.endBulkInsert())  # Falla el INSERT y se inserta uno a uno.
+        self.assertEqual([number for number, msg in cursor_areas.bulkRejected()], [2])
+        self.assertEqual(
+            qsa.FLUtil.sqlSelect("flareas", "COUNT(idarea)", "idarea IN ('C', 'D')"), 2
+        )
+        cursor_areas.setActivatedCheckIntegrity(True)
+
+        class FakeIface:
+            def beforeCommit_flareas(self, cursor_: "pnsqlcursor.PNSqlCursor") -> bool:
+                return cursor_.valueBuffer("idarea") != "R"
+
+        cursor_areas.beginBulkInsert()
+        cursor_areas.private_cursor._bulk_ifaces = (None, FakeIface())
+        for area in ["E", "R", "F"]:
+            cursor_areas.setModeAccess(cursor_areas.Insert)
+            cursor_areas.refreshBuffer()
+            cursor_areas.setValueBuffer("bloqueo", True)
+            cursor_areas.setValueBuffer("idarea", area)
+            cursor_areas.setValueBuffer("descripcion", "Área %s" % area)
+            self.assertEqual(cursor_areas.commitBuffer(), area != "R")
+        self.assertTrue(cursor_areas.endBulkInsert())
+        self.assertEqual(cursor_areas.bulkRejected(), [(2, "beforeCommit_flareas devolvió False")])
+        self.assertEqual(
+            qsa.FLUtil.sqlSelect("flareas", "COUNT(idarea)", "idarea IN ('E', 'F', 'R')"), 2
+        )
+        qsa.FLUtil.sqlDelete("flareas", "idarea IN ('B', 'C', 'D', 'E', 'F', 'U')")
+
+        model_class = cursor_areas._cursor_model
+        model_class.after_new = lambda self: True
+        try:
+            with self.assertRaises(Exception):  # Los hooks del modelo no se ejecutan.
+                cursor_areas.beginBulkInsert()
+        finally:
+            del model_class.after_new
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -892,6 +979,96 @@ class TestRelations(unittest.TestCase):
         cursor.setValueBuffer("version", "0.0")
         self.assertFalse(cursor.commitBuffer())
 
+    def test_check_integrity(self) -> None:
+        """Test integrity checks of one and several records."""
+        from pineboolib.application.database import pnsqlcursor
+
+        cur_areas = pnsqlcursor.PNSqlCursor("flareas")
+        cur_areas.setModeAccess(cur_areas.Insert)
+        cur_areas.refreshBuffer()
+        cur_areas.setValueBuffer("idarea", "Z")
+        cur_areas.setValueBuffer("descripcion", "Área de prueba Z")
+        self.assertTrue(cur_areas.commitBuffer())
+
+        cur_modulos = pnsqlcursor.PNSqlCursor("flmodules")
+        cur_modulos.setModeAccess(cur_modulos.Insert)
+        cur_modulos.refreshBuffer()
+        cur_modulos.setValueBuffer("bloqueo", True)
+        cur_modulos.setValueBuffer("idmodulo", "IZ")
+        cur_modulos.setValueBuffer("descripcion", "Desc")
+        cur_modulos.setValueBuffer("version", "0.0")
+        cur_modulos.setValueBuffer("idarea", "Z")
+        self.assertEqual(cur_modulos.msgCheckIntegrity(), "")
+        self.assertTrue(cur_modulos.commitBuffer())
+
+        cur_areas.select("idarea = 'Z'")
+        self.assertTrue(cur_areas.first())
+        cur_areas.setModeAccess(cur_areas.Del)
+        cur_areas.refreshBuffer()
+        self.assertEqual(
+            cur_areas.msgCheckIntegrity(),
+            "\nflareas:Área : Con el valor Z hay registros en la tabla flmodules",
+        )
+
+        record = {
+            "bloqueo": True,
+            "idmodulo": "IZ3",
+            "idarea": "z",
+            "descripcion": "Desc",
+            "version": "0.0",
+        }
+        self.assertEqual(cur_modulos.msgCheckIntegrityBulk([record]), "")
+        message = cur_modulos.msgCheckIntegrityBulk(
+            [
+                record,
+                dict(record, idarea="NOEXISTE"),
+                dict(record, idmodulo="IZ", descripcion=None),
+            ]
+        )
+        self.assertEqual(
+            message.split("\n")[1:],
+            [
+                "flmodules:Id. del Módulo : Es clave primaria y requiere valores únicos, "
+                + "y ya hay otro registro con el valor IZ3 en este campo",
+                "flmodules:Id. del Módulo : Es clave primaria y requiere valores únicos, "
+                + "y ya hay otro registro con el valor IZ en este campo",
+                "flmodules:Id. del Área : El valor NOEXISTE no existe en la tabla flareas",
+                "flmodules:Descripción : No puede ser nulo",
+            ],
+        )
+
+        field = cur_modulos.metadata().field("descripcion")
+        field.private._is_unique = True
+        try:
+            message = cur_modulos.msgCheckIntegrityBulk([dict(record, descripcion="desc")])
+        finally:
+            field.private._is_unique = False
+        self.assertEqual(
+            message,
+            "\nflmodules:Descripción : Requiere valores únicos, "
+            + "y ya hay otro registro con el valor desc en este campo",
+        )
+
+        from pineboolib.application.database import utils
+
+        cur_var = pnsqlcursor.PNSqlCursor("flvar")
+        var = {"idvar": "bulk", "idsesion": "s1", "valor": "1"}
+        self.assertEqual(cur_var.msgCheckIntegrityBulk([var, dict(var, idsesion="s2")]), "")
+        compound_message = (
+            "\nIdentificador de la variable+Identificador de la sesión : Requiere valor único, "
+            + "y ya hay otro registro con el valor %s+s1 en la tabla flvar"
+        )
+        self.assertEqual(
+            cur_var.msgCheckIntegrityBulk([var, dict(var, valor="2")]), compound_message % "bulk"
+        )
+        self.assertTrue(utils.sql_insert("flvar", "idvar,idsesion,valor", "bulk,s1,1"))
+        try:
+            self.assertEqual(
+                cur_var.msgCheckIntegrityBulk([dict(var, idvar="BULK")]), compound_message % "BULK"
+            )
+        finally:
+            utils.sql_delete("flvar", "idvar = 'bulk'")
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -208,6 +208,52 @@ class TestPNSqlQuery1(unittest.TestCase):
         self.assertTrue(qry.seek(size_ - 1, True))  # last
         self.assertEqual(qry.value(0), val_last)
 
+    def test_fetch_size(self) -> None:
+        """Test queries fetched by batches."""
+
+        cursor = pnsqlcursor.PNSqlCursor("flareas")
+        for idarea in ("Q", "R", "S"):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("bloqueo", True)
+            cursor.setValueBuffer("idarea", idarea)
+            cursor.setValueBuffer("descripcion", "Área de prueba %s" % idarea)
+            self.assertTrue(cursor.commitBuffer())
+
+        qry = pnsqlquery.PNSqlQuery("")
+        qry.setTablesList("flareas")
+        qry.setSelect("idarea")
+        qry.setFrom("flareas")
+        qry.setWhere("1=1")
+        qry.setOrderBy("idarea ASC")
+        self.assertTrue(qry.exec_())
+        values = []
+        while qry.next():
+            values.append(qry.value(0))
+        self.assertTrue(len(values) > 2)
+
+        qry.setForwardOnly(True)  # Sin fetchSize se siguen leyendo todas las filas.
+        self.assertTrue(qry.exec_())
+        self.assertEqual(qry.size(), len(values))
+        self.assertEqual(len(qry._datos), len(values))
+
+        qry.setFetchSize(1)
+        self.assertEqual(qry.fetchSize(), 1)
+        self.assertTrue(qry.exec_())
+        self.assertEqual(qry.size(), -1)
+        self.assertTrue(qry.first())
+        self.assertEqual(qry.value(0), values[0])
+        self.assertTrue(qry.next())
+        self.assertEqual(qry.value("idarea"), values[1])
+        self.assertEqual(len(qry._datos), 1)
+        self.assertFalse(qry.prev())
+        self.assertFalse(qry.seek(0))
+        self.assertTrue(qry.last())
+        self.assertEqual(qry.value(0), values[-1])
+        self.assertEqual(qry.at(), len(values) - 1)
+        self.assertEqual(qry.size(), len(values))
+        self.assertFalse(qry.next())
+
     def test_only_inspector(self) -> None:
         """Test only inspector."""
 
@@ -237,6 +283,96 @@ class TestPNSqlQuery1(unittest.TestCase):
         self.assertEqual(qry_2.where(), "astro = 'sol'")
         self.assertEqual(qry_2.from_(), "dias inner join planetas as p on p.id = dias.id")
 
+    def test_resolve_cache(self) -> None:
+        """Test resolve cache of sql inspector."""
+        from pineboolib.application.utils import sql_tools
+        import copy
+
+        key = sql_tools.resolve_cache_key(
+            "select idarea,descripcion from flareas where idarea = 'q' and bloqueo = 1"
+        )
+        self.assertEqual(
+            key, "select idarea,descripcion from flareas where idarea = ? and bloqueo = ?"
+        )
+        qry = pnsqlquery.PNSqlQuery("")
+        self.assertTrue(qry.exec_("SELECT idarea,descripcion FROM flareas WHERE idarea = 'Q'"))
+        self.assertTrue(key.replace(" and bloqueo = ?", "") in sql_tools._RESOLVE_CACHE)
+        qry_2 = pnsqlquery.PNSqlQuery("")
+        self.assertTrue(qry_2.exec_("SELECT idarea,descripcion FROM flareas WHERE idarea = 'R'"))
+        self.assertEqual(qry_2.fieldList(), ["idarea", "descripcion"])
+        self.assertEqual(qry_2.where(), "idarea = 'r'")
+        self.assertEqual(qry_2.sql_inspector.mtd_fields()[1].name(), "descripcion")
+
+        manager = application.PROJECT.conn_manager.manager()
+        mtd = manager.cache_metadata_["flareas.mtd"]
+        manager.cache_metadata_["flareas.mtd"] = copy.copy(mtd)
+        self.assertFalse(qry_2.sql_inspector._load_resolved(key.replace(" and bloqueo = ?", "")))
+        manager.cache_metadata_["flareas.mtd"] = mtd
+
+    def test_rows(self) -> None:
+        """Test bulk converted values."""
+
+        qry = pnsqlquery.PNSqlQuery("")
+        qry.setTablesList("flareas")
+        qry.setSelect("idarea,bloqueo,descripcion")
+        qry.setFrom("flareas")
+        qry.setWhere("1=1")
+        qry.setOrderBy("idarea ASC")
+        self.assertTrue(qry.exec_())
+        rows = qry.rows()
+        self.assertEqual(len(rows), qry.size())
+        self.assertTrue(qry.first())
+        self.assertEqual(rows[0], [qry.value(0), qry.value(1), qry.value(2)])
+        self.assertTrue(isinstance(rows[0][1], bool))
+        self.assertEqual(qry.column("idarea"), [row[0] for row in rows])
+        self.assertEqual(qry.column(1), [row[1] for row in rows])
+        self.assertEqual(qry.sql_inspector.converter(1).type_, "unlock")
+        self.assertEqual(qry.sql_inspector.resolve_empty_value(1), False)
+
+    def test_sql_params(self) -> None:
+        """Test queries with bound parameters."""
+        from pineboolib.application.database import utils
+
+        cursor = pnsqlcursor.PNSqlCursor("flareas")
+        cursor.setModeAccess(cursor.Insert)
+        cursor.refreshBuffer()
+        cursor.setValueBuffer("idarea", "B")
+        cursor.setValueBuffer("descripcion", "O'Reilly 100%")
+        self.assertTrue(cursor.commitBuffer())
+
+        qry = pnsqlquery.PNSqlQuery("")
+        qry.setSelect("descripcion")
+        qry.setFrom("flareas")
+        qry.setWhere("descripcion = :descripcion")
+        self.assertTrue(qry.exec_("", {"descripcion": "O'Reilly 100%"}))
+        self.assertTrue(qry.first())
+        self.assertEqual(qry.value(0), "O'Reilly 100%")
+        self.assertEqual(qry.size(), 1)
+
+        self.assertEqual(
+            utils.sql_select(
+                "flareas",
+                "idarea",
+                "descripcion = :desc",
+                None,
+                0,
+                "default",
+                {"desc": "O'Reilly 100%"},
+            ),
+            "B",
+        )
+        self.assertEqual(
+            utils.quick_sql_select("flareas", "idarea", "idarea = :id", "default", {"id": "B"}), "B"
+        )
+
+        qry_2 = pnsqlquery.PNSqlQuery("fltest2")
+        qry_2.setValueParam("from", 0)
+        qry_2.setValueParam("to", 2)
+        params: dict = {}
+        self.assertTrue(qry_2._build_sql(params).find("id>=:from AND id<=:to") > -1)
+        self.assertEqual(params, {"from": 0, "to": 2})
+        self.assertTrue(qry_2.sql().find("id>='0' AND id<='2'") > -1)
+
     def test_date_result(self) -> None:
         """Test date values."""
         cursor = pnsqlcursor.PNSqlCursor("fltest")
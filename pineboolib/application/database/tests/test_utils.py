@@ -88,3 +88,49 @@ class TestUtils(unittest.TestCase):
         )
         self.assertTrue(utils.quick_sql_delete("fltest3", "counter ='%s'" % val_1, "default"))
         self.assertTrue(utils.sql_delete("fltest3", "1=1", "dbAux"))
+
+    def test_next_counter_blocks(self) -> None:
+        """Test counters reserved by blocks."""
+
+        utils.sql_delete("fltest3", "1=1")
+        utils.sql_insert("fltest3", "counter,string_field", "000007,Campo de prueba 7")
+        # Sin bloques guardados, se sincroniza con los valores de la tabla.
+        utils.sql_delete("flcounters", "tabla = 'fltest3'")
+        utils.clear_counter_blocks()
+        cur_1 = pnsqlcursor.PNSqlCursor("fltest3")
+        block_size = utils.COUNTER_BLOCK_SIZE
+
+        self.assertEqual(utils.next_counter("counter", cur_1), "000008")
+        self.assertFalse(cur_1.db().connManager().dbAux().lastError())
+        self.assertEqual(utils.next_counter("counter", cur_1), "000008")
+        self.assertEqual(
+            utils.quick_sql_select(
+                "flcounters", "valor", "id = :id", "default", {"id": "fltest3@counter@"}
+            ),
+            7 + block_size,
+        )
+
+        utils.sql_insert("fltest3", "counter,string_field", "000008,Campo de prueba 8")
+        self.assertEqual(utils.next_counter("counter", cur_1), "000009")
+
+        # Otro proceso no comparte el bloque reservado.
+        utils.clear_counter_blocks()
+        self.assertEqual(utils.next_counter("counter", cur_1), str(8 + block_size).rjust(6, "0"))
+        self.assertEqual(
+            utils.quick_sql_select(
+                "flcounters", "valor", "id = :id", "default", {"id": "fltest3@counter@"}
+            ),
+            7 + block_size * 2,
+        )
+
+        # Sin UPDATE ... RETURNING, la lectura va en la misma transacción.
+        driver = cur_1.db().connManager().dbAux().driver()
+        returning = driver._serial_returning
+        driver._serial_returning = False
+        try:
+            self.assertEqual(driver.increase_counter("fltest3@counter@", 1), 8 + block_size * 2)
+        finally:
+            driver._serial_returning = returning
+        self.assertEqual(driver.increase_counter("fltest3@counter@", 1), 9 + block_size * 2)
+        self.assertEqual(driver.increase_counter("fltest3@missing@", 1), None)
+        self.assertTrue(utils.sql_delete("fltest3", "1=1"))
@@ -9,7 +9,9 @@ from pineboolib.application.database.orm import dummy_cursor
 from . import pnsqlcursor, pnsqlquery
 
 
-from typing import Any, Union, List, Optional, TYPE_CHECKING
+from typing import Any, Union, List, Optional, Dict, Tuple, TYPE_CHECKING
+
+import threading
 
 
 if TYPE_CHECKING:
@@ -19,6 +21,11 @@ if TYPE_CHECKING:
 
 LOGGER = logging.get_logger(__name__)
 
+COUNTER_BLOCK_SIZE = 20  # Números de contador reservados por bloque en flcounters.
+
+_COUNTER_BLOCKS: Dict[Tuple[str, str, str, str], List[int]] = {}
+_COUNTER_LOCK = threading.Lock()
+
 
 def next_counter(
     name_or_series: str,
@@ -94,34 +101,10 @@ def _next_counter2(
         return None
 
     _len = int(field.length())
-    _cadena = None
-
-    qry = pnsqlquery.PNSqlQuery(None, cursor_.db())
-    qry.setForwardOnly(True)
-    qry.setTablesList(tmd.name())
-    qry.setSelect(name_)
-    qry.setFrom(tmd.name())
-
-    qry.setWhere(cursor_.db().sqlLength(name_, _len))
-    qry.setOrderBy(name_ + " DESC")
-
-    if not qry.exec_():
+    _numero = _counter_value(cursor_, name_, "", _len, cursor_.db().sqlLength(name_, _len), type_)
+    if _numero is None:
         return None
 
-    _max_range: int = 10 ** _len
-    _numero: int = _max_range
-
-    while _numero >= _max_range:
-        if not qry.next():
-            _numero = 1
-            break
-
-        try:
-            _numero = int(qry.value(0))
-            _numero = _numero + 1
-        except Exception:
-            pass
-
     if type_ == "string":
         _cadena = str(_numero)
 
@@ -158,18 +141,147 @@ def _next_counter3(serie_: str, name_: str, cursor_: "isqlcursor.ISqlCursor") ->
         cursor_.db().connManager().manager().formatAssignValueLike(name_, "string", serie_, True),
     )
 
-    qry = pnsqlquery.PNSqlQuery(None, cursor_.db().connectionName())
+    _numero = _counter_value(cursor_, name_, serie_, _len, _where)
+    if _numero is None:
+        return None
+
+    _cadena: str = str(_numero)
+    if len(_cadena) < _len:
+        _cadena = _cadena.rjust(_len, "0")
+
+    return _cadena
+
+
+def _counter_value(
+    cursor_: Union["isqlcursor.ISqlCursor", "dummy_cursor.DummyCursor"],
+    name_: str,
+    serie_: str,
+    len_: int,
+    where_: str,
+    type_: str = "string",
+) -> Optional[int]:
+    """
+    Return the next free number of a counter, from the block reserved for it.
+
+    The number is not consumed until a record uses it, so following calls return it again.
+    """
+
+    key = (cursor_.db().DBName(), cursor_.metadata().name(), name_, serie_)
+    with _COUNTER_LOCK:
+        while True:
+            block = _COUNTER_BLOCKS.get(key)
+            if block is None or block[0] > block[1]:
+                block = _reserve_counter_block(cursor_, name_, serie_, len_, where_)
+                if block is None:  # Sin almacén de bloques, se calcula desde la tabla.
+                    return _scan_counter(cursor_, name_, serie_, len_, where_)
+
+                _COUNTER_BLOCKS[key] = block
+
+            _numero = block[0]
+            if _numero >= 10 ** len_:
+                LOGGER.warning(
+                    "next_counter: %s.%s (%s) ha superado su longitud", key[1], name_, serie_
+                )
+                return None
+
+            value = serie_ + str(_numero).rjust(len_, "0") if type_ == "string" else _numero
+            if not _counter_used(cursor_, name_, value):
+                return _numero
+
+            block[0] += 1
+
+
+def _counter_used(
+    cursor_: Union["isqlcursor.ISqlCursor", "dummy_cursor.DummyCursor"], name_: str, value: Any
+) -> bool:
+    """Return if a counter value is already stored in the table."""
+
+    qry = pnsqlquery.PNSqlQuery(None, cursor_.db())
+    qry.setTablesList(cursor_.metadata().name())
+    qry.setSelect(name_)
+    qry.setFrom(cursor_.metadata().name())
+    qry.setWhere("%s = :counter_value" % name_)
+
+    return qry.exec_("", {"counter_value": value}) and qry.first()
+
+
+def _reserve_counter_block(
+    cursor_: Union["isqlcursor.ISqlCursor", "dummy_cursor.DummyCursor"],
+    name_: str,
+    serie_: str,
+    len_: int,
+    where_: str,
+) -> Optional[List[int]]:
+    """
+    Reserve a new block of counter numbers in flcounters.
+
+    If the block store is missing, it is resynchronized with the values of the table.
+    @return [first, last] numbers of the block or None if flcounters is not available.
+    """
+
+    conn_aux = cursor_.db().connManager().dbAux()
+    table_name = cursor_.metadata().name()
+    params: Dict[str, Any] = {
+        "id": "%s@%s@%s" % (table_name, name_, serie_),
+        "size": COUNTER_BLOCK_SIZE,
+    }
+
+    for _ in range(2):
+        valor = conn_aux.driver().increase_counter(params["id"], COUNTER_BLOCK_SIZE)
+        if valor is not None:
+            return [valor - COUNTER_BLOCK_SIZE + 1, valor]
+
+        if conn_aux.lastError():
+            return None
+
+        _numero = _scan_counter(cursor_, name_, serie_, len_, where_)
+        if _numero is None:
+            return None
+
+        params.update(
+            {
+                "tabla": table_name,
+                "campo": name_,
+                "serie": serie_,
+                "valor": _numero + COUNTER_BLOCK_SIZE - 1,
+            }
+        )
+        conn_aux.execute_query(
+            "INSERT INTO flcounters (id,tabla,campo,serie,valor)"
+            + " VALUES (:id,:tabla,:campo,:serie,:valor)",
+            params=params,
+        )
+        if not conn_aux.lastError():
+            return [_numero, params["valor"]]
+
+        # Otra sesión ha creado el bloque a la vez. Se vuelve a intentar la reserva.
+
+    return None
+
+
+def _scan_counter(
+    cursor_: Union["isqlcursor.ISqlCursor", "dummy_cursor.DummyCursor"],
+    name_: str,
+    serie_: str,
+    len_: int,
+    where_: str,
+) -> Optional[int]:
+    """Return the next number of a counter from the values stored in the table."""
+
+    tmd = cursor_.metadata()
+
+    qry = pnsqlquery.PNSqlQuery(None, cursor_.db())
     qry.setForwardOnly(True)
     qry.setTablesList(tmd.name())
     qry.setSelect(name_)
     qry.setFrom(tmd.name())
-    qry.setWhere(_where)
+    qry.setWhere(where_)
     qry.setOrderBy(name_ + " DESC")
 
     if not qry.exec_():
         return None
 
-    _max_range: int = 10 ** _len
+    _max_range: int = 10 ** len_
     _numero: int = _max_range
 
     while _numero >= _max_range:
@@ -177,17 +289,21 @@ def _next_counter3(serie_: str, name_: str, cursor_: "isqlcursor.ISqlCursor") ->
             _numero = 1
             break
 
-        _numero = int(qry.value(0)[len(serie_) :])
-        _numero = _numero + 1
+        try:
+            _value = qry.value(0)
+            _numero = int(_value[len(serie_) :] if serie_ else _value)
+            _numero = _numero + 1
+        except Exception:
+            pass
 
-    if _type in ["string", "double"]:
-        _cadena: str = str(_numero)
-        if len(_cadena) < _len:
-            _cadena = _cadena.rjust(_len, "0")
+    return _numero
 
-        return _cadena
 
-    return None
+def clear_counter_blocks() -> None:
+    """Forget the counter blocks reserved by this process."""
+
+    with _COUNTER_LOCK:
+        _COUNTER_BLOCKS.clear()
 
 
 def sql_select(
@@ -197,6 +313,7 @@ def sql_select(
     table_list_: Optional[Union[str, List, types.Array]] = None,
     size_: int = 0,
     conn_: Union[str, "iconnection.IConnection"] = "default",
+    params_: Optional[Dict[str, Any]] = None,
 ) -> Any:
     """
     Execute a query of type select, returning the results of the first record found.
@@ -207,6 +324,7 @@ def sql_select(
     @param table_list_: Tableslist statement of the query. Required when more than one table is included in the from statement.
     @param size_: Number of lines found. (-1 if there is error).
     @param conn_name_ Connection name.
+    @param params_: Bound parameters values, written as :name in the where statement.
     @return Value resulting from the query or false if it finds nothing.
     """
 
@@ -224,7 +342,7 @@ def sql_select(
     _qry.setFrom(from_)
     _qry.setWhere(where_)
     # q.setForwardOnly(True)
-    if not _qry.exec_():
+    if not _qry.exec_("", params_):
         return False
 
     if _qry.first():
@@ -239,6 +357,7 @@ def quick_sql_select(
     select_: str,
     where_: Optional[str] = None,
     conn_: Union[str, "iconnection.IConnection"] = "default",
+    params_: Optional[Dict[str, Any]] = None,
 ) -> Any:
     """
     Quick version of sqlSelect. Run the query directly without checking.Use with caution.
@@ -248,7 +367,7 @@ def quick_sql_select(
         where_ = "1 = 1"
 
     _qry = pnsqlquery.PNSqlQuery(None, conn_)
-    if not _qry.exec_("SELECT %s FROM %s WHERE %s " % (select_, from_, where_)):
+    if not _qry.exec_("SELECT %s FROM %s WHERE %s " % (select_, from_, where_), params_):
         return False
 
     return _qry.value(0) if _qry.first() else False
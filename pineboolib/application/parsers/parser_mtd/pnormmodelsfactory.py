@@ -89,6 +89,11 @@ def save_model(path_, name: str) -> bool:
             "load",
             model_class._constructor_init,  # type: ignore [attr-defined] # noqa: F821
         )
+        sqlalchemy.event.listen(
+            model_class,
+            "refresh",
+            model_class._refresh_copy,  # type: ignore [attr-defined] # noqa: F821
+        )
 
         for field in model_class.legacy_metadata[  # type: ignore [attr-defined] # noqa: F821
             "fields"
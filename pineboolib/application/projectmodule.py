@@ -638,6 +638,8 @@ class Project(object):
             "flupdates",
             "flmetadata",
             "flseqs",
+            "flcounters",
+            "flfingerprints",
             "flsettings",
         ):
 
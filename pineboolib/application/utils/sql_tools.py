@@ -6,13 +6,22 @@ Collect information from the query, such as field tables, lines, etc ...
 from pineboolib import application, logging
 from pineboolib.application import types
 
+import collections
 import datetime
-from typing import Dict, Any, List, TYPE_CHECKING
+import re
+import threading
+from typing import Dict, Any, List, Optional, Callable, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.interfaces import ifieldmetadata  # noqa: F401 # pragma: no cover
 
 LOGGER = logging.get_logger(__name__)
+LARGE_VALUE_CACHE_SIZE = 64
+RESOLVE_CACHE_SIZE = 256
+LITERAL_REGEX = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+_RESOLVE_CACHE: "collections.OrderedDict[str, Tuple[Any, ...]]" = collections.OrderedDict()
+_RESOLVE_CACHE_LOCK = threading.Lock()
 
 
 class SqlInspector(object):
@@ -27,6 +36,7 @@ class SqlInspector(object):
     _alias: Dict[str, str]
     _posible_float: bool
     _list_sql: List[str]
+    _converters: Dict[int, "ColumnConverter"]
 
     def __init__(self) -> None:
         """
@@ -38,6 +48,7 @@ class SqlInspector(object):
         self._table_names = []
         self._mtd_fields = {}
         self._invalid_tables = []
+        self._converters = {}
         # self.set_sql(sql_text)
         # self.resolve()
 
@@ -53,10 +64,64 @@ class SqlInspector(object):
         self._alias = {}
         self._list_sql = []
         self._posible_float = False
+        self._converters = {}
         if self._sql.startswith("show"):
             return
 
-        self._resolve_fields()
+        key = resolve_cache_key(self._sql)
+        if not self._load_resolved(key):
+            self._resolve_fields()
+            self._store_resolved(key)
+
+        for pos in self._field_list.values():
+            self.converter(pos)
+
+    def _load_resolved(self, key: str) -> bool:
+        """Load fields and tables from the resolve cache. Return False if not found or expired."""
+
+        with _RESOLVE_CACHE_LOCK:
+            entry = _RESOLVE_CACHE.get(key)
+            if entry is None:
+                return False
+            _RESOLVE_CACHE.move_to_end(key)
+
+        field_list, table_names, alias, mtd_fields, metadata_list = entry
+        cache_metadata = application.PROJECT.conn_manager.manager().cache_metadata_
+        for table_name, table_metadata in metadata_list:
+            if cache_metadata.get(table_name) is not table_metadata:  # Los metadatos han cambiado.
+                return False
+
+        self._sql = self._sql.replace(" cast(", " cast (")
+        self._list_sql = self._sql.split(" ")
+        self._field_list = dict(field_list)
+        self._table_names = list(table_names)
+        self._alias = dict(alias)
+        self._mtd_fields = dict(mtd_fields)
+        return True
+
+    def _store_resolved(self, key: str) -> None:
+        """Store fields and tables of a resolved select in the resolve cache."""
+
+        if self._invalid_tables or not self._table_names or self._list_sql[0] != "select":
+            return
+
+        cache_metadata = application.PROJECT.conn_manager.manager().cache_metadata_
+        metadata_list = [
+            ("%s.mtd" % name, cache_metadata.get("%s.mtd" % name)) for name in self._table_names
+        ]
+        if None in [table_metadata for table_name, table_metadata in metadata_list]:
+            return  # Sin metadatos en caché no se puede saber cuándo caducan.
+
+        with _RESOLVE_CACHE_LOCK:
+            _RESOLVE_CACHE[key] = (
+                dict(self._field_list),
+                list(self._table_names),
+                dict(self._alias),
+                dict(self._mtd_fields),
+                metadata_list,
+            )
+            while len(_RESOLVE_CACHE) > RESOLVE_CACHE_SIZE:
+                _RESOLVE_CACHE.popitem(last=False)
 
     def mtd_fields(self) -> Dict[int, "ifieldmetadata.IFieldMetaData"]:
         """
@@ -435,143 +500,49 @@ class SqlInspector(object):
 
             self._create_mtd_fields(fl_finish, tablas)
 
-    def resolve_empty_value(self, pos: int) -> Any:
-        """
-        Return a data type according to field type and value None.
-
-        @param pos. index postion.
-        """
-
-        if not self.mtd_fields():
-            if self._sql.find("sum(") > -1:
-                return 0
-            return None
-
-        type_ = "double"
-        if pos not in self._mtd_fields.keys():
-            if pos not in self._field_list.values():
-                LOGGER.warning(
-                    "SQL_TOOLS : resolve_empty_value : No se encuentra la posición %s", pos
-                )
-                return None
-        else:
-            mtd = self._mtd_fields[pos]
-            if mtd is not None:
-                type_ = mtd.type()
-
-        ret_: Any = None
-        if type_ in ("double", "int", "uint", "serial"):
-            ret_ = 0
-        elif type_ in ("string", "stringlist", "pixmap", "date", "timestamp"):
-            ret_ = ""
-        elif type_ in ("unlock", "bool"):
-            ret_ = False
-        elif type_ == "time":
-            ret_ = "00:00:00"
-        elif type_ == "bytearray":
-            ret_ = bytearray()
-
-        return ret_
-
-    def resolve_value(self, pos: int, value: Any, raw: bool = False) -> Any:
+    def converter(self, pos: int) -> "ColumnConverter":
         """
-        Return a data type according to field type.
+        Return the value converter of a field position, compiled once per resolve.
 
         @param pos. index postion.
         """
 
-        if not self.mtd_fields():
-            if isinstance(value, datetime.time):
-                value = str(value)[0:8]
-            elif isinstance(value, datetime.timedelta):
-                days, seconds = value.days, value.seconds
-                hours = days * 24 + seconds // 3600
-                minutes = (seconds % 3600) // 60
-                seconds = seconds % 60
-                value = "%s:%s:%s" % (
-                    hours,
-                    minutes if len(str(minutes)) > 1 else "0%s" % minutes,
-                    seconds if len(str(seconds)) > 1 else "0%s" % seconds,
-                )
-
-                value = str(value)
-                if value.find(".") > -1:
-                    value = value[0 : value.find(".")]
-                elif value.find("+") > -1:
-                    value = value[0 : value.find("+")]
-
-            return value
-        else:
-            type_ = "double"
+        converter = self._converters.get(pos)
+        if converter is None:
             field_metadata = None
-            if pos not in self._mtd_fields.keys():
-                if pos not in self._field_list.values():
-                    LOGGER.warning(
-                        "SQL_TOOLS : resolve_value : No se encuentra la posición %s", pos
-                    )
-                    return None
-            else:
+            type_: Optional[str] = "double"
+            if not self._mtd_fields:
+                type_ = None
+            elif pos in self._mtd_fields.keys():
                 field_metadata = self._mtd_fields[pos]
                 if field_metadata is not None:
                     type_ = field_metadata.type()
+            elif pos not in self._field_list.values():
+                LOGGER.warning("SQL_TOOLS : converter : No se encuentra la posición %s", pos)
+                type_ = "unknown"
 
-        ret_: Any = value
-        if type_ in ("string", "stringlist", "timestamp"):
-            pass
-        elif type_ == "double":
-            try:
-                ret_ = float(ret_)
-            except ValueError as error:
-                LOGGER.warning(str(error))
-
-        elif type_ in ("int", "uint", "serial"):
-            ret_ = int(ret_)
-        elif type_ == "pixmap":
+            converter = ColumnConverter(pos, type_, field_metadata, self._sql.find("sum(") > -1)
+            self._converters[pos] = converter
 
-            if application.PROJECT.conn_manager is None:
-                raise Exception("Project is not connected yet")
+        return converter
 
-            if field_metadata is None:
-                raise Exception("Field metadata not found")
+    def resolve_empty_value(self, pos: int) -> Any:
+        """
+        Return a data type according to field type and value None.
 
-            table_metadata = field_metadata.metadata()
-            if table_metadata is None:
-                raise Exception("Metadata not found")
-            if raw or not application.PROJECT.conn_manager.manager().isSystemTable(
-                table_metadata.name()
-            ):
-                ret_ = application.PROJECT.conn_manager.manager().fetchLargeValue(ret_)
-        elif type_ == "date":
-
-            ret_ = types.Date(str(ret_))
-        elif type_ == "time":
+        @param pos. index postion.
+        """
 
-            if isinstance(ret_, datetime.timedelta):
-                days, seconds = ret_.days, ret_.seconds
-                hours = days * 24 + seconds // 3600
-                minutes = (seconds % 3600) // 60
-                seconds = seconds % 60
-                ret_ = "%s:%s:%s" % (
-                    hours,
-                    minutes if len(str(minutes)) > 1 else "0%s" % minutes,
-                    seconds if len(str(seconds)) > 1 else "0%s" % seconds,
-                )
+        return self.converter(pos).empty()
 
-            ret_ = str(ret_)
-            if ret_.find(".") > -1:
-                ret_ = ret_[0 : ret_.find(".")]
-            elif ret_.find("+") > -1:
-                ret_ = ret_[0 : ret_.find("+")]
+    def resolve_value(self, pos: int, value: Any, raw: bool = False) -> Any:
+        """
+        Return a data type according to field type.
 
-        elif type_ in ("unlock", "bool"):
-            ret_ = types.boolean(ret_)
-        elif type_ == "bytearray":
-            ret_ = bytearray(ret_)
-        else:
-            ret_ = float(ret_)
-            print("TIPO DESCONOCIDO", type_, ret_)
+        @param pos. index postion.
+        """
 
-        return ret_
+        return self.converter(pos).convert(value, raw)
 
     def _create_mtd_fields(self, fields_list: list, tables_list: list) -> None:
         """
@@ -614,3 +585,182 @@ class SqlInspector(object):
                     if table_name not in self._invalid_tables:
                         self._invalid_tables.append(table_name)
                     # tables_list.remove(table_name)
+
+
+def resolve_cache_key(sql: str) -> str:
+    """Return the resolve cache key of a sql. Literals after the first WHERE are masked."""
+
+    pos_where = sql.find(" where ", sql.find(" from "))
+    if pos_where == -1 or sql.find(" from ") == -1:
+        return sql
+
+    return sql[:pos_where] + LITERAL_REGEX.sub("?", sql[pos_where:])
+
+
+def clear_resolve_cache() -> None:
+    """Clear the resolve cache."""
+
+    with _RESOLVE_CACHE_LOCK:
+        _RESOLVE_CACHE.clear()
+
+
+class ColumnConverter(object):
+    """
+    ColumnConverter class.
+
+    Converts the values of a query column according to its field type.
+    """
+
+    pos: int
+    type_: Optional[str]
+    convert: Callable[[Any, bool], Any]
+
+    def __init__(
+        self,
+        pos: int,
+        type_: Optional[str],
+        field_metadata: Optional["ifieldmetadata.IFieldMetaData"] = None,
+        is_sum: bool = False,
+    ) -> None:
+        """
+        Initialize.
+
+        @param pos. index position.
+        @param type_. field type. None if the query has not field metadata.
+        @param field_metadata. field metadata.
+        @param is_sum. True if the query has a sum( and no field metadata.
+        """
+
+        self.pos = pos
+        self.type_ = type_
+        self._field_metadata = field_metadata
+        self._large_values: Dict[Any, Any] = {}
+        self._is_system_table = False
+
+        if type_ is None:
+            self._empty_value: Any = 0 if is_sum else None
+        elif type_ in ("double", "int", "uint", "serial"):
+            self._empty_value = 0
+        elif type_ in ("string", "stringlist", "pixmap", "date", "timestamp"):
+            self._empty_value = ""
+        elif type_ in ("unlock", "bool"):
+            self._empty_value = False
+        elif type_ == "time":
+            self._empty_value = "00:00:00"
+        else:
+            self._empty_value = None
+
+        if type_ is None:
+            self.convert = self._convert_plain
+        elif type_ == "pixmap" and field_metadata is not None:
+            table_metadata = field_metadata.metadata()
+            if table_metadata is not None and application.PROJECT.conn_manager is not None:
+                self._is_system_table = application.PROJECT.conn_manager.manager().isSystemTable(
+                    table_metadata.name()
+                )
+            self.convert = self._convert_pixmap
+        else:
+            self.convert = getattr(self, "_convert_%s" % type_, self._convert_other)
+
+    def __call__(self, value: Any, raw: bool = False) -> Any:
+        """Return the converted value, or the empty value of the type if value is None."""
+
+        if value in (None, "None"):
+            return self.empty()
+
+        try:
+            return self.convert(value, raw)
+        except Exception:
+            LOGGER.exception("value::error retrieving row position %s", self.pos)
+
+        return value
+
+    def empty(self) -> Any:
+        """Return the value of an empty field."""
+
+        return bytearray() if self.type_ == "bytearray" else self._empty_value
+
+    def _convert_plain(self, value: Any, raw: bool) -> Any:
+        if isinstance(value, datetime.time):
+            value = str(value)[0:8]
+        elif isinstance(value, datetime.timedelta):
+            value = self._convert_time(value, raw)
+
+        return value
+
+    def _convert_unknown(self, value: Any, raw: bool) -> Any:
+        return None
+
+    def _convert_string(self, value: Any, raw: bool) -> Any:
+        return value
+
+    _convert_stringlist = _convert_timestamp = _convert_string
+
+    def _convert_double(self, value: Any, raw: bool) -> Any:
+        try:
+            value = float(value)
+        except ValueError as error:
+            LOGGER.warning(str(error))
+
+        return value
+
+    def _convert_int(self, value: Any, raw: bool) -> Any:
+        return int(value)
+
+    _convert_uint = _convert_serial = _convert_int
+
+    def _convert_pixmap(self, value: Any, raw: bool) -> Any:
+        if application.PROJECT.conn_manager is None:
+            raise Exception("Project is not connected yet")
+
+        if self._field_metadata is None:
+            raise Exception("Field metadata not found")
+
+        if self._field_metadata.metadata() is None:
+            raise Exception("Metadata not found")
+
+        if raw or not self._is_system_table:
+            if value not in self._large_values:  # Las referencias no cambian de contenido.
+                if len(self._large_values) >= LARGE_VALUE_CACHE_SIZE:
+                    self._large_values.clear()
+                manager = application.PROJECT.conn_manager.manager()
+                self._large_values[value] = manager.fetchLargeValue(value)
+            value = self._large_values[value]
+
+        return value
+
+    def _convert_date(self, value: Any, raw: bool) -> Any:
+        return types.Date(str(value))
+
+    def _convert_time(self, value: Any, raw: bool) -> Any:
+        if isinstance(value, datetime.timedelta):
+            days, seconds = value.days, value.seconds
+            hours = days * 24 + seconds // 3600
+            minutes = (seconds % 3600) // 60
+            seconds = seconds % 60
+            value = "%s:%s:%s" % (
+                hours,
+                minutes if len(str(minutes)) > 1 else "0%s" % minutes,
+                seconds if len(str(seconds)) > 1 else "0%s" % seconds,
+            )
+
+        value = str(value)
+        if value.find(".") > -1:
+            value = value[0 : value.find(".")]
+        elif value.find("+") > -1:
+            value = value[0 : value.find("+")]
+
+        return value
+
+    def _convert_bool(self, value: Any, raw: bool) -> Any:
+        return types.boolean(value)
+
+    _convert_unlock = _convert_bool
+
+    def _convert_bytearray(self, value: Any, raw: bool) -> Any:
+        return bytearray(value)
+
+    def _convert_other(self, value: Any, raw: bool) -> Any:
+        value = float(value)
+        print("TIPO DESCONOCIDO", self.type_, value)
+        return value
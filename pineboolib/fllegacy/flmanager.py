@@ -14,7 +14,8 @@ from pineboolib.application.metadata import (
 )
 
 from pineboolib.application.database import pnsqlquery, pngroupbyquery, pnsqlcursor
-from pineboolib.application.utils import xpm, convert_flaction
+from pineboolib.application.database import utils as utils_db
+from pineboolib.application.utils import xpm, convert_flaction, sql_tools
 from pineboolib.application import qsadictmodules
 
 from pineboolib.interfaces import IManager
@@ -63,6 +64,8 @@ class FLManager(QtCore.QObject, IManager):
     ]  # Caché de definiciones de acciones, para optimizar lecturas
     # Caché de metadatos de talblas del sistema para optimizar lecturas
 
+    _fingerprints: Dict[str, str]  # Huellas de flfingerprints por tabla
+    _fingerprints_loaded: bool  # _fingerprints ya contiene las huellas de flfingerprints
     db_: "iconnection.IConnection"  # Base de datos a utilizar por el manejador
     init_count_: int = 0  # Indica el número de veces que se ha llamado a FLManager::init()
 
@@ -75,6 +78,8 @@ class FLManager(QtCore.QObject, IManager):
 
         self.list_tables_ = []
         self.dict_key_metadata_ = {}
+        self._fingerprints = {}
+        self._fingerprints_loaded = False
         self.cache_metadata_ = {}
         self._cache_action = {}
         QtCore.QTimer.singleShot(100, self.init)
@@ -104,9 +109,13 @@ class FLManager(QtCore.QObject, IManager):
         """Apply close process."""
 
         self.dict_key_metadata_ = {}
+        self._fingerprints = {}
+        self._fingerprints_loaded = False
         self.list_tables_ = []
         self.cache_metadata_ = {}
         self._cache_action = {}
+        sql_tools.clear_resolve_cache()
+        utils_db.clear_counter_blocks()
 
     def metadata(
         self,
@@ -206,8 +215,11 @@ class FLManager(QtCore.QObject, IManager):
                 if not quick:
                     self.cache_metadata_[table_name] = copy.copy(ret)
 
-                    if not self.existsTable(metadata_name_or_xml):
-                        self.createTable(ret)
+                    if self.fingerprintMatches(ret):
+                        pass
+                    elif not self.existsTable(metadata_name_or_xml):
+                        if self.createTable(ret):
+                            self.storeFingerprint(ret)
                     else:
                         if self.db_.mismatchedTable(metadata_name_or_xml, ret):
                             if ret.name():
@@ -229,11 +241,15 @@ class FLManager(QtCore.QObject, IManager):
                                         "vista" if ret.isQuery() else "tabla",
                                         metadata_name_or_xml,
                                     )
+                                else:
+                                    self.storeFingerprint(ret)
                             else:
                                 LOGGER.warning(
                                     "El metadata %s informa como una tabla algo que no es.",
                                     metadata_name_or_xml,
                                 )
+                        else:
+                            self.storeFingerprint(ret)
 
                 # throwMsgWarning(self.db_, msg)
 
@@ -506,6 +522,61 @@ class FLManager(QtCore.QObject, IManager):
 
             return ret
 
+    def metadataFingerprint(self, metadata: "pntablemetadata.PNTableMetaData") -> str:
+        """
+        Return the fingerprint of a table definition.
+
+        Combines the sha of the .mtd stored in flfiles with the columns the metadata describes.
+        """
+
+        sha_file = self.db_.connManager().managerModules().shaOfFile("%s.mtd" % metadata.name())
+        driver = self.db_.connManager().dbAux().driver()
+        return utils_base.sha1("%s%s" % (sha_file, driver.recordInfo(metadata)))
+
+    def fingerprintMatches(self, metadata: "pntablemetadata.PNTableMetaData") -> bool:
+        """
+        Return if the table was already checked against this metadata.
+
+        Fingerprints are read once from flfingerprints. The full check is done when they differ or
+        application.FORCE_MISMATCHED_CHECK is enabled.
+        """
+
+        if application.FORCE_MISMATCHED_CHECK or metadata.name() == "flfingerprints":
+            return False
+
+        if not self._fingerprints_loaded:
+            self._fingerprints_loaded = True
+            if self.existsTable("flfingerprints"):
+                conn_dbaux = self.db_.connManager().dbAux()
+                cursor = conn_dbaux.execute_query("SELECT tabla, huella FROM flfingerprints")
+                for table_name, fingerprint in cursor.fetchall() if cursor else []:
+                    self._fingerprints[str(table_name)] = str(fingerprint)
+
+        return self._fingerprints.get(metadata.name()) == self.metadataFingerprint(metadata)
+
+    def storeFingerprint(self, metadata: "pntablemetadata.PNTableMetaData") -> None:
+        """
+        Save in flfingerprints the fingerprint of a table that matches its metadata.
+        """
+
+        table_name = metadata.name()
+        if table_name == "flfingerprints" or not self.existsTable("flfingerprints"):
+            return
+
+        conn_dbaux = self.db_.connManager().dbAux()
+        fingerprint = self.metadataFingerprint(metadata)
+        params = {"tabla": table_name, "huella": fingerprint}
+        cursor = conn_dbaux.execute_query(
+            "UPDATE flfingerprints SET huella = :huella WHERE tabla = :tabla", params=params
+        )
+        if cursor is not None and not cursor.rowcount:
+            conn_dbaux.execute_query(
+                "INSERT INTO flfingerprints (tabla, huella) VALUES (:tabla, :huella)",
+                params=params,
+            )
+
+        self._fingerprints[table_name] = fingerprint
+
     def checkMetaData(
         self,
         mtd1: Union[str, "pntablemetadata.PNTableMetaData"],
@@ -1366,6 +1437,8 @@ class FLManager(QtCore.QObject, IManager):
                     "flvar",
                     "flsettings",
                     "flseqs",
+                    "flcounters",
+                    "flfingerprints",
                     "flupdates",
                     "flacls",
                     "flacos",
@@ -1431,26 +1504,21 @@ class FLManager(QtCore.QObject, IManager):
         util = flutil.FLUtil()
         sha = str(util.sha1(large_value))
         ref_key = "RK@%s@%s" % (table_name, sha)
+        params = {"ref_key": ref_key, "contenido": large_value}
         qry = pnsqlquery.PNSqlQuery(None, "dbAux")
         qry.setSelect("refkey")
         qry.setFrom(table_large)
-        qry.setWhere("refkey = '%s'" % ref_key)
-        if qry.exec_() and qry.first():
+        qry.setWhere("refkey = :ref_key")
+        sql = ""
+        if qry.exec_("", {"ref_key": ref_key}) and qry.first():
             if qry.value(0) != sha:
-                sql = "UPDATE %s SET contenido = '%s' WHERE refkey ='%s'" % (
-                    table_large,
-                    large_value,
-                    ref_key,
-                )
+                sql = "UPDATE %s SET contenido = :contenido WHERE refkey = :ref_key" % table_large
 
         else:
-            sql = "INSERT INTO %s (contenido,refkey) VALUES ('%s','%s')" % (
-                table_large,
-                large_value,
-                ref_key,
-            )
+            sql = "INSERT INTO %s (contenido,refkey) VALUES (:contenido,:ref_key)" % table_large
 
-        self.db_.connManager().useConn("dbAux").execute_query(sql)
+        if sql:
+            self.db_.connManager().useConn("dbAux").execute_query(sql, params=params)
         return ref_key
 
     def fetchLargeValue(self, ref_key: Optional[str]) -> Optional[str]:
@@ -1472,8 +1540,8 @@ class FLManager(QtCore.QObject, IManager):
                 qry = pnsqlquery.PNSqlQuery(None, "dbAux")
                 qry.setSelect("contenido")
                 qry.setFrom(table_name)
-                qry.setWhere("refkey = '%s'" % ref_key)
-                if qry.exec_() and qry.first():
+                qry.setWhere("refkey = :ref_key")
+                if qry.exec_("", {"ref_key": ref_key}) and qry.first():
                     return xpm.cache_xpm(qry.value(0))
 
         return None
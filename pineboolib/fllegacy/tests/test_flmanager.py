@@ -64,6 +64,40 @@ class TestFLManager(unittest.TestCase):
 
         # self.assertFalse(manager_.alterTable(mtd_, mtd_, "", False))
 
+    def test_fingerprint(self) -> None:
+        """Test stored table fingerprints."""
+        from pineboolib.application.database import utils
+
+        manager_ = application.PROJECT.conn_manager.manager()
+        manager_.cache_metadata_.pop("fltest3.mtd", None)
+        mtd_ = manager_.metadata("fltest3")
+        self.assertTrue(mtd_ is not None)
+        if mtd_ is not None:
+            fingerprint = manager_._fingerprints["fltest3"]
+            self.assertEqual(fingerprint, manager_.metadataFingerprint(mtd_))
+            self.assertEqual(
+                utils.quick_sql_select("flfingerprints", "huella", "tabla = 'fltest3'"),
+                fingerprint,
+            )
+            self.assertFalse(
+                utils.quick_sql_select("flmetadata", "xml", "tabla = 'fltest3'") == fingerprint
+            )
+
+            manager_._fingerprints.clear()
+            manager_._fingerprints_loaded = False
+            self.assertTrue(manager_.fingerprintMatches(mtd_))
+
+            application.FORCE_MISMATCHED_CHECK = True
+            try:
+                self.assertFalse(manager_.fingerprintMatches(mtd_))
+            finally:
+                application.FORCE_MISMATCHED_CHECK = False
+
+            manager_._fingerprints["fltest3"] = "old_sha"
+            self.assertFalse(manager_.fingerprintMatches(mtd_))
+            manager_.storeFingerprint(mtd_)
+            self.assertTrue(manager_.fingerprintMatches(mtd_))
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -265,6 +265,11 @@ class IConnection:
 
         return  # pragma: no cover
 
+    def preallocateSerialVal(self, table: str, field: str, count: int) -> bool:
+        """Reserve count values of a serial type field at once, for bulk inserts."""
+
+        return False  # pragma: no cover
+
     def existsTable(self, name: str) -> bool:
         """Indicate the existence of a table in the database."""
 
@@ -290,7 +295,9 @@ class IConnection:
 
         return ""  # pragma: no cover
 
-    def execute_query(self, query: str) -> Any:
+    def execute_query(
+        self, query: str, stream_results: bool = False, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
         """Execute a query in a database cursor."""
 
         return ""  # pragma: no cover
@@ -73,6 +73,10 @@ class IManager(object):
         """Fetch from fllarge."""
         return None  # pragma: no cover
 
+    def fingerprintMatches(self, metadata: "pntablemetadata.PNTableMetaData") -> bool:
+        """Return if the stored fingerprint matches the metadata."""
+        return False  # pragma: no cover
+
     def finish(self) -> None:
         """Finish?."""
         return None  # pragma: no cover
@@ -120,6 +124,10 @@ class IManager(object):
         """Retrieve table metadata by table name."""
         return None  # pragma: no cover
 
+    def metadataFingerprint(self, metadata: "pntablemetadata.PNTableMetaData") -> str:
+        """Return the fingerprint of a table definition."""
+        return ""  # pragma: no cover
+
     def metadataField(
         self, field: "ElementTree.Element", vvisible: bool = False, ededitable: bool = False
     ) -> Optional["pnfieldmetadata.PNFieldMetaData"]:  # "PNFieldMetaData"
@@ -138,6 +146,10 @@ class IManager(object):
         """Create query."""
         return None  # pragma: no cover
 
+    def storeFingerprint(self, metadata: "pntablemetadata.PNTableMetaData") -> None:
+        """Save the fingerprint of a checked table."""
+        return None  # pragma: no cover
+
     def storeLargeValue(self, mtd, large_value: str) -> Optional[str]:
         """Store value in fllarge."""
         return None  # pragma: no cover
@@ -8,7 +8,7 @@ from PyQt5 import QtCore
 from pineboolib.interfaces.cursoraccessmode import CursorAccessMode
 
 
-from typing import Any, Optional, Dict, List, Union, TYPE_CHECKING
+from typing import Any, Optional, Dict, List, Tuple, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.application.acls import pnboolflagstate  # noqa: F401 # pragma: no cover
@@ -149,6 +149,17 @@ class ICursorPrivate(QtCore.QObject):
     """
     _transactions_opened: List[int]
 
+    """
+    Modo de inserción masiva. Registros pendientes de escribir (número, valores de la fila),
+    o None si el modo no está activo
+    """
+    _bulk_records: Optional[List[Tuple[int, Dict[str, Any]]]]
+    _bulk_size: int
+    _bulk_count: int
+    _bulk_rejected: List[Tuple[int, str]]
+    _bulk_ifaces: Tuple[Any, Any]
+    _bulk_fields: List[str]
+
     """
     Filtro persistente para incluir en el cursor los registros recientemente insertados aunque estos no
     cumplan los filtros principales. Esto es necesario para que dichos registros sean válidos dentro del
@@ -644,6 +655,10 @@ class ISqlCursor(QtCore.QObject):
         """Set sorting order."""
         pass  # pragma: no cover
 
+    def setProjection(self, field_names: Optional[List[str]] = None) -> None:
+        """Set the fields loaded with each record."""
+        pass  # pragma: no cover
+
     def insertRecord(self, wait: bool = True) -> None:
         """Open form in insert mode."""
         pass  # pragma: no cover
@@ -710,6 +725,26 @@ class ISqlCursor(QtCore.QObject):
 
         pass  # pragma: no cover
 
+    def msgCheckIntegrityBulk(self, records: List[Dict[str, Any]]) -> str:
+        """Return msg check integrity of a set of records."""
+
+        pass  # pragma: no cover
+
+    def beginBulkInsert(self, batch_size: int = 500) -> None:
+        """Start the bulk insert mode."""
+
+        pass  # pragma: no cover
+
+    def endBulkInsert(self) -> bool:
+        """Write the queued records and end the bulk insert mode."""
+
+        pass  # pragma: no cover
+
+    def bulkRejected(self) -> List[Tuple[int, str]]:
+        """Return the records rejected in bulk insert mode."""
+
+        pass  # pragma: no cover
+
     def aqWasDeleted(self) -> bool:
         """Indicate if the cursor has been deleted."""
 
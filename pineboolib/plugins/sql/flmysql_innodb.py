@@ -1,10 +1,22 @@
 """Flmysql_innodb module."""
 from .flmysql_myisam import FLMYSQL_MYISAM
 
+from sqlalchemy import text  # type: ignore [import] # noqa: F821
+
+from typing import Any, Optional, Dict, Tuple, TYPE_CHECKING
+
+import threading
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import base  # noqa: F401 # pragma: no cover
+
 
 class FLMYSQL_INNODB(FLMYSQL_MYISAM):
     """FLMYSQL_INNODB class."""
 
+    _autocommit_conn: Optional["base.Connection"]
+    _autocommit_lock: "threading.Lock"
+
     def __init__(self):
         """Inicialize."""
 
@@ -13,3 +25,85 @@ class FLMYSQL_INNODB(FLMYSQL_MYISAM):
         self.alias_ = "MySQL INNODB (MYSQLDB)"
         self._no_inno_db = False
         self._default_charset = "DEFAULT CHARACTER SET = UTF8MB4 COLLATE = UTF8MB4_BIN"
+        self._autocommit_conn = None  # Conexión propia para flseqs y flcounters.
+        self._autocommit_lock = threading.Lock()
+
+    def close(self):
+        """Close driver connection."""
+
+        with self._autocommit_lock:
+            self._close_autocommit_conn()
+
+        super().close()
+
+    def _increase_serial(self, params: Dict[str, Any]) -> Optional[int]:
+        """
+        Increase a flseqs sequence.
+
+        It runs in autocommit on the driver's own connection, so the flseqs row is not locked
+        until the current transaction ends.
+        """
+
+        result_ = self._autocommit_query(
+            "UPDATE flseqs SET seq = LAST_INSERT_ID(seq + :count)"
+            + " WHERE tabla = :tabla AND campo = :campo",
+            params,
+        )
+        return int(result_[1]) if result_ is not None and result_[0] else None
+
+    def increase_counter(self, counter_id: str, size: int) -> Optional[int]:
+        """Increase a flcounters block by size in autocommit mode on the driver's own connection."""
+
+        result_ = self._autocommit_query(
+            "UPDATE flcounters SET valor = LAST_INSERT_ID(valor + :size) WHERE id = :id",
+            {"id": counter_id, "size": size},
+        )
+        return int(result_[1]) if result_ is not None and result_[0] else None
+
+    def _init_serial(self, params: Dict[str, Any]) -> bool:
+        """Create a flseqs sequence from the maximum value stored in the table."""
+
+        result_ = self._autocommit_query(
+            "SELECT MAX(%s) FROM %s WHERE 1=1" % (params["campo"], params["tabla"]), params
+        )
+        params["seq"] = int(result_[2][0] or 0) if result_ is not None and result_[2] else 0
+        return (
+            self._autocommit_query(
+                "INSERT INTO flseqs (tabla,campo,seq) VALUES(:tabla,:campo,:seq)", params
+            )
+            is not None
+        )
+
+    def _autocommit_query(self, sql: str, params: Dict[str, Any]) -> Optional[Tuple[int, Any, Any]]:
+        """
+        Execute a query in autocommit mode on the driver's own connection.
+
+        The connection is opened once and reused, so a NullPool engine does not log in again for
+        every serial value or counter block.
+        @return (rowcount, lastrowid, first row) or None if it fails.
+        """
+
+        with self._autocommit_lock:
+            try:
+                if self._autocommit_conn is None or self._autocommit_conn.closed:
+                    self._autocommit_conn = self._engine.connect().execution_options(
+                        isolation_level="AUTOCOMMIT"
+                    )
+                cur = self._autocommit_conn.execute(text(sql), params)
+                return (cur.rowcount, cur.lastrowid, cur.fetchone() if cur.returns_rows else None)
+            except Exception as error:
+                if getattr(error, "connection_invalidated", False):
+                    self._close_autocommit_conn()  # Se abre de nuevo en la siguiente consulta.
+                self.set_last_error(str(error), sql)
+
+        return None
+
+    def _close_autocommit_conn(self) -> None:
+        """Close the autocommit connection."""
+
+        if self._autocommit_conn is not None:
+            try:
+                self._autocommit_conn.close()
+            except Exception:
+                pass
+            self._autocommit_conn = None
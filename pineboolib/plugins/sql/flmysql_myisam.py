@@ -6,7 +6,7 @@ Module for MYISAM driver.
 from pineboolib import logging
 from . import pnsqlschema
 
-from typing import Any, Optional, List, TYPE_CHECKING
+from typing import Any, Optional, List, Dict, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.application.metadata import pntablemetadata  # noqa: F401 # pragma: no cover
@@ -40,6 +40,7 @@ class FLMYSQL_MYISAM(pnsqlschema.PNSqlSchema):
         self._text_like = " "
         self._create_isolation = False
         self._use_altenative_isolation_level = True
+        self._rebuild_stream_results = False  # Un cursor sin buffer bloquea la conexión.
 
         self._database_not_found_keywords = ["Unknown database"]
         self._default_charset = "DEFAULT CHARACTER SET = utf8 COLLATE = utf8_bin"
@@ -76,6 +77,38 @@ class FLMYSQL_MYISAM(pnsqlschema.PNSqlSchema):
 
         return table_list
 
+    def estimated_row_count(self, table_name: str, where: str = "") -> Optional[int]:
+        """Return an estimated rows count from information_schema or None if not available."""
+
+        if where and where.replace(" ", "") != "1=1":
+            return None
+
+        cursor = self.execute_query(
+            "SELECT TABLE_ROWS FROM information_schema.tables WHERE TABLE_SCHEMA = '%s'"
+            " AND TABLE_NAME = '%s'" % (self.DBName(), table_name)
+        )
+        result_ = cursor.fetchone() if cursor else None
+        return int(result_[0]) if result_ and result_[0] is not None else None
+
+    def _increase_serial(self, params: Dict[str, Any]) -> Optional[int]:
+        """Increase a flseqs sequence in a single statement, using LAST_INSERT_ID."""
+
+        cur = self.execute_query(
+            "UPDATE flseqs SET seq = LAST_INSERT_ID(seq + :count)"
+            + " WHERE tabla = :tabla AND campo = :campo",
+            params=params,
+        )
+        return int(cur.lastrowid) if cur is not None and cur.rowcount else None
+
+    def increase_counter(self, counter_id: str, size: int) -> Optional[int]:
+        """Increase a flcounters block by size in a single statement, using LAST_INSERT_ID."""
+
+        cur = self.execute_query(
+            "UPDATE flcounters SET valor = LAST_INSERT_ID(valor + :size) WHERE id = :id",
+            params={"id": counter_id, "size": size},
+        )
+        return int(cur.lastrowid) if cur is not None and cur.rowcount else None
+
     def setType(self, type_: str, leng: int = 0) -> str:
         """Return type definition."""
         res_ = ""
@@ -199,50 +232,67 @@ class FLMYSQL_MYISAM(pnsqlschema.PNSqlSchema):
     def recordInfo2(self, table_name: str) -> List[list]:
         """Obtain current cursor information on columns."""
 
-        info = []
         sql = "SHOW FIELDS FROM %s" % table_name
 
         cursor = self.execute_query(sql)
         res = cursor.fetchall() if cursor else []
 
+        return [self._record_info_row(columns) for columns in res]
+
+    def recordInfoAll(self) -> Dict[str, List[List[Any]]]:
+        """Return info from all database tables and views, with a single catalog query."""
+
+        info: Dict[str, List[List[Any]]] = {}
+        sql = (
+            "SELECT LOWER(table_name), column_name, column_type, is_nullable, column_key,"
+            " column_default FROM information_schema.columns WHERE table_schema = DATABASE()"
+            " ORDER BY table_name, ordinal_position"
+        )
+
+        cursor = self.execute_query(sql)
+        res = cursor.fetchall() if cursor else []
+
         for columns in res:
-            field_name = columns[0]
-            field_allow_null = columns[2] == "NO"
-            field_size = "0"
-            field_precision = 0
-            field_default_value = columns[4]
-            field_primary_key = columns[3] == "PRI"
-
-            if columns[1].find("(") > -1:
-                field_type = self.decodeSqlType(columns[1][: columns[1].find("(")])
-                if field_type not in ["uint", "int", "double"]:
-                    field_size = columns[1][columns[1].find("(") + 1 : columns[1].find(")")]
-                else:
-                    pos_comma = field_size.find(",")
-                    if pos_comma > -1:
-                        list_number = field_size.split(",")
-                        field_precision = int(list_number[1])
-                        field_size = list_number[0]
+            info.setdefault(columns[0], []).append(self._record_info_row(columns[1:]))
+
+        return info
+
+    def _record_info_row(self, columns: Sequence[Any]) -> List[Any]:
+        """Return a recordInfo2 row from a SHOW FIELDS row."""
 
+        field_name = columns[0]
+        field_allow_null = columns[2] == "NO"
+        field_size = "0"
+        field_precision = 0
+        field_default_value = columns[4]
+        field_primary_key = columns[3] == "PRI"
+
+        if columns[1].find("(") > -1:
+            field_type = self.decodeSqlType(columns[1][: columns[1].find("(")])
+            if field_type not in ["uint", "int", "double"]:
+                field_size = columns[1][columns[1].find("(") + 1 : columns[1].find(")")]
             else:
-                field_type = self.decodeSqlType(columns[1])
-
-            if field_type == "string" and field_size == "255":
-                field_size = "0"
-
-            info.append(
-                [
-                    field_name,
-                    field_type,
-                    field_allow_null,
-                    int(field_size),
-                    field_precision,
-                    field_default_value,
-                    field_primary_key,
-                ]
-            )
+                pos_comma = field_size.find(",")
+                if pos_comma > -1:
+                    list_number = field_size.split(",")
+                    field_precision = int(list_number[1])
+                    field_size = list_number[0]
 
-        return info
+        else:
+            field_type = self.decodeSqlType(columns[1])
+
+        if field_type == "string" and field_size == "255":
+            field_size = "0"
+
+        return [
+            field_name,
+            field_type,
+            field_allow_null,
+            int(field_size),
+            field_precision,
+            field_default_value,
+            field_primary_key,
+        ]
 
     def decodeSqlType(self, t: str) -> str:
         """Translate types."""
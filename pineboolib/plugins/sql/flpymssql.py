@@ -12,7 +12,7 @@ from . import pnsqlschema
 
 from sqlalchemy.orm import sessionmaker  # type: ignore [import] # noqa: F821
 
-from typing import Optional, Union, List, Any, Tuple, TYPE_CHECKING
+from typing import Optional, Union, List, Any, Tuple, Dict, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import (  # type: ignore [import] # noqa: F401, F821
@@ -81,18 +81,43 @@ class FLPYMSSQL(pnsqlschema.PNSqlSchema):
         cur = self.execute_query(sql)
         return True if cur and cur.fetchone() else False
 
-    def nextSerialVal(self, table_name: str, field_name: str) -> int:
-        """Return next serial value."""
+    def _reserve_serial_values(self, table_name: str, field_name: str, count: int) -> List[int]:
+        """Reserve count values of the field sequence and return them."""
 
         if self.is_open():
-            cur = self.execute_query("SELECT NEXT VALUE FOR %s_%s_seq" % (table_name, field_name))
+            seq_ = "%s_%s_seq" % (table_name, field_name)
+            if count == 1:
+                cur = self.execute_query("SELECT NEXT VALUE FOR %s" % seq_)
+            else:
+                cur = self.execute_query(
+                    "SET NOCOUNT ON; DECLARE @first_value SQL_VARIANT;"
+                    + " EXEC sp_sequence_get_range @sequence_name = N'%s'," % seq_
+                    + " @range_size = %d, @range_first_value = @first_value OUTPUT;" % count
+                    + " SELECT CAST(@first_value AS BIGINT)"
+                )
 
             if cur and cur.returns_rows:
-                return cur.fetchone()[0]  # type: ignore [index] # noqa: F821
+                first_value = int(cur.fetchone()[0])  # type: ignore [index] # noqa: F821
+                return list(range(first_value, first_value + count))
 
             LOGGER.warning("not exec sequence")
 
-        return 0
+        return []
+
+    def increase_counter(self, counter_id: str, size: int) -> Optional[int]:
+        """Increase a flcounters block by size and return its new value."""
+
+        cur = self.execute_query(
+            "UPDATE flcounters SET valor = valor + :size OUTPUT inserted.valor WHERE id = :id",
+            params={"id": counter_id, "size": size},
+        )
+        value = cur.fetchone() if cur is not None and cur.returns_rows else None
+        return int(value[0]) if value is not None else None
+
+    def paging_clause(self, limit: int, offset: int = 0) -> str:
+        """Return the clause that pages a sorted query. SQL Server has no LIMIT."""
+
+        return " OFFSET %s ROWS FETCH NEXT %s ROWS ONLY" % (offset, limit)
 
     def releaseSavePoint(self, num: int) -> bool:
         """Set release savepoint."""
@@ -322,36 +347,51 @@ class FLPYMSSQL(pnsqlschema.PNSqlSchema):
 
     def recordInfo2(self, tablename: str) -> List[List[Any]]:
         """Return info from a database table."""
-        info = []
         sql = (
             "SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT, NUMERIC_PRECISION_RADIX,"
             + " CHARACTER_MAXIMUM_LENGTH FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = '%s'"
             % tablename.lower()
         )
 
+        data = self.execute_query(sql)
+        res = data.fetchall() if data else []
+        return [self._record_info_row(columns) for columns in res]
+
+    def recordInfoAll(self) -> Dict[str, List[List[Any]]]:
+        """Return info from all database tables and views, with a single catalog query."""
+        info: Dict[str, List[List[Any]]] = {}
+        sql = (
+            "SELECT LOWER(TABLE_NAME), COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT,"
+            + " NUMERIC_PRECISION_RADIX, CHARACTER_MAXIMUM_LENGTH FROM INFORMATION_SCHEMA.COLUMNS"
+            + " ORDER BY TABLE_NAME, ORDINAL_POSITION"
+        )
+
         data = self.execute_query(sql)
         res = data.fetchall() if data else []
         for columns in res:
-            field_size = int(columns[5]) if columns[5] else 0
-            # field_precision = columns[4] or 0
-            field_name = columns[0]
-            field_type = self.decodeSqlType(columns[1])
-            field_allow_null = columns[2] == "YES"
-            field_default_value = columns[3]
-
-            info.append(
-                [
-                    field_name,
-                    field_type,
-                    not field_allow_null,
-                    field_size,
-                    None,
-                    field_default_value,
-                    None,  # field_pk
-                ]
-            )
+            info.setdefault(columns[0], []).append(self._record_info_row(columns[1:]))
+
         return info
 
+    def _record_info_row(self, columns: Sequence[Any]) -> List[Any]:
+        """Return a recordInfo2 row from an INFORMATION_SCHEMA.COLUMNS row."""
+        field_size = int(columns[5]) if columns[5] else 0
+        # field_precision = columns[4] or 0
+        field_name = columns[0]
+        field_type = self.decodeSqlType(columns[1])
+        field_allow_null = columns[2] == "YES"
+        field_default_value = columns[3]
+
+        return [
+            field_name,
+            field_type,
+            not field_allow_null,
+            field_size,
+            None,
+            field_default_value,
+            None,  # field_pk
+        ]
+
     def vacuum(self) -> None:
         """Vacuum tables."""
 
@@ -7,8 +7,12 @@ from pineboolib.fllegacy import flutil
 
 from . import pnsqlschema
 import sqlalchemy  # type: ignore [import] # noqa: F821, F401
+import re
 
-from typing import Optional, Union, List, Any
+from typing import Optional, Union, List, Any, Dict, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pineboolib.application.metadata import pnfieldmetadata  # noqa: F401 # pragma: no cover
 
 LOGGER = logging.get_logger(__name__)
 
@@ -30,6 +34,7 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         self._like_false = "'f'"
         self._database_not_found_keywords = ["does not exist", "no existe"]
         self._sqlalchemy_name = "postgresql"
+        self._serial_returning = True
 
     def getAlternativeConn(self, name: str, host: str, port: int, usern: str, passw_: str) -> Any:
         """Return connection."""
@@ -41,19 +46,34 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
 
         return conn_
 
-    def nextSerialVal(self, table_name: str, field_name: str) -> int:
-        """Return next serial value."""
+    def _reserve_serial_values(self, table_name: str, field_name: str, count: int) -> List[int]:
+        """Reserve count values of the field sequence and return them."""
 
-        if self.is_open():
-            seq_ = "%s_%s_seq" % (table_name, field_name)
-            result_ = 0
-            qry = self.execute_query("SELECT NEXTVAL('%s')" % seq_)
-            if qry is not None:
-                result_ = qry.fetchone()[0]  # type: ignore [index] # noqa: F821
-            else:
-                self.execute_query("CREATE SEQUENCE %s" % seq_)
+        if not self.is_open():
+            return []
+
+        seq_ = "%s_%s_seq" % (table_name, field_name)
+        qry = self.execute_query("SELECT NEXTVAL('%s') FROM generate_series(1, %d)" % (seq_, count))
+        if qry is None:
+            self.execute_query("CREATE SEQUENCE %s" % seq_)
+            return []
 
-        return result_
+        return [row[0] for row in qry.fetchall()]
+
+    def estimated_row_count(self, table_name: str, where: str = "") -> Optional[int]:
+        """Return an estimated rows count from the planner statistics or None if not available."""
+
+        if where and where.replace(" ", "") != "1=1":
+            cursor = self.execute_query("EXPLAIN SELECT 1 FROM %s WHERE %s" % (table_name, where))
+            plan = cursor.fetchone() if cursor else None
+            match = re.search(r"rows=(\d+)", plan[0]) if plan else None
+            return int(match.group(1)) if match else None
+
+        cursor = self.execute_query(
+            "SELECT reltuples FROM pg_class WHERE relname = '%s' AND relkind = 'r'" % table_name
+        )
+        result_ = cursor.fetchone() if cursor else None
+        return int(result_[0]) if result_ and result_[0] is not None and result_[0] >= 0 else None
 
     def setType(self, type_: str, leng: int = 0) -> str:
         """Return type definition."""
@@ -85,6 +105,21 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
 
         return "%s(%s)" % (res_, leng) if leng else res_
 
+    def _cast_expression(
+        self,
+        expression: str,
+        field: "pnfieldmetadata.PNFieldMetaData",
+        old_column: Optional[List[Any]] = None,
+    ) -> str:
+        """Return expression converted to the type of field, for INSERT ... SELECT."""
+
+        type_ = "uint" if field.type() == "serial" else field.type()
+        if old_column is None or old_column[1] == type_:
+            return expression
+
+        # Postgres no tiene conversión implícita en la asignación para todos los tipos.
+        return "CAST(%s AS %s)" % (expression, self.setType(type_, field.length()))
+
     def sqlCreateTable(
         self, tmd: "pntablemetadata.PNTableMetaData", create_index: bool = True
     ) -> Optional[str]:
@@ -166,7 +201,6 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
 
     def recordInfo2(self, tablename: str) -> List[List[Any]]:
         """Return info from a database table."""
-        info = []
         sql = (
             "select pg_attribute.attname, pg_attribute.atttypid, pg_attribute.attnotnull, pg_attribute.attlen, pg_attribute.atttypmod, "
             "pg_get_expr(pg_attrdef.adbin, pg_attrdef.adrelid) from pg_class, pg_attribute "
@@ -176,46 +210,67 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         )
         cursor = self.execute_query(sql)
         res = cursor.fetchall() if cursor else []
+        return [self._record_info_row(columns) for columns in res]
+
+    def recordInfoAll(self) -> Dict[str, List[List[Any]]]:
+        """Return info from all database tables and views, with a single catalog query."""
+        info: Dict[str, List[List[Any]]] = {}
+        sql = (
+            "select lower(pg_class.relname), pg_attribute.attname, pg_attribute.atttypid,"
+            " pg_attribute.attnotnull, pg_attribute.attlen, pg_attribute.atttypmod,"
+            " pg_get_expr(pg_attrdef.adbin, pg_attrdef.adrelid) from pg_class, pg_attribute"
+            " left join pg_attrdef on (pg_attrdef.adrelid = pg_attribute.attrelid"
+            " and pg_attrdef.adnum = pg_attribute.attnum)"
+            " where pg_class.relkind in ('r', 'v') and pg_table_is_visible(pg_class.oid)"
+            " and pg_attribute.attnum > 0 and pg_attribute.attrelid = pg_class.oid"
+            " and pg_attribute.attisdropped = false "
+            "order by pg_class.relname, pg_attribute.attnum"
+        )
+        cursor = self.execute_query(sql)
+        res = cursor.fetchall() if cursor else []
         for columns in res:
-            field_size = columns[3]
-            field_precision = columns[4]
-            field_name = columns[0]
-            field_type = columns[1]
-            field_allow_null = columns[2]
-            field_default_value = columns[5]
-
-            if isinstance(field_default_value, str) and field_default_value:
-                if field_default_value.find("::character varying") > -1:
-                    field_default_value = field_default_value[
-                        0 : field_default_value.find("::character varying")
-                    ]
-
-            if field_size == -1 and field_precision > -1:
-                field_size = field_precision - 4
-                field_precision = -1
-
-            if field_size < 0:
-                field_size = 0
-
-            if field_precision < 0:
-                field_precision = 0
-
-            if field_default_value and field_default_value[0] == "'":
-                field_default_value = field_default_value[1 : len(field_default_value) - 2]
-
-            info.append(
-                [
-                    field_name,
-                    self.decodeSqlType(field_type),
-                    field_allow_null,
-                    field_size,
-                    field_precision,
-                    None,  # defualt_value
-                    None,  # is_pk
-                ]
-            )
+            info.setdefault(columns[0], []).append(self._record_info_row(columns[1:]))
+
         return info
 
+    def _record_info_row(self, columns: Sequence[Any]) -> List[Any]:
+        """Return a recordInfo2 row from a pg_attribute row."""
+        field_size = columns[3]
+        field_precision = columns[4]
+        field_name = columns[0]
+        field_type = columns[1]
+        field_allow_null = columns[2]
+        field_default_value = columns[5]
+
+        if isinstance(field_default_value, str) and field_default_value:
+            if field_default_value.find("::character varying") > -1:
+                field_default_value = field_default_value[
+                    0 : field_default_value.find("::character varying")
+                ]
+
+        if field_size == -1 and field_precision > -1:
+            field_size = field_precision - 4
+            field_precision = -1
+
+        if field_size < 0:
+            field_size = 0
+
+        if field_precision < 0:
+            field_precision = 0
+
+        if field_default_value and field_default_value[0] == "'":
+            field_default_value = field_default_value[1 : len(field_default_value) - 2]
+
+        return [
+            field_name,
+            self.decodeSqlType(field_type),
+            field_allow_null,
+            field_size,
+            field_precision,
+            None,  # defualt_value
+            None,  # is_pk
+        ]
+
     def decodeSqlType(self, type_: Union[int, str]) -> str:
         """Return the specific field type."""
         ret = str(type_)
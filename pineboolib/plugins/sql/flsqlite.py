@@ -11,9 +11,10 @@ from . import pnsqlschema
 
 
 import os
+import sqlite3
 
 
-from typing import Optional, Any, List, TYPE_CHECKING
+from typing import Optional, Any, List, Dict, Sequence, TYPE_CHECKING
 from sqlalchemy import create_engine, event  # type: ignore [import] # noqa: F821, F401
 
 
@@ -49,6 +50,7 @@ class FLSQLITE(pnsqlschema.PNSqlSchema):
         self._text_like = ""
         self._text_cascade = ""
         self._parse_porc = False
+        self._serial_returning = sqlite3.sqlite_version_info >= (3, 35, 0)
 
         self._sqlalchemy_name = "sqlite"
 
@@ -116,6 +118,24 @@ class FLSQLITE(pnsqlschema.PNSqlSchema):
             if application.VIRTUAL_DB:
                 self.db_filename = name
 
+    def estimated_row_count(self, table_name: str, where: str = "") -> Optional[int]:
+        """Return an estimated rows count from sqlite_stat1 or None if not available."""
+
+        if where and where.replace(" ", "") != "1=1":
+            return None
+
+        cursor = self.execute_query(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'"
+        )
+        if not cursor or cursor.fetchone() is None:  # ANALYZE no se ha ejecutado nunca.
+            return None
+
+        cursor = self.execute_query(
+            "SELECT stat FROM sqlite_stat1 WHERE tbl = '%s' ORDER BY idx IS NOT NULL" % table_name
+        )
+        result_ = cursor.fetchone() if cursor else None
+        return int(str(result_[0]).split(" ")[0]) if result_ and result_[0] else None
+
     def setType(self, type_: str, leng: int = 0) -> str:
         """Return type definition."""
         res_ = ""
@@ -226,35 +246,50 @@ class FLSQLITE(pnsqlschema.PNSqlSchema):
     def recordInfo2(self, table_name: str) -> List[List]:
         """Return info from a database table."""
 
-        info = []
         sql = "PRAGMA table_info('%s')" % table_name
 
         cursor = self.execute_query(sql)
         res = cursor.fetchall() if cursor else []
 
+        return [self._record_info_row(columns) for columns in res]
+
+    def recordInfoAll(self) -> Dict[str, List[List[Any]]]:
+        """Return info from all database tables, with a single catalog query."""
+
+        info: Dict[str, List[List[Any]]] = {}
+        # Sin vistas: una vista con una tabla renombrada hace fallar toda la consulta.
+        sql = (
+            "SELECT m.name, p.* FROM sqlite_master AS m, pragma_table_info(m.name) AS p"
+            " WHERE m.type = 'table' ORDER BY m.name, p.cid"
+        )
+
+        cursor = self.execute_query(sql)
+        res = cursor.fetchall() if cursor else []
+
         for columns in res:
-            field_name = columns[1]
-            field_type = columns[2]
-            field_size = 0
-            field_allow_null = columns[3] == 0 and columns[5] == 0
-            field_primary_key = columns[5] == 1
-            if field_type.find("VARCHAR(") > -1:
-                field_size = field_type[field_type.find("(") + 1 : len(field_type) - 1]
-
-            info.append(
-                [
-                    field_name,
-                    self.decodeSqlType(field_type),
-                    not field_allow_null,
-                    int(field_size),
-                    None,  # field_precision
-                    None,  # default value
-                    field_primary_key,
-                ]
-            )
+            info.setdefault(columns[0].lower(), []).append(self._record_info_row(columns[1:]))
 
         return info
 
+    def _record_info_row(self, columns: Sequence[Any]) -> List[Any]:
+        """Return a recordInfo2 row from a PRAGMA table_info row."""
+
+        field_type = columns[2]
+        field_size = 0
+        field_allow_null = columns[3] == 0 and columns[5] == 0
+        if field_type.find("VARCHAR(") > -1:
+            field_size = field_type[field_type.find("(") + 1 : len(field_type) - 1]
+
+        return [
+            columns[1],  # field_name
+            self.decodeSqlType(field_type),
+            not field_allow_null,
+            int(field_size),
+            None,  # field_precision
+            None,  # default value
+            columns[5] == 1,  # field_primary_key
+        ]
+
     def decodeSqlType(self, type_: str) -> str:
         """Return the specific field type."""
 
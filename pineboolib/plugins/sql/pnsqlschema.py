@@ -20,8 +20,11 @@ from sqlalchemy.engine import base, create_engine  # type: ignore [import] # noq
 from sqlalchemy.inspection import inspect  # type: ignore [import] # noqa: F821, F401
 from sqlalchemy.orm import sessionmaker  # type: ignore [import] # noqa: F821
 
-from sqlalchemy import event, pool, text
+from sqlalchemy import event, exc, pool, text
 import sqlalchemy  # type: ignore [import] # noqa: F821, F401
+import collections
+import threading
+import time
 import traceback
 
 
@@ -30,6 +33,7 @@ import re
 
 if TYPE_CHECKING:
     from pineboolib.application.metadata import pntablemetadata  # noqa: F401 # pragma: no cover
+    from pineboolib.application.metadata import pnfieldmetadata  # noqa: F401 # pragma: no cover
     from pineboolib.interfaces import iconnection  # noqa: F401 # pragma: no cover
     from sqlalchemy.engine import (  # type: ignore [import] # noqa: F821, F401
         result,  # noqa: F401
@@ -42,6 +46,124 @@ if TYPE_CHECKING:
 LOGGER = logging.get_logger(__name__)
 
 ENGINES: Dict[str, "base.Engine"] = {}
+POOL_METRICS: Dict[str, "PoolMetrics"] = {}  # Mismas claves que ENGINES.
+INSERT_MULTI_BATCH_SIZE = 1000  # Registros por executemany en insertMulti.
+POOL_STACK_LIMIT = 20  # Frames saved for each checked out connection (0 disabled).
+POOL_WAIT_BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0)  # Upper bounds (seconds) of the wait histogram.
+POOL_THREAD_STATS_LIMIT = 100  # Threads kept in the checkout stats, the least recent are dropped.
+
+
+class PoolMetrics(object):
+    """Checkout telemetry of an engine pool."""
+
+    def __init__(self, engine: "base.Engine") -> None:
+        """Listen the engine pool events."""
+
+        self._engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_histogram = [0] * (len(POOL_WAIT_BUCKETS) + 1)
+        # thread name -> count, total, max. Ordenado del hilo menos reciente al más reciente.
+        self.thread_stats: "collections.OrderedDict[str, Dict[str, float]]" = (
+            collections.OrderedDict()
+        )
+        self._held: Dict[int, Tuple[float, str, Any]] = {}  # id(record) -> time, thread, stack.
+
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "checkin", self._checkin)
+        event.listen(engine, "detach", self._checkin)
+
+    def add_wait(self, seconds: float) -> None:
+        """Add the time a thread waited for a pool connection."""
+
+        bucket = 0
+        while bucket < len(POOL_WAIT_BUCKETS) and seconds > POOL_WAIT_BUCKETS[bucket]:
+            bucket += 1
+
+        with self._lock:
+            self.wait_histogram[bucket] += 1
+
+    def _checkout(self, dbapi_conn: Any, conn_record: Any, conn_proxy: Any) -> None:
+        """Checkout event."""
+
+        stack = None
+        if POOL_STACK_LIMIT:
+            stack = traceback.StackSummary.extract(
+                traceback.walk_stack(None), limit=POOL_STACK_LIMIT, lookup_lines=False
+            )
+
+        with self._lock:
+            self.checkouts += 1
+            self._held[id(conn_record)] = (time.time(), threading.current_thread().name, stack)
+
+    def _checkin(self, dbapi_conn: Any, conn_record: Any) -> None:
+        """Checkin event. Save the checkout duration of the thread, keeping the latest threads."""
+
+        with self._lock:
+            held = self._held.pop(id(conn_record), None)
+            if held is None:
+                return
+
+            duration = time.time() - held[0]
+            stats = self.thread_stats.setdefault(held[1], {"count": 0, "total": 0, "max": 0})
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            self.thread_stats.move_to_end(held[1])
+            while len(self.thread_stats) > POOL_THREAD_STATS_LIMIT:
+                self.thread_stats.popitem(last=False)
+
+    def snapshot(self, holders: int = 5) -> Dict[str, Any]:
+        """Return pool counters and the stacks of the longest holders."""
+
+        pool_ = self._engine.pool
+        is_queue = isinstance(pool_, pool.QueuePool)
+        labels = ["<=%s" % bound for bound in POOL_WAIT_BUCKETS] + [">%s" % POOL_WAIT_BUCKETS[-1]]
+        now = time.time()
+
+        with self._lock:
+            held = sorted(self._held.values(), key=lambda item: item[0])[:holders]
+            return {
+                "url": self._engine.url.render_as_string(hide_password=True),
+                "pool": pool_.__class__.__name__,
+                "size": pool_.size() if is_queue else 0,
+                "checked_out": len(self._held),
+                "overflow": pool_.overflow() if is_queue else 0,
+                "checkouts": self.checkouts,
+                "wait_histogram": dict(zip(labels, self.wait_histogram)),
+                "threads": dict([(name, dict(stats)) for name, stats in self.thread_stats.items()]),
+                "holders": [
+                    {
+                        "thread": thread_name,
+                        "seconds": now - start,
+                        "stack": "".join(stack.format()) if stack is not None else "",
+                    }
+                    for start, thread_name, stack in held
+                ],
+            }
+
+
+class PNQueuePool(pool.QueuePool):
+    """QueuePool that saves in its metrics how long threads wait for a connection."""
+
+    metrics: Optional["PoolMetrics"] = None
+
+    def _do_get(self) -> Any:
+        """Return a connection from the pool."""
+
+        start = time.time()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.add_wait(time.time() - start)
+
+    def recreate(self) -> "PNQueuePool":
+        """Return a new pool with the same metrics."""
+
+        new_pool = cast(PNQueuePool, super().recreate())
+        new_pool.metrics = self.metrics
+        return new_pool
 
 
 class PNSqlSchema(object):
@@ -80,6 +202,11 @@ class PNSqlSchema(object):
     _extra_alternative: str
     _sp_level: int
     _use_altenative_isolation_level: bool
+    _serial_returning: bool
+    _serial_cache: Dict[Tuple[str, str], List[int]]
+    _serial_lock: "threading.Lock"
+    _rebuild_stream_results: bool
+    _record_info_cache: Optional[Dict[str, List[List[Any]]]]
 
     def __init__(self):
         """Inicialize."""
@@ -113,6 +240,11 @@ class PNSqlSchema(object):
         self._sqlalchemy_name = ""
         self._sp_level = 0
         self._use_altenative_isolation_level = False
+        self._serial_returning = False  # Soporta UPDATE ... RETURNING.
+        self._serial_cache = {}
+        self._serial_lock = threading.Lock()
+        self._rebuild_stream_results = True  # alterTable lee la tabla antigua en streaming.
+        self._record_info_cache = None
 
     def safe_load(self, exit: bool = False) -> bool:
         """Return if the driver can loads dependencies safely."""
@@ -122,6 +254,7 @@ class PNSqlSchema(object):
         """Close driver connection."""
 
         self.open_ = False
+        self._record_info_cache = None
         if self._connection is not None:
             self._connection.close()
             self._connection = None  # type: ignore [assignment] # noqa: F821
@@ -242,22 +375,34 @@ class PNSqlSchema(object):
         LOGGER.debug = LOGGER.trace  # type: ignore  # Send Debug output to Trace
         try:
             str_conn = self.loadConnectionString(name, host, port, usern, passw_)
-            if str_conn in ENGINES.keys():
+            engine_key = str_conn
+            if self.db_._name in self.db_.connManager().pool_config:
+                engine_key += "|%s" % self.db_._name  # Pool propio para el alias.
+
+            if engine_key in ENGINES.keys():
                 LOGGER.info(
                     "Reusing engine %s:%s/%s to %s connection", host, port, name, self.db_._name
                 )
-                self._engine = ENGINES[str_conn]
+                self._engine = ENGINES[engine_key]
             else:
                 if alternative:
                     str_conn += self._extra_alternative
 
                 self.get_common_params()
                 self._engine = create_engine(str_conn, **self._queqe_params)
+                POOL_METRICS[engine_key] = PoolMetrics(self._engine)
+                if isinstance(self._engine.pool, PNQueuePool):
+                    self._engine.pool.metrics = POOL_METRICS[engine_key]
                 if self._use_altenative_isolation_level:
                     event.listen(self._engine, "begin", self.do_begin)
                     event.listen(self._engine, "savepoint", self.do_savepoint)
+                if self._queqe_params["poolclass"] is PNQueuePool and not self._queqe_params.get(
+                    "pool_pre_ping"
+                ):
+                    event.listen(self._engine, "checkin", self.do_checkin)
+                    event.listen(self._engine, "checkout", self.do_checkout)
 
-                ENGINES[str_conn] = self._engine
+                ENGINES[engine_key] = self._engine
 
             if application.SHOW_CONNECTION_EVENTS:
                 self.listen_engine()
@@ -403,6 +548,33 @@ class PNSqlSchema(object):
 
         return str(result_)
 
+    def bindValue(self, type_: str, value: Any, upper: bool = False) -> Any:
+        """Return a value ready to be bound. Same rules as formatValue, without quotes."""
+
+        if value is None:
+            return None
+
+        elif type_ in ("uint", "int", "double", "serial"):
+            return value or 0
+
+        elif type_ == "string":
+            value = utils_base.auto_qt_translate_text(value)
+            return value.upper() if upper else value
+
+        elif type_ in ("bool", "unlock"):
+            return utils_base.text2bool(str(value))
+
+        elif type_ == "date":
+            return str(flutil.FLUtil.dateDMAtoAMD(value))
+
+        elif type_ == "time":
+            return value or None
+
+        elif type_ in ("stringlist", "timestamp", "pixmap"):
+            return str(value)
+
+        return value
+
     def canOverPartition(self) -> bool:
         """Return can override partition option ready."""
         return True
@@ -414,51 +586,114 @@ class PNSqlSchema(object):
     def nextSerialVal(self, table_name: str, field_name: str) -> int:
         """Return next serial value."""
 
-        table_max = 0
-        flseq_max = 0
-        res_ = 0
-        sql = "SELECT MAX(%s) FROM %s WHERE 1=1" % (field_name, table_name)
-        cur = self.execute_query(sql)
-        if cur is not None:
-            value = cur.fetchone()
+        with self._serial_lock:
+            values = self._serial_cache.get((table_name, field_name))
+            if values:
+                return values.pop(0)
 
-            if value is not None:
-                table_max = value[0] or 0
+        values = self._reserve_serial_values(table_name, field_name, 1)
+        return values[0] if values else 0
 
-        sql = "SELECT seq FROM flseqs WHERE tabla = '%s' AND campo ='%s'" % (table_name, field_name)
-        cur = self.execute_query(sql)
-        if cur is not None:
-            value = cur.fetchone()
+    def preallocateSerialVal(self, table_name: str, field_name: str, count: int) -> bool:
+        """Reserve count serial values at once. nextSerialVal returns them before asking again."""
 
-            if value is not None:
-                flseq_max = value[0] or 0
+        values = self._reserve_serial_values(table_name, field_name, count)
+        if not values:
+            return False
 
-        res_ = flseq_max or table_max
-        res_ += 1
+        with self._serial_lock:
+            self._serial_cache.setdefault((table_name, field_name), []).extend(values)
 
-        str_qry = ""
-        if flseq_max:
-            if res_ > flseq_max:
-                str_qry = "UPDATE flseqs SET seq=%s WHERE tabla = '%s' AND campo = '%s'" % (
-                    res_,
-                    table_name,
-                    field_name,
-                )
-        else:
-            str_qry = "INSERT INTO flseqs (tabla,campo,seq) VALUES('%s','%s',%s)" % (
-                table_name,
-                field_name,
-                res_,
-            )
+        return True
+
+    def _reserve_serial_values(self, table_name: str, field_name: str, count: int) -> List[int]:
+        """Reserve count serial values in flseqs and return them."""
+
+        params = {"tabla": table_name, "campo": field_name, "count": count}
+        for _ in range(2):
+            last_value = self._increase_serial(params)
+            if last_value is not None:
+                return list(range(last_value - count + 1, last_value + 1))
 
-        if str_qry:
+            # No existe la secuencia en flseqs. Se inicia con el máximo de la tabla.
+            if not self._init_serial(params):
+                LOGGER.error("nextSerialVal: %s", self.last_error())
+
+        return []
+
+    def _init_serial(self, params: Dict[str, Any]) -> bool:
+        """Create a flseqs sequence from the maximum value stored in the table."""
+
+        cur = self.execute_query(
+            "SELECT MAX(%s) FROM %s WHERE 1=1" % (params["campo"], params["tabla"])
+        )
+        value = cur.fetchone() if cur is not None else None
+        params["seq"] = int(value[0] or 0) if value is not None else 0
+        self.execute_query(
+            "INSERT INTO flseqs (tabla,campo,seq) VALUES(:tabla,:campo,:seq)", params=params
+        )
+        return not self.last_error()
+
+    def _increase_serial(self, params: Dict[str, Any]) -> Optional[int]:
+        """Increase a flseqs sequence by params["count"] and return its new value."""
+
+        return self._update_and_select(
+            "UPDATE flseqs SET seq = seq + :count WHERE tabla = :tabla AND campo = :campo",
+            "seq",
+            "SELECT seq FROM flseqs WHERE tabla = :tabla AND campo = :campo",
+            params,
+        )
+
+    def increase_counter(self, counter_id: str, size: int) -> Optional[int]:
+        """
+        Increase a flcounters block by size and return its new value.
+
+        @return new value or None if the counter does not exist or the query fails.
+        """
+
+        return self._update_and_select(
+            "UPDATE flcounters SET valor = valor + :size WHERE id = :id",
+            "valor",
+            "SELECT valor FROM flcounters WHERE id = :id",
+            {"id": counter_id, "size": size},
+        )
+
+    def _update_and_select(
+        self, sql: str, column: str, select_sql: str, params: Dict[str, Any]
+    ) -> Optional[int]:
+        """
+        Run an UPDATE of a single row and return the new value of column.
+
+        The value is read in the same statement, or in the same transaction that locks the row,
+        so two sessions never get the same value.
+        @return new value or None if the row does not exist or the query fails.
+        """
+
+        if self._serial_returning:
+            cur = self.execute_query("%s RETURNING %s" % (sql, column), params=params)
+        else:
+            session_ = self.db_.session()
+            transaction_ = None if session_.in_transaction() else session_.begin()
             try:
-                self.execute_query(str_qry)
-            except Exception as error:
-                LOGGER.error("nextSerialVal: %s", str(error))
-                self.session()[1].rollback()
+                cur = self.execute_query(sql, params=params)
+                if cur is not None and cur.rowcount:  # La fila queda bloqueada hasta el final.
+                    cur = self.execute_query(select_sql, params=params)
+            finally:
+                if transaction_ is not None and transaction_.is_active:
+                    transaction_.commit()
+
+        value = cur.fetchone() if cur is not None and cur.returns_rows else None
+        return int(value[0]) if value is not None else None
+
+    def estimated_row_count(self, table_name: str, where: str = "") -> Optional[int]:
+        """Return an estimated rows count from the planner statistics or None if not available."""
 
-        return res_
+        return None
+
+    def paging_clause(self, limit: int, offset: int = 0) -> str:
+        """Return the clause that pages a sorted query."""
+
+        return " LIMIT %s OFFSET %s" % (limit, offset) if offset else " LIMIT %s" % limit
 
     def set_last_error_null(self) -> None:
         """Set lastError flag Null."""
@@ -545,7 +780,7 @@ class PNSqlSchema(object):
         dict_database: Dict[str, List[Any]] = dict(
             [
                 [rec_d[0], rec_d]  # type: ignore [misc] # noqa: F821
-                for rec_d in self.recordInfo2(table_name)
+                for rec_d in self.cached_record_info(table_name)
             ]
         )
 
@@ -608,6 +843,37 @@ class PNSqlSchema(object):
         """Return info from a database table."""
         return []  # pragma: no cover
 
+    def recordInfoAll(self) -> Dict[str, List[List[Any]]]:
+        """
+        Return info from all database tables and views, with a single catalog query.
+
+        Keys are lowercase table names and values have the recordInfo2 format. Drivers without
+        a bulk query return an empty dict and cached_record_info falls back to recordInfo2.
+        """
+        return {}
+
+    def cached_record_info(self, table_name: str) -> List[List[Any]]:
+        """
+        Return recordInfo2 of a table from the schema snapshot of this connection.
+
+        The snapshot is loaded with recordInfoAll on the first call. Each entry is used once,
+        so later calls read the live catalog.
+        """
+
+        if self._record_info_cache is None:
+            self._record_info_cache = self.recordInfoAll()
+
+        info = self._record_info_cache.pop(table_name.lower(), None)
+        return self.recordInfo2(table_name) if info is None else info
+
+    def clear_record_info_cache(self, table_name: Optional[str] = None) -> None:
+        """Discard the schema snapshot, or the entry of table_name."""
+
+        if table_name is None:
+            self._record_info_cache = None
+        elif self._record_info_cache is not None:
+            self._record_info_cache.pop(table_name.lower(), None)
+
     def recordInfo(self, table_metadata: "pntablemetadata.PNTableMetaData") -> List[list]:
         """Obtain current cursor information on columns."""
 
@@ -730,11 +996,10 @@ class PNSqlSchema(object):
         if not field_list:
             return False
 
-        util = flutil.FLUtil()
         table_name = new_metadata.name()
+        self.clear_record_info_cache(table_name)
 
         old_columns_info = self.recordInfo2(table_name)
-        old_field_names: List[str] = [old_column[0] for old_column in old_columns_info]
 
         renamed_table = "%salteredtable%s" % (
             table_name,
@@ -777,68 +1042,166 @@ class PNSqlSchema(object):
             session_.commit()
             return True
 
-        cur = query.db().execute_query(
-            "SELECT %s FROM %s WHERE 1=1" % (", ".join(old_field_names), renamed_table)
+        if not self._rebuild_table(new_metadata, renamed_table, old_columns_info, session_):
+            session_.rollback()
+            return False
+
+        session_.commit()
+
+        if new_metadata.name() not in self.tables("Views"):
+            query.exec_("DROP TABLE %s %s" % (renamed_table, self._text_cascade))
+
+        return True
+
+    def _rebuild_table(
+        self,
+        new_metadata: "pntablemetadata.PNTableMetaData",
+        old_table: str,
+        old_columns_info: List[List[Any]],
+        session_: "orm_session.Session",
+    ) -> bool:
+        """
+        Copy the rows of old_table into the new table.
+
+        Tries a single INSERT INTO ... SELECT, so data never leaves the database. If the database
+        can not convert the values, falls back to _rebuild_table_batches.
+        """
+
+        old_columns = {column[0]: column for column in old_columns_info}
+        old_field_names = list(old_columns.keys())
+        mapping: List[Tuple["pnfieldmetadata.PNFieldMetaData", Optional[int], Any]] = []
+        field_names: List[str] = []
+        expressions: List[str] = []
+        params: Dict[str, Any] = {}
+
+        for field in new_metadata.fieldList():
+            name = field.name()
+            old_pos = old_field_names.index(name) if name in old_columns else None
+            default = None
+            if not field.allowNull():
+                default = field.defaultValue()
+                if default is None and old_pos is None and field.type() == "timestamp":
+                    default = self.getTimeStamp()
+
+            mapping.append((field, old_pos, default))
+
+            expression = None
+            if old_pos is not None:
+                expression = self._cast_expression(name, field, old_columns[name])
+            if default is not None:
+                param_name = "default_%s" % len(params)
+                params[param_name] = self.bindValue(field.type(), default)
+                default_expression = self._cast_expression(":%s" % param_name, field)
+                expression = (
+                    "COALESCE(%s, %s)" % (expression, default_expression)
+                    if expression is not None
+                    else default_expression
+                )
+
+            if expression is not None:
+                field_names.append(name)
+                expressions.append(expression)
+
+        if not field_names:
+            return True
+
+        sql = "INSERT INTO %s(%s) SELECT %s FROM %s" % (
+            new_metadata.name(),
+            ", ".join(field_names),
+            ", ".join(expressions),
+            old_table,
+        )
+        savepoint = session_.begin_nested()
+        try:
+            session_.execute(text(sql), params)
+            savepoint.commit()
+            return True
+        except Exception as error:
+            savepoint.rollback()
+            LOGGER.warning(
+                "alterTable: No se pudo copiar %s en la base de datos, se copia por lotes.\n%s",
+                new_metadata.name(),
+                str(error),
+            )
+
+        return self._rebuild_table_batches(
+            new_metadata, old_table, old_field_names, mapping, session_
         )
-        old_data_list = cur.fetchall() if cur else []
-        # old_cursor = pnsqlcursor.PNSqlCursor(renamed_table, True, "dbAux")
-        # old_cursor.setModeAccess(old_cursor.Browse)
-        # old_cursor.select()
+
+    def _rebuild_table_batches(
+        self,
+        new_metadata: "pntablemetadata.PNTableMetaData",
+        old_table: str,
+        old_field_names: List[str],
+        mapping: List[Tuple["pnfieldmetadata.PNFieldMetaData", Optional[int], Any]],
+        session_: "orm_session.Session",
+        batch_size: int = INSERT_MULTI_BATCH_SIZE,
+    ) -> bool:
+        """
+        Copy the rows of old_table into the new table, converting values in Python.
+
+        Rows are streamed batch_size at a time. mapping holds (field, old column position, default).
+        """
+
+        util = flutil.FLUtil()
+        result_ = session_.execute(text("SELECT COUNT(*) FROM %s" % old_table)).fetchone()
+        total = int(result_[0]) if result_ else 0
+
         util.createProgressDialog(
             util.translate("application", "Reestructurando registros para %s...")
             % new_metadata.alias(),
-            len(old_data_list),
+            total,
         )
-
         util.setLabelText(util.translate("application", "Tabla modificada"))
 
-        new_field_names: List[str] = new_metadata.fieldNames()
-
-        list_records = []
-        for number_progress, old_data in enumerate(old_data_list):
-            new_buffer = []
-
-            for new_idx, new_name in enumerate(new_field_names):
-                new_field = new_metadata.field(new_name)
-                if new_field is None:
-                    LOGGER.warning(
-                        "Field %s not found un metadata %s" % (new_name, new_metadata.name())
-                    )
-                    session_.rollback()
+        cursor = (
+            session_.connection()
+            .execution_options(stream_results=self._rebuild_stream_results)
+            .execute(text("SELECT %s FROM %s" % (", ".join(old_field_names), old_table)))
+        )
+        done = 0
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
 
+                list_records = []
+                for row in rows:
+                    new_buffer = []
+                    for field, old_pos, default in mapping:
+                        value = row[old_pos] if old_pos is not None else None
+                        if value is None:
+                            value = default
+                            if value is None:
+                                continue
+                        new_buffer.append([field, value])
+                    list_records.append(new_buffer)
+
+                if not self.insertMulti(new_metadata.name(), list_records, batch_size):
                     return False
-                value = None
-                if new_name in old_field_names:
-                    value = old_data[old_field_names.index(new_name)]
-                    if value is None:
-                        continue
-                elif not new_field.allowNull():
-                    value = new_field.defaultValue()
-                    if value is None:
-                        if new_field.type() == "timestamp":
-                            value = self.getTimeStamp()
-                        else:
-                            continue
-                else:
-                    continue
-                new_buffer.append([new_field, value])
 
-            list_records.append(new_buffer)
+                done += len(rows)
+                util.setProgress(done)
+        finally:
+            cursor.close()
+            util.destroyProgressDialog()
 
-            util.setProgress(number_progress)
-
-        util.destroyProgressDialog()
-        if not self.insertMulti(table_name, list_records):
-            session_.rollback()
-            return False
-        else:
+        return True
 
-            session_.commit()
+    def _cast_expression(
+        self,
+        expression: str,
+        field: "pnfieldmetadata.PNFieldMetaData",
+        old_column: Optional[List[Any]] = None,
+    ) -> str:
+        """
+        Return expression converted to the type of field, for INSERT ... SELECT.
 
-        if new_metadata.name() not in self.tables("Views"):
-            query.exec_("DROP TABLE %s %s" % (renamed_table, self._text_cascade))
+        @param old_column. recordInfo2 row of the old column, None for bound values.
+        """
 
-        return True
+        return expression
 
     def cascadeSupport(self) -> bool:
         """Return True if the driver support cascade."""
@@ -860,8 +1223,16 @@ class PNSqlSchema(object):
     #    """Return if use a file like database."""
     #    return self.desktop_file
 
-    def execute_query(self, query: str) -> Optional["result.ResultProxy"]:
-        """Excecute a query and return result."""
+    def execute_query(
+        self, query: str, stream_results: bool = False, params: Optional[Dict[str, Any]] = None
+    ) -> Optional["result.ResultProxy"]:
+        """
+        Excecute a query and return result.
+
+        @param query. sql text. Bound parameters are written as :name.
+        @param stream_results. If True, rows are fetched on demand.
+        @param params. Bound parameters values.
+        """
 
         if not self.is_open():
             raise Exception("execute_query: Database not open %s", self)
@@ -872,13 +1243,20 @@ class PNSqlSchema(object):
         try:
             try:
                 if query.find("::bytea") > -1:
+                    connection_ = session_.connection().execution_options(
+                        autocommit=True, stream_results=stream_results
+                    )
                     result_ = (  # Esto es necesario para no obtener error en la consulta con los bytearray
-                        session_.connection()
-                        .execution_options(autocommit=True)
-                        .execute("""%s""" % query)
+                        connection_.execute(text(query), params)
+                        if params
+                        else connection_.execute("""%s""" % query)
                     )
                 else:
-                    result_ = session_.execute(text("""%s""" % query))
+                    result_ = session_.execute(
+                        text("""%s""" % query),
+                        params,
+                        execution_options={"stream_results": True} if stream_results else {},
+                    )
             except sqlalchemy.exc.DBAPIError as error:
                 LOGGER.warning(
                     "Se ha producido un error DBAPI con la consulta %s. Ejecutando rollback necesario",
@@ -922,53 +1300,76 @@ class PNSqlSchema(object):
         # LOGGER.warning("** %s, %s", self, args)
 
     def insertMulti(
-        self, table_name: str, list_records: Iterable = []
-    ) -> bool:  # FIXME SQLITE NO PUEDE TODAS DE GOLPE
-        """Insert several rows at once."""
+        self,
+        table_name: str,
+        list_records: Iterable = [],
+        batch_size: int = INSERT_MULTI_BATCH_SIZE,
+    ) -> bool:
+        """
+        Insert several rows at once.
+
+        Records with the same fields are sent together, batch_size at a time, with a single
+        executemany of an INSERT construct. SQLAlchemy turns it into the fast path of the
+        DB-API driver (execute_values on psycopg2, multi-row VALUES on MySQL ...).
+        """
 
         model_ = qsadictmodules.QSADictModules.from_project("%s_orm" % table_name)
         session_ = self.db_.connManager().dbAux().session()
         if not model_:
             return False
 
-        for number, line in enumerate(list_records):
-            # model_obj = model_()
-            field_names = []
-            field_values = []
+        batches: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for line in list_records:
+            params: Dict[str, Any] = {}
             for field, value in line:
                 if field.generated():
-
-                    if field.type() in ("string", "stringlist", "bytearray"):
-                        value = self.normalizeValue(value)
-
-                        if value in ["Null", "NULL"]:
-                            value = "''"
-                        else:
-                            value = self.formatValue(field.type(), value, False)
+                    if field.type() in ("string", "stringlist", "bytearray") and value in [
+                        "Null",
+                        "NULL",
+                    ]:
+                        value = ""
                     else:
-                        value = self.formatValue(field.type(), value, False)
+                        value = self.bindValue(field.type(), value, False)
 
-                # setattr(model_obj, field.name(), value)
-                field_names.append(field.name())
-                field_values.append(value)
+                params[field.name()] = value
 
-            sql = None
-            if field_names:
-                sql = """INSERT INTO %s(%s) values (%s)""" % (
-                    table_name,
-                    ", ".join(field_names),
-                    ", ".join(map(str, field_values)),
-                )
+            if not params:
+                continue
 
-            if sql:
-                try:
-                    session_.connection().execute(sql)
-                except Exception as error:
-                    LOGGER.error("insertMulti: %s", str(error))
+            field_names = tuple(params.keys())
+            batch = batches.setdefault(field_names, [])
+            batch.append(params)
+            if len(batch) >= batch_size:
+                del batches[field_names]
+                if not self._insert_batch(session_, table_name, field_names, batch):
                     return False
+
+        for field_names, batch in batches.items():
+            if not self._insert_batch(session_, table_name, field_names, batch):
+                return False
+
         session_.flush()
         return True
 
+    def _insert_batch(
+        self,
+        session_: "orm_session.Session",
+        table_name: str,
+        field_names: Tuple[str, ...],
+        records: List[Dict[str, Any]],
+    ) -> bool:
+        """Insert records with the same fields using a single executemany."""
+
+        # Construcción INSERT sin tipos: los valores ya vienen de bindValue.
+        table_ = sqlalchemy.table(table_name, *[sqlalchemy.column(name) for name in field_names])
+        try:
+            session_.connection().execute(table_.insert(), records)
+        except Exception as error:
+            LOGGER.error("insertMulti: %s", str(error))
+            return False
+
+        return True
+
     def Mr_Proper(self) -> None:
         """Clear all garbage data."""
 
@@ -1146,6 +1547,7 @@ class PNSqlSchema(object):
         util.setLabelText(util.translate("application", "Borrando flmetadata"))
         util.setProgress(1)
         conn_dbaux.execute_query("DELETE FROM flmetadata")
+        conn_dbaux.execute_query("DELETE FROM flfingerprints")
         util.setLabelText(util.translate("application", "Borrando flvar"))
         util.setProgress(2)
         conn_dbaux.execute_query("DELETE FROM flvar")
@@ -1229,15 +1631,20 @@ class PNSqlSchema(object):
         self._queqe_params["encoding"] = "UTF-8"
         mng_ = self.db_.connManager()
         limit_conn = mng_.limit_connections
+        alias_config = mng_.pool_config.get(self.db_._name, {})
+        if "pool_size" in alias_config:
+            limit_conn = alias_config["pool_size"]
+
         if limit_conn > 0:
             LOGGER.info("SqlAlchemy pool enabled")
-            self._queqe_params["poolclass"] = pool.QueuePool
+            self._queqe_params["poolclass"] = PNQueuePool
             self._queqe_params["pool_size"] = limit_conn
             self._queqe_params["max_overflow"] = int(limit_conn + 10)
             if mng_.safe_mode_level in [4, 5]:
                 self._queqe_params["pool_pre_ping"] = True
             if mng_.connections_time_out:
                 self._queqe_params["pool_timeout"] = int(mng_.connections_time_out)
+            self._queqe_params.update(alias_config)
 
         else:
             LOGGER.info("SqlAlchemy pool disabled")
@@ -1262,6 +1669,29 @@ class PNSqlSchema(object):
 
         conn.exec_driver_sql("BEGIN")
 
+    def do_checkin(self, dbapi_conn: Any, conn_record: Any) -> None:
+        """Checkin event. Save the time the connection returns to the pool."""
+
+        conn_record.info["checkin_time"] = time.time()
+
+    def do_checkout(self, dbapi_conn: Any, conn_record: Any, conn_proxy: Any) -> None:
+        """Checkout event. Ping the connection if it has been idle more than PRE_PING_IDLE_TIME."""
+
+        checkin_time = conn_record.info.get("checkin_time")
+        if checkin_time is None:  # Conexión nueva.
+            return
+
+        if time.time() - checkin_time < self.db_.connManager().PRE_PING_IDLE_TIME:
+            return
+
+        try:
+            cursor = dbapi_conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as error:
+            LOGGER.info("Pooled connection lost, the pool will open a new one: %s", error)
+            raise exc.DisconnectionError(str(error))  # El pool la descarta y reintenta.
+
     def do_savepoint(self, conn, name):
         """Save point event."""
 
@@ -31,6 +31,7 @@ class TestFLMSSql(unittest.TestCase):
         self.assertEqual(driver.setType("pixmap"), "TEXT")
         self.assertEqual(driver.setType("bytearray"), "NVARCHAR")
         self.assertEqual(driver.setType("timestamp"), "DATETIME2")
+        self.assertEqual(driver.paging_clause(50, 100), " OFFSET 100 ROWS FETCH NEXT 50 ROWS ONLY")
 
     def test_basic_2(self) -> None:
         """Basics test 1."""
@@ -1,4 +1,5 @@
 """Test_flsqlite module."""
+
 import unittest
 from pineboolib.loader.main import init_testing, finish_testing
 from .. import flsqlite
@@ -92,6 +93,94 @@ class TestFLSqlite(unittest.TestCase):
         self.assertTrue(cursor.db().driver().mismatchedTable("fltest", metadata2))
         self.assertFalse(cursor.db().driver().mismatchedTable("fltest3", metadata2))
 
+    def test_serial_values(self) -> None:
+        """Test serial values reserved in flseqs."""
+        from pineboolib.application.database import pnsqlcursor, utils
+
+        conn_ = pnsqlcursor.PNSqlCursor("fltest4").db()
+        self.assertTrue(conn_.driver()._serial_returning)
+
+        first_value = conn_.nextSerialVal("fltest4", "id")
+        self.assertEqual(conn_.nextSerialVal("fltest4", "id"), first_value + 1)
+
+        self.assertTrue(conn_.preallocateSerialVal("fltest4", "id", 5))
+        self.assertEqual(
+            utils.quick_sql_select("flseqs", "seq", "tabla = 'fltest4' AND campo = 'id'"),
+            first_value + 6,
+        )
+        self.assertEqual(
+            [conn_.nextSerialVal("fltest4", "id") for number in range(6)],
+            list(range(first_value + 2, first_value + 8)),
+        )
+
+        # Sin UPDATE ... RETURNING, la lectura va en la misma transacción.
+        conn_.driver()._serial_returning = False
+        try:
+            self.assertEqual(conn_.nextSerialVal("fltest4", "id"), first_value + 8)
+            self.assertFalse(conn_.session().in_transaction())
+        finally:
+            conn_.driver()._serial_returning = True
+
+    def test_insert_multi(self) -> None:
+        """Test insertMulti batches."""
+        from pineboolib.application.database import pnsqlcursor, utils
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        driver = cursor.db().driver()
+        metadata = cursor.metadata()
+        string_field = metadata.field("string_field")
+        double_field = metadata.field("double_field")
+        lock_field = metadata.field("bloqueo")
+        records = [[[string_field, "multi %s" % number], [lock_field, True]] for number in range(5)]
+        records += [[[string_field, "multi 5"], [lock_field, True], [double_field, 2.5]]]
+        self.assertTrue(driver.insertMulti("fltest", records, 2))
+        self.assertEqual(
+            utils.quick_sql_select("fltest", "COUNT(*)", "string_field LIKE 'multi %'"), 6
+        )
+        self.assertEqual(
+            utils.quick_sql_select("fltest", "double_field", "string_field = 'multi 5'"), 2.5
+        )
+        self.assertFalse(driver.insertMulti("fltest", [[[metadata.field("id"), "no int"]]]))
+        cursor.db().connManager().dbAux().session().rollback()
+
+    def test_alter_table_rebuild(self) -> None:
+        """Test alterTable copies the rows, in the database and by batches."""
+        from pineboolib.application.database import pnsqlcursor, utils
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest3")
+        conn_ = cursor.db()
+        driver = conn_.driver()
+        metadata = cursor.metadata()
+        records = [
+            [
+                [metadata.field("counter"), "R%05d" % number],
+                [metadata.field("string_field"), "rebuild %s" % number],
+                [metadata.field("timezone_field"), "2020-01-01 10:00:00"],
+                [metadata.field("bool_field"), number % 2 == 0],
+            ]
+            for number in range(7)
+        ]
+        self.assertTrue(driver.insertMulti("fltest3", records))
+
+        self.assertTrue(conn_.alterTable(metadata))
+        self.assertEqual(utils.quick_sql_select("fltest3", "COUNT(*)", "1=1"), 7)
+        self.assertEqual(
+            utils.quick_sql_select("fltest3", "string_field", "counter = 'R00003'"), "rebuild 3"
+        )
+
+        # Si la copia en la base de datos falla, se copia por lotes.
+        aux_driver = conn_.connManager().dbAux().driver()
+        aux_driver._cast_expression = lambda expression, field, old_column=None: "no_existe"
+        try:
+            self.assertTrue(conn_.alterTable(metadata))
+        finally:
+            del aux_driver._cast_expression
+
+        self.assertEqual(utils.quick_sql_select("fltest3", "COUNT(*)", "1=1"), 7)
+        self.assertEqual(
+            utils.quick_sql_select("fltest3", "string_field", "counter = 'R00003'"), "rebuild 3"
+        )
+
     def test_invalid_metadata(self) -> None:
         """Test invalid metadata."""
         from pineboolib.application.database import pnsqlcursor
@@ -101,6 +190,92 @@ class TestFLSqlite(unittest.TestCase):
 
         pnsqlcursor.PNSqlCursor("fltest").metadata()
 
+    def test_record_info_all(self) -> None:
+        """Test bulk schema introspection."""
+        from pineboolib.application.database import pnsqlcursor
+
+        cursor = pnsqlcursor.PNSqlCursor("flfiles")
+        conn_ = cursor.db()
+        driver = conn_.connManager().dbAux().driver()
+        info = driver.recordInfoAll()
+        self.assertEqual(info["fltest"], driver.recordInfo2("fltest"))
+        self.assertEqual(info["flfiles"], driver.recordInfo2("flfiles"))
+
+        driver.clear_record_info_cache()
+        self.assertFalse(conn_.mismatchedTable("flfiles", cursor.metadata()))
+        self.assertFalse("flfiles" in driver._record_info_cache)
+        self.assertTrue("fltest" in driver._record_info_cache)
+        driver.clear_record_info_cache("fltest")
+        self.assertFalse("fltest" in driver._record_info_cache)
+        self.assertFalse(conn_.mismatchedTable("flfiles", cursor.metadata()))
+
+    def test_checkout_ping(self) -> None:
+        """Test idle pooled connections are pinged on checkout."""
+        from pineboolib import application
+        from sqlalchemy import exc
+        import time
+
+        class Cursor(object):
+            def execute(self, sql: str) -> None:
+                raise Exception("server has gone away")
+
+        class Connection(object):
+            def cursor(self) -> "Cursor":
+                return Cursor()
+
+        class Record(object):
+            def __init__(self) -> None:
+                self.info: dict = {}
+
+        driver = application.PROJECT.conn_manager.useConn("default").driver()
+        record = Record()
+        driver.do_checkout(Connection(), record, None)
+        driver.do_checkin(Connection(), record)
+        driver.do_checkout(Connection(), record, None)
+        record.info["checkin_time"] = time.time() - 60
+        with self.assertRaises(exc.DisconnectionError):
+            driver.do_checkout(Connection(), record, None)
+
+    def test_pool_metrics(self) -> None:
+        """Test pool metrics."""
+        from .. import pnsqlschema
+        from sqlalchemy import create_engine
+        import threading
+
+        engine = create_engine(
+            "sqlite://", poolclass=pnsqlschema.PNQueuePool, pool_size=1, max_overflow=1
+        )
+        metrics = pnsqlschema.PoolMetrics(engine)
+        engine.pool.metrics = metrics
+        conn_1 = engine.connect()
+        conn_2 = engine.connect()
+        data = metrics.snapshot()
+        self.assertEqual(data["pool"], "PNQueuePool")
+        self.assertEqual(data["checked_out"], 2)
+        self.assertEqual(data["overflow"], 1)
+        self.assertEqual(sum(data["wait_histogram"].values()), 2)
+        self.assertEqual(len(data["holders"]), 2)
+        self.assertTrue("test_pool_metrics" in data["holders"][0]["stack"])
+
+        conn_1.close()
+        conn_2.close()
+        data = metrics.snapshot()
+        self.assertEqual(data["checked_out"], 0)
+        self.assertEqual(data["threads"][threading.current_thread().name]["count"], 2)
+
+        limit = pnsqlschema.POOL_THREAD_STATS_LIMIT
+        pnsqlschema.POOL_THREAD_STATS_LIMIT = 2
+        try:
+            for name in ["thread_1", "thread_2"]:
+                thread = threading.Thread(target=lambda: engine.connect().close(), name=name)
+                thread.start()
+                thread.join()
+        finally:
+            pnsqlschema.POOL_THREAD_STATS_LIMIT = limit
+        self.assertEqual(list(metrics.snapshot()["threads"].keys()), ["thread_1", "thread_2"])
+        engine.dispose()
+        self.assertTrue(engine.pool.metrics is metrics)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
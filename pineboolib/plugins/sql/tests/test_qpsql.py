@@ -1,4 +1,5 @@
 """Test_FLPGSql module."""
+
 import unittest
 from pineboolib.loader.main import init_testing, finish_testing
 from .. import flqpsql
@@ -48,6 +49,37 @@ class TestFLPGSql(unittest.TestCase):
         driver = flqpsql.FLQPSQL()
         self.assertEqual(sql, driver.sqlCreateTable(cursor.metadata(), False))
 
+    def test_insert_multi(self) -> None:
+        """Test insertMulti statement."""
+        from sqlalchemy.dialects.postgresql import psycopg2  # type: ignore [import] # noqa: F821
+
+        executed: list = []
+
+        class FakeConnection:
+            def execute(self, statement, records) -> None:
+                executed.append((statement, records))
+
+        class FakeSession:
+            def connection(self) -> FakeConnection:
+                return FakeConnection()
+
+        records = [{"string_field": "multi %s" % number, "bloqueo": True} for number in range(3)]
+        driver = flqpsql.FLQPSQL()
+        self.assertTrue(
+            driver._insert_batch(FakeSession(), "fltest", ("string_field", "bloqueo"), records)
+        )
+        statement, params = executed[0]
+        self.assertEqual(params, records)
+        dialect = psycopg2.dialect()
+        compiled = statement.compile(dialect=dialect, column_keys=list(records[0].keys()))
+        self.assertEqual(
+            str(compiled),
+            "INSERT INTO fltest (string_field, bloqueo) VALUES (%(string_field)s, %(bloqueo)s)",
+        )
+        # Es la forma que psycopg2 envía con execute_values.
+        self.assertTrue(dialect.executemany_mode & psycopg2.EXECUTEMANY_VALUES)
+        self.assertTrue(compiled.insert_single_values_expr)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -24,18 +24,15 @@ def atomic(conn_name: str = "default", wait: bool = True) -> TYPEFN:
     """Return pineboo atomic decorator."""
 
     def decorator(fun_: TYPEFN) -> TYPEFN:
-        @functools.wraps(fun_)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
+        def call(*args: Any, **kwargs: Any) -> Any:
 
             key = utils_base.session_id(conn_name)
             if wait:
                 _wait(key)
 
             mng_ = application.PROJECT.conn_manager
-            while True:
-                mng_.current_atomic_sessions[key], new_session = utils.driver_session(conn_name)
-                if mng_.check_connections():
-                    break
+            # El pool valida la conexión al sacarla si lleva tiempo inactiva (PRE_PING_IDLE_TIME).
+            mng_.current_atomic_sessions[key], new_session = utils.driver_session(conn_name)
 
             result_ = None
             try:
@@ -75,6 +72,14 @@ def atomic(conn_name: str = "default", wait: bool = True) -> TYPEFN:
 
             return result_
 
+        @functools.wraps(fun_)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Sólo la llamada más externa reintenta: las anidadas comparten su transacción.
+            if application.SERIALIZE_LIST.get(threading.get_ident()):
+                return call(*args, **kwargs)
+
+            return _retry_lost_connection(conn_name, call, *args, **kwargs)
+
         mock_fn: TYPEFN = cast(TYPEFN, wrapper)
         return mock_fn
 
@@ -90,10 +95,6 @@ def serialize(conn_name: str = "default") -> TYPEFN:
             key = utils_base.session_id(conn_name)
             _wait(key)
 
-            while True:
-                if application.PROJECT.conn_manager.check_connections():
-                    break
-
             # new_session = utils.driver_session(conn_name)[1]
 
             result_ = None
@@ -126,17 +127,29 @@ def serialize(conn_name: str = "default") -> TYPEFN:
     return decorator  # type: ignore [return-value] # noqa: F723
 
 
-def _wait(key: str) -> None:
-    id_thread = threading.current_thread().ident
-    if id_thread not in application.SERIALIZE_LIST.keys():
-        application.SERIALIZE_LIST[id_thread] = []  # type: ignore [index] # noqa: F821
+def _retry_lost_connection(
+    conn_name: str, call: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    """Call a decorated function. Retry it once with new connections if its connection was lost."""
+
+    try:
+        return call(*args, **kwargs)
+    except exc.DBAPIError as error:
+        if not error.connection_invalidated:
+            raise error
+
+        LOGGER.warning("Connection %s lost: %s. Retrying with a new session.", conn_name, error)
 
-    application.SERIALIZE_LIST[id_thread].append(key)  # type: ignore [index] # noqa: F821
+    application.PROJECT.conn_manager.check_connections()  # Descarta las conexiones caídas.
+    return call(*args, **kwargs)
+
+
+def _wait(key: str) -> None:
+    """Register the key as taken by the current thread."""
 
-    while (
-        application.SERIALIZE_LIST[id_thread][0] != key  # type: ignore [index] # noqa: F821
-    ):  # type: ignore [index] # noqa: F821
-        time.sleep(0.01)
+    # Las claves son por hilo y conexión, así que ningún otro hilo las comparte. Una clave
+    # repetida es un nivel más de anidamiento, que _delete_session quita al terminar.
+    application.SERIALIZE_LIST.setdefault(threading.get_ident(), []).append(key)
 
     if application.PROJECT.conn_manager.safe_mode_level in [1, 3, 5]:
         time.sleep(application.PROJECT.conn_manager.SAFE_TIME_SLEEP)
@@ -163,17 +176,16 @@ def _delete_session(key: str, wait: bool = True) -> None:
 
         del mng_.current_atomic_sessions[key]
 
-    id_thread = threading.current_thread().ident
+    thread_keys = application.SERIALIZE_LIST.get(threading.get_ident(), [])
 
-    if wait and id_thread in application.SERIALIZE_LIST.keys():
-        if key in application.SERIALIZE_LIST[id_thread]:  # type: ignore [index] # noqa: F821
-            application.SERIALIZE_LIST[id_thread].remove(key)  # type: ignore [index] # noqa: F821
+    if wait and key in thread_keys:
+        thread_keys.remove(key)
 
     if mng_.safe_mode_level in [2, 3, 5]:
         time.sleep(mng_.SAFE_TIME_SLEEP)
-    # Delete all thread connections.
-    if mng_.REMOVE_CONNECTIONS_AFTER_ATOMIC:
-        time.sleep(0.05)
+    # Delete all thread connections, when the outer serialized call ends.
+    # La sesión ya se ha cerrado en _delete_data, así que sus conexiones han vuelto al pool.
+    if mng_.REMOVE_CONNECTIONS_AFTER_ATOMIC and not thread_keys:
         for conn_name in mng_.enumerate():
             if application.SHOW_CONNECTION_EVENTS:
                 LOGGER.info("Removing connection %s after decorator", conn_name)
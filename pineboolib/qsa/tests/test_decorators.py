@@ -0,0 +1,98 @@
+"""Test_decorators module."""
+
+import unittest
+import threading
+
+from typing import List
+
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib import application
+from pineboolib.core.utils import utils_base
+from pineboolib.qsa import qsa
+
+
+class TestDecorators(unittest.TestCase):
+    """TestDecorators Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_nested_serialize(self) -> None:
+        """Test nested serialized calls on different connections."""
+
+        @qsa.serialize("dbAux")  # type: ignore [misc] # noqa: F821
+        def inner() -> List[str]:
+            return list(application.SERIALIZE_LIST[threading.get_ident()])
+
+        @qsa.serialize()  # type: ignore [misc] # noqa: F821
+        def outer() -> List[str]:
+            return inner()
+
+        @qsa.serialize()  # type: ignore [misc] # noqa: F821
+        def reentrant() -> List[str]:
+            return outer()
+
+        keys = [utils_base.session_id("default"), utils_base.session_id("dbAux")]
+        self.assertEqual(outer(), keys)
+        self.assertEqual(reentrant(), [keys[0]] + keys)
+        self.assertFalse(application.SERIALIZE_LIST[threading.get_ident()])
+
+    def test_retry_lost_connection(self) -> None:
+        """Test a call is retried once when its connection is lost."""
+        from sqlalchemy import exc
+
+        calls = []
+
+        @qsa.atomic()  # type: ignore [misc] # noqa: F821
+        def lost(invalidated: bool) -> bool:
+            calls.append(invalidated)
+            if len(calls) == 1:
+                raise exc.DBAPIError(
+                    "SELECT 1", None, Exception("lost"), connection_invalidated=invalidated
+                )
+            return True
+
+        self.assertTrue(lost(True))
+        self.assertEqual(len(calls), 2)
+        calls.clear()
+        with self.assertRaises(exc.DBAPIError):
+            lost(False)
+        self.assertEqual(len(calls), 1)
+
+        # Las llamadas anidadas y las serializadas no reintentan; lo hace la atómica más externa.
+        calls.clear()
+
+        @qsa.atomic()  # type: ignore [misc] # noqa: F821
+        def inner() -> bool:
+            calls.append("inner")
+            if calls.count("inner") == 1:
+                raise exc.DBAPIError(
+                    "SELECT 1", None, Exception("lost"), connection_invalidated=True
+                )
+            return True
+
+        @qsa.atomic()  # type: ignore [misc] # noqa: F821
+        def outer() -> bool:
+            calls.append("outer")
+            return inner()
+
+        self.assertTrue(outer())
+        self.assertEqual(calls, ["outer", "inner", "outer", "inner"])
+
+        calls.clear()
+
+        @qsa.serialize()  # type: ignore [misc] # noqa: F821
+        def serialized() -> bool:
+            calls.append("serialized")
+            raise exc.DBAPIError("SELECT 1", None, Exception("lost"), connection_invalidated=True)
+
+        with self.assertRaises(exc.DBAPIError):
+            serialized()
+        self.assertEqual(calls, ["serialized"])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
@@ -728,3 +728,9 @@ def pool_status(conn_name: str = "main_conn") -> str:
     """Return pool status used for the conn_name."""
 
     return application.PROJECT.conn_manager.pool_status(conn_name)
+
+
+def pool_metrics(conn_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return the pool metrics of every engine, or the engine used for the conn_name."""
+
+    return application.PROJECT.conn_manager.pool_metrics(conn_name)
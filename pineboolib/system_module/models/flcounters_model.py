@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Flcounters_model module."""
+
+import sqlalchemy  # type: ignore [import] # noqa: F821
+
+from pineboolib.application.database.orm import basemodel
+
+
+class Flcounters(basemodel.BaseModel):  # type: ignore [misc] # noqa: F821
+    """Flcounters class."""
+
+    __tablename__ = "flcounters"
+
+    # --- Metadata --->
+    legacy_metadata = {
+        "name": "flcounters",
+        "alias": "Bloques de contadores",
+        "fields": [
+            {
+                "name": "id",
+                "alias": "Identificador",
+                "pk": True,
+                "type": "string",
+                "length": 255,
+                "null": False,
+            },
+            {
+                "name": "tabla",
+                "alias": "Nombre de la tabla",
+                "type": "string",
+                "length": 100,
+                "null": False,
+            },
+            {
+                "name": "campo",
+                "alias": "Nombre del campo",
+                "type": "string",
+                "length": 100,
+                "null": False,
+            },
+            {"name": "serie", "alias": "Serie", "type": "string", "length": 100},
+            {"name": "valor", "alias": "Último valor reservado", "type": "uint", "null": False},
+        ],
+    }
+
+    # <--- Metadata ---
+
+    # --- Fields --->
+
+    id = sqlalchemy.Column("id", sqlalchemy.String(255), primary_key=True)
+    tabla = sqlalchemy.Column("tabla", sqlalchemy.String(100))
+    campo = sqlalchemy.Column("campo", sqlalchemy.String(100))
+    serie = sqlalchemy.Column("serie", sqlalchemy.String(100))
+    valor = sqlalchemy.Column("valor", sqlalchemy.BigInteger)
+
+
+# <--- Fields ---
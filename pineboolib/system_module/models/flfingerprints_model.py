@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Flfingerprints_model module."""
+
+import sqlalchemy  # type: ignore [import] # noqa: F821
+
+from pineboolib.application.database.orm import basemodel
+
+
+class Flfingerprints(basemodel.BaseModel):  # type: ignore [misc] # noqa: F821
+    """Flfingerprints class."""
+
+    __tablename__ = "flfingerprints"
+
+    # --- Metadata --->
+    legacy_metadata = {
+        "name": "flfingerprints",
+        "alias": "Huellas de tablas",
+        "fields": [
+            {
+                "name": "tabla",
+                "alias": "Nombre de la tabla",
+                "pk": True,
+                "type": "string",
+                "length": 255,
+                "null": False,
+            },
+            {
+                "name": "huella",
+                "alias": "Huella de los metadatos",
+                "type": "string",
+                "length": 40,
+                "null": False,
+            },
+        ],
+    }
+
+    # <--- Metadata ---
+
+    # --- Fields --->
+
+    tabla = sqlalchemy.Column("tabla", sqlalchemy.String(255), primary_key=True)
+    huella = sqlalchemy.Column("huella", sqlalchemy.String(40))
+
+
+# <--- Fields ---